@@ -0,0 +1,100 @@
+"""
+Ejecuta lotes de partidas simuladas repartidas en todos los núcleos.
+
+Cada worker carga el catálogo de cartas una sola vez (initializer del pool) y
+juega bloques de semillas consecutivas; los resultados vuelven por bloque como
+tuplas (seed, winner, turns). La semilla de cada partida depende sólo de la
+semilla maestra y del índice de la partida, así que el resultado es el mismo
+sin importar cuántos workers se usen: la partida y cada política tienen su
+propio generador derivado de esa semilla (simulation.substream), y
+rerun_game repite cualquier partida del lote.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from simulation import derive_seed, run_game, random_policy, substream
+
+
+# Estado por worker, se llena en _init_worker
+_worker_deck = None
+_worker_policy_factory = None
+
+
+def _init_worker(path_csv, policy_factory):
+    global _worker_deck, _worker_policy_factory
+    from cards import load_cards
+    _worker_deck = load_cards(path_csv)
+    _worker_policy_factory = policy_factory
+
+
+def game_seed(master_seed, game_index):
+    """ Semilla reproducible de la partida game_index dentro del lote """
+    return derive_seed(master_seed, game_index)
+
+
+def play_seeded_game(deck, seed, policy_factory=random_policy, recorder=None):
+    """
+    Juega la partida de una semilla del lote: la partida y cada política usan
+    su propio generador derivado de seed. Retorna un GameResult.
+    """
+    policy_a = policy_factory(substream(seed, 'policy', 0))
+    policy_b = policy_factory(substream(seed, 'policy', 1))
+    return run_game(deck, deck, policy_a, policy_b, seed, recorder=recorder)
+
+
+def rerun_game(path_csv, master_seed, game_index, policy_factory=random_policy, recorder=None):
+    """ Vuelve a jugar, idéntica, la partida game_index de un lote (para depurar) """
+    from cards import load_cards
+    return play_seeded_game(load_cards(path_csv), game_seed(master_seed, game_index), policy_factory, recorder)
+
+
+def _play_chunk(master_seed, start, count):
+    results = []
+    for game_index in range(start, start + count):
+        seed = game_seed(master_seed, game_index)
+        result = play_seeded_game(_worker_deck, seed, _worker_policy_factory)
+        results.append((seed, result.winner, result.turns))
+    return results
+
+
+def run_batch(path_csv, games, master_seed=0, workers=None, chunk_size=256, policy_factory=random_policy):
+    """
+    Juega `games` partidas (mirror del mazo en path_csv) en un ProcessPoolExecutor.
+    Es un generador: entrega listas de (seed, winner, turns) a medida que terminan
+    los bloques, en orden de finalización.
+    policy_factory recibe un random.Random y debe poder serializarse (función de módulo).
+    """
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(path_csv, policy_factory),
+    ) as executor:
+        futures = [
+            executor.submit(_play_chunk, master_seed, start, min(chunk_size, games - start))
+            for start in range(0, games, chunk_size)
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def summarize(chunks):
+    """ Cuenta victorias de A, de B y empates sobre los bloques de resultados """
+    summary = {0: 0, 1: 0, None: 0}
+    for chunk in chunks:
+        for _, winner, _ in chunk:
+            summary[winner] += 1
+    return summary
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+
+    start = time.perf_counter()
+    summary = summarize(run_batch('control_de_los_mares.csv', games, workers=workers))
+    elapsed = time.perf_counter() - start
+    print(f"{games} partidas en {elapsed:.2f}s ({games / elapsed:.0f} partidas/s) | A={summary[0]} B={summary[1]} empates={summary[None]}")
@@ -0,0 +1,43 @@
+"""
+Mide GameState.clone() contra copy.deepcopy sobre una partida a mitad de juego.
+
+    python -m benchmarks.bench_clone [clones]
+
+Objetivo: más de 4.000 clones por segundo en un núcleo (unas 20 veces deepcopy).
+"""
+import copy
+import sys
+import time
+
+from cards import load_cards
+from simulation import new_game, play_until_end, random_policy, substream
+
+
+def mid_game_state(turns=10, seed=1):
+    deck = load_cards('control_de_los_mares.csv')
+    game_state = new_game(deck, deck, seed)
+    return play_until_end(game_state, random_policy(substream(seed, 'policy', 0)), random_policy(substream(seed, 'policy', 1)), turns)
+
+
+def _rate(function, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    return repeats / (time.perf_counter() - start)
+
+
+def main(repeats=20_000):
+    game_state = mid_game_state()
+
+    clone = game_state.clone()
+    assert clone.player1.zones.hand.cards[0].instance_id == game_state.player1.zones.hand.cards[0].instance_id
+    assert clone.player1.zones.hand.cards[0] is not game_state.player1.zones.hand.cards[0]
+    assert clone.player1.zones.hand.cards[0].card is game_state.player1.zones.hand.cards[0].card
+
+    clone_rate = _rate(game_state.clone, repeats)
+    deepcopy_rate = _rate(lambda: copy.deepcopy(game_state), max(repeats // 50, 10))
+    print(f"clone {clone_rate:,.0f}/s | deepcopy {deepcopy_rate:,.0f}/s | x{clone_rate / deepcopy_rate:.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,78 @@
+"""
+Mide combat.resolve_combat sobre combates reales y su peso en una partida.
+
+    python -m benchmarks.bench_combat [partidas]
+
+Los estados se toman justo antes de terminar ATTACK en partidas al azar, con
+sus atacantes y defensores declarados; cada repetición resuelve copias frescas.
+Se informa por separado el costo de los turnos sin atacantes (la mayoría), con
+ataques sin bloquear y con bloqueos.
+Objetivo: menos de 5 µs por combate en promedio, bajo el 2% de una partida.
+"""
+import sys
+import time
+
+from cards import load_cards
+from combat import resolve_combat
+from phases import GamePhase
+from simulation import new_game, play_step, random_policy, run_game, substream
+
+
+def combat_states(deck, games, max_turns=60):
+    """ Copias de cada partida justo antes de resolver su combate """
+    states = []
+    for seed in range(games):
+        game_state = new_game(deck, deck, seed)
+        seats = {game_state.player1: random_policy(substream(seed, 'policy', 0)),
+                 game_state.player2: random_policy(substream(seed, 'policy', 1))}
+        while not game_state.game_over and game_state.turn_number <= max_turns:
+            before = game_state.clone() if game_state.current_phase is GamePhase.ATTACK else None
+            play_step(game_state, seats[game_state.get_acting_player()])
+            if before is not None and game_state.current_phase is not GamePhase.ATTACK:
+                states.append(before)
+    return states
+
+
+def time_combats(states, repeats=5):
+    """ Mejor tiempo por combate (s) sobre copias frescas de los estados """
+    best = float('inf')
+    for _ in range(repeats):
+        copies = [game_state.clone() for game_state in states]
+        start = time.perf_counter()
+        for game_state in copies:
+            resolve_combat(game_state)
+        best = min(best, (time.perf_counter() - start) / len(copies))
+    return best
+
+
+def time_games(deck, games):
+    """ Tiempo por partida (s) y combates por partida, con las mismas semillas """
+    start = time.perf_counter()
+    turns = 0
+    for seed in range(games):
+        result = run_game(deck, deck, random_policy(substream(seed, 'policy', 0)),
+                          random_policy(substream(seed, 'policy', 1)), seed, max_turns=60)
+        turns += result.turns
+    return (time.perf_counter() - start) / games, turns / games
+
+
+def main(games=100):
+    deck = load_cards('control_de_los_mares.csv')
+    states = combat_states(deck, games)
+    kinds = {
+        'sin atacantes': [state for state in states if not state.declared_attackers],
+        'sin bloqueos': [state for state in states if state.declared_attackers and not state.declared_defenders],
+        'con bloqueos': [state for state in states if state.declared_defenders],
+    }
+    for kind, group in kinds.items():
+        print(f"{kind:<14} {len(group):>6} combates | {time_combats(group) * 1e6:6.2f} µs/combate")
+
+    per_combat = time_combats(states)
+    per_game, turns = time_games(deck, games)
+    share = per_combat * len(states) / games / per_game
+    print(f"{'todos':<14} {len(states):>6} combates | {per_combat * 1e6:6.2f} µs/combate | "
+          f"{per_game * 1e3:.2f} ms/partida ({turns:.0f} turnos) | combate {share:.1%} de la partida")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,94 @@
+"""
+Compara cards.load_cards con el cargador anterior basado en iterrows.
+
+Genera un catálogo sintético de 50k filas a partir de control_de_los_mares.csv,
+verifica que ambos cargadores producen las mismas cartas y mide los tiempos.
+
+    python -m benchmarks.bench_loader [filas]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+import cards
+from cards import Unit, Monument, Action, Treasure, Token
+
+
+def load_cards_iterrows(path_csv):
+    """ Implementación original fila por fila, como referencia """
+    df = pd.read_csv(path_csv)
+    result = ([], [], [])
+    for _, row in df.iterrows():
+        card_type = row['Tipo']
+        common_data = {
+            'name': row['Nombre'],
+            'cost': int(row['Coste']),
+            'text': row['Texto'],
+            'expansion': row['Expansión'],
+            'rareness': row['Rareza'],
+            'type': row['Tipo'],
+            'supertype': row.get('Supertipo') if pd.notna(row.get('Supertipo')) else None,
+            'subtype_1': row.get('Subtipo 1') if pd.notna(row.get('Subtipo 1')) else None,
+            'subtype_2': row.get('Subtipo 2') if pd.notna(row.get('Subtipo 2')) else None,
+            'clarification': row.get('Aclaraciones') if pd.notna(row.get('Aclaraciones')) else None,
+        }
+        if card_type == 'UNIDAD':
+            strength = 0
+            toughness = 0
+            if pd.notna(row['Fuerza']) and str(row['Fuerza']).strip() != '':
+                strength = int(row['Fuerza'])
+            if pd.notna(row['Resistencia']) and str(row['Resistencia']).strip() != '':
+                toughness = int(row['Resistencia'])
+            result[0].append(Unit(strength=strength, toughness=toughness, **common_data))
+        elif card_type == 'MONUMENTO':
+            result[0].append(Monument(**common_data))
+        elif card_type == 'ACCION':
+            result[0].append(Action(**common_data))
+        elif card_type == 'TESORO':
+            result[1].append(Treasure(**common_data))
+        elif card_type == 'TOKEN':
+            result[2].append(Token(**common_data))
+    return result
+
+
+def synthetic_catalog(rows, source='control_de_los_mares.csv'):
+    """ Escribe un CSV temporal con `rows` filas repitiendo el catálogo de source """
+    df = pd.read_csv(source)
+    repeats = rows // len(df) + 1
+    big = pd.concat([df] * repeats, ignore_index=True).iloc[:rows]
+    handle, path = tempfile.mkstemp(suffix='.csv')
+    os.close(handle)
+    big.to_csv(path, index=False)
+    return path
+
+
+def same_cards(first, second):
+    """ True si dos resultados de load_cards tienen las mismas cartas (clase y campos, en orden) """
+    def comparable(loaded):
+        return repr([[(type(card), vars(card)) for card in group] for group in loaded])
+    return comparable(first) == comparable(second)
+
+
+def _timed(loader, path):
+    start = time.perf_counter()
+    loaded = loader(path)
+    return loaded, time.perf_counter() - start
+
+
+def main(rows=50_000):
+    path = synthetic_catalog(rows)
+    try:
+        old, old_time = _timed(load_cards_iterrows, path)
+        new, new_time = _timed(lambda source: cards.load_cards(source, use_cache=False), path)
+    finally:
+        os.remove(path)
+
+    assert same_cards(old, new), "los cargadores no coinciden"
+    print(f"{rows} filas | iterrows {old_time:.3f}s | columnas {new_time:.3f}s | x{old_time / new_time:.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -0,0 +1,83 @@
+"""
+Prueba de carga de server.MatchServer: muchos clientes aleatorios contra bots.
+
+    python -m benchmarks.bench_server [clientes] [turnos] [puerto | ruta.sock]
+
+Sin dirección levanta el servidor en el mismo proceso sobre un socket Unix
+temporal. Informa la latencia por acción (de enviar una decisión a recibir el
+pedido siguiente, que incluye el turno del bot) con p50/p99 y acciones por segundo.
+"""
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from cards import load_cards
+from server import MatchServer
+
+
+async def _client(connect, max_turns, rng, latencies):
+    reader, writer = await connect()
+    writer.write(json.dumps({'op': 'join', 'vs': 'bot', 'max_turns': max_turns}).encode('utf-8') + b'\n')
+    await writer.drain()
+    sent_at = None
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        if sent_at is not None:
+            latencies.append(time.perf_counter() - sent_at)
+            sent_at = None
+        message = json.loads(line)
+        if message['op'] == 'end':
+            break
+        if message['op'] == 'decide':
+            writer.write(json.dumps({'op': 'act', 'index': rng.randrange(len(message['actions']))}).encode('utf-8') + b'\n')
+            sent_at = time.perf_counter()
+            await writer.drain()
+    writer.close()
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+async def main(clients=200, max_turns=20, address=None):
+    server = None
+    temp_dir = None
+    if address is None:
+        temp_dir = tempfile.mkdtemp()
+        address = os.path.join(temp_dir, 'partidas.sock')
+        server = MatchServer(load_cards('control_de_los_mares.csv'))
+        await server.start(path=address)
+
+    if address.isdigit():
+        connect = lambda: asyncio.open_connection('127.0.0.1', int(address))
+    else:
+        connect = lambda: asyncio.open_unix_connection(address)
+
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(connect, max_turns, random.Random(index), latencies) for index in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    if server is not None:
+        await server.close()
+        os.remove(address)
+        os.rmdir(temp_dir)
+
+    print(f"{clients} partidas concurrentes | {len(latencies)} acciones en {elapsed:.2f}s "
+          f"({len(latencies) / elapsed:,.0f} acciones/s) | "
+          f"p50 {percentile(latencies, 0.5) * 1000:.2f} ms | p99 {percentile(latencies, 0.99) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20,
+        sys.argv[3] if len(sys.argv) > 3 else None,
+    ))
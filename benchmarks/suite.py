@@ -0,0 +1,294 @@
+"""
+Suite de benchmarks del motor con línea base guardada en el repositorio.
+
+    python -m benchmarks.suite                  # corre todo y compara con baseline.json
+    python -m benchmarks.suite zone mulligan    # sólo los casos cuyo nombre contiene esos textos
+    python -m benchmarks.suite --update         # reescribe baseline.json con esta corrida
+    python -m benchmarks.suite --threshold 0.2  # tolerancia antes de marcar una regresión
+    python -m benchmarks.suite --repeats 21     # más rondas: mediana más estable
+
+Cada caso informa operaciones por segundo (la mediana de varias rondas) y la
+memoria pico por llamada medida con tracemalloc. Es una regresión si ops/s cae
+o la memoria pico sube más que `threshold` respecto de la línea base; en ese
+caso el comando termina con código 1. La velocidad se compara relativa a un
+bucle de calibración medido junto a cada ronda (ver measure): en máquinas
+compartidas la velocidad de todo el proceso varía ±25% en segundos.
+
+La tolerancia por defecto (THRESHOLD) está por encima del ruido medido entre
+corridas sin cambios de código en la misma máquina (hasta ±14% por caso con
+los valores por defecto); con menos el código de salida marca ruido como
+regresión.
+
+Las líneas base dependen de la máquina: actualizarlas en la misma máquina
+donde se compara.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from benchmarks.bench_clone import mid_game_state
+from benchmarks.bench_loader import synthetic_catalog
+from cards import load_cards
+from odds import DeckOdds, _all_of
+from opening import OpeningEngine, mulligan_without_play
+from player import Player, Zone
+from simulation import new_game, random_policy, run_game, substream
+
+CATALOG = 'control_de_los_mares.csv'
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+MEMORY_NOISE_KB = 16
+THRESHOLD = 0.15
+MIN_TIME = 0.3
+REPEATS = 21
+CALIBRATION_TIME = 0.05
+
+# nombre -> preparación; la preparación retorna (run, operaciones por llamada a run)
+BENCHMARKS = {}
+_cleanup = []   # archivos temporales de las preparaciones
+
+
+def benchmark(name):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+@benchmark('load_cards_csv')
+def _load_cards_csv():
+    return lambda: load_cards(CATALOG, use_cache=False), 1
+
+
+@benchmark('load_cards_cached')
+def _load_cards_cached():
+    load_cards(CATALOG)
+    return lambda: load_cards(CATALOG), 1
+
+
+@benchmark('load_cards_synthetic_20k')
+def _load_cards_synthetic():
+    path = synthetic_catalog(20_000, CATALOG)
+    _cleanup.append(lambda: os.remove(path))
+    return lambda: load_cards(path, use_cache=False), 1
+
+
+@benchmark('zone_remove_by_id_add_cards')
+def _zone_remove_add():
+    zone = Zone("Banco")
+    player = Player("A", *load_cards(CATALOG))
+    zone.add_cards(list(player.zones.mazo))
+    ids = [card.instance_id for card in zone]
+
+    def run():
+        for card_id in ids:
+            zone.add_cards(zone.remove_by_id(card_id))
+    return run, len(ids)
+
+
+@benchmark('zone_remove_amount')
+def _zone_remove_amount():
+    mazo = Player("A", *load_cards(CATALOG)).zones.mazo
+
+    def run():
+        for _ in range(100):
+            mazo.add_cards_to_bottom(mazo.remove_amount(7))
+    return run, 100
+
+
+@benchmark('mulligan_redraw')
+def _mulligan_redraw():
+    player = Player("A", *load_cards(CATALOG), rng=substream(0, 'bench'))
+    hand = player.zones.hand
+
+    def run():
+        for _ in range(50):
+            player.actions.draw_card_from_mazo(7)
+            player.actions.mulligan()
+            player.actions.draw_card_from_mazo(7)
+            player.zones.move_all_cards(hand, player.zones.mazo)
+            hand.mulligan_used = False
+    return run, 50
+
+
+@benchmark('advance_phase_cycle')
+def _advance_phase_cycle():
+    deck = load_cards(CATALOG)
+    base = new_game(deck, deck, 0)
+    base.waiting_for_action = None
+    turns = 20
+
+    def run():
+        game_state = base.clone()
+        for _ in range(turns * 5):
+            game_state.advance_phase()
+    return run, turns * 5
+
+
+@benchmark('game_state_clone')
+def _game_state_clone():
+    game_state = mid_game_state()
+
+    def run():
+        for _ in range(100):
+            game_state.clone()
+    return run, 100
+
+
+@benchmark('headless_game')
+def _headless_game():
+    deck = load_cards(CATALOG)
+    seeds = iter(range(10 ** 9))
+
+    def run():
+        seed = next(seeds) % 1000
+        run_game(deck, deck, random_policy(substream(seed, 'policy', 0)), random_policy(substream(seed, 'policy', 1)), seed)
+    return run, 1
+
+
+@benchmark('opening_hands_mulligan')
+def _opening_hands():
+    engine = OpeningEngine(load_cards(CATALOG), seed=0)
+    mulligan = mulligan_without_play(1)
+    return lambda: engine.deal(1 << 16, mulligan=mulligan), 1 << 16
+
+
+@benchmark('odds_all_of_cold')
+def _odds_all_of_cold():
+    odds = DeckOdds(load_cards(CATALOG))
+    requirements = [({'subtype': 'PIRATA'}, 2), ({'type': 'ACCION'}, 1), ({'max_cost': 2}, 1)]
+
+    def run():
+        # Sin la cache de resultados: mide la cuenta, no la consulta repetida
+        _all_of.cache_clear()
+        odds.all_of(7, requirements)
+    return run, 1
+
+
+def calibration_rate(min_time=CALIBRATION_TIME):
+    """ Vueltas por segundo de un bucle fijo de Python puro: qué tan rápida anda la máquina ahora """
+    loops = 0
+    start = time.perf_counter()
+    while True:
+        total = 0
+        for value in range(1000):
+            total += value
+        loops += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return loops / elapsed
+
+
+def measure(run, ops, min_time=MIN_TIME, repeats=REPEATS):
+    """
+    Mediana de ops/s de `repeats` rondas de al menos min_time segundos y KB pico
+    por llamada. La mediana no se mueve por una ronda suelta lenta o rápida.
+    Cada ronda se divide además por la velocidad de la máquina medida justo
+    antes y después (calibration_rate): `relative` es la mediana de esas
+    razones y es lo que se compara, así una máquina que se frena o se acelera
+    entre corridas no parece una regresión o una mejora.
+    """
+    run()   # calentar caches
+    rates = []
+    relatives = []
+    for _ in range(repeats):
+        before = calibration_rate()
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            run()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        rate = calls * ops / elapsed
+        rates.append(rate)
+        relatives.append(rate / ((before + calibration_rate()) / 2))
+
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'ops_per_sec': round(statistics.median(rates), 1),
+        'relative': float(f"{statistics.median(relatives):.4g}"),
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+def compare(name, result, baseline, threshold):
+    """ Texto con la diferencia contra la línea base y si es una regresión """
+    reference = baseline.get(name)
+    if reference is None:
+        return "sin línea base", False
+    metric = 'relative' if 'relative' in reference else 'ops_per_sec'
+    speed = result[metric] / reference[metric] - 1
+    memory = result['peak_kb'] / reference['peak_kb'] - 1 if reference['peak_kb'] else 0.0
+    # Diferencias de pocos KB son ruido (compactaciones, caches del intérprete)
+    grew = result['peak_kb'] - reference['peak_kb'] > MEMORY_NOISE_KB
+    regression = speed < -threshold or (memory > threshold and grew)
+    return f"{speed:+.0%} ops/s {memory:+.0%} memoria", regression
+
+
+def load_baseline():
+    if not os.path.exists(BASELINE_PATH):
+        return {}
+    with open(BASELINE_PATH, encoding='utf-8') as file:
+        return json.load(file)['results']
+
+
+def save_baseline(results):
+    data = {
+        'machine': {'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count()},
+        'results': results,
+    }
+    with open(BASELINE_PATH, 'w', encoding='utf-8') as file:
+        json.dump(data, file, indent=2, sort_keys=True)
+        file.write('\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks del motor")
+    parser.add_argument('names', nargs='*', help="filtrar casos por nombre")
+    parser.add_argument('--update', action='store_true', help="guardar esta corrida como línea base")
+    parser.add_argument('--threshold', type=float, default=THRESHOLD, help="tolerancia de regresión (0.15 = 15%%)")
+    parser.add_argument('--min-time', type=float, default=MIN_TIME, help="segundos mínimos por ronda")
+    parser.add_argument('--repeats', type=int, default=REPEATS, help="rondas por caso (se toma la mediana)")
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline()
+    results = {}
+    regressions = []
+    try:
+        for name, setup in BENCHMARKS.items():
+            if args.names and not any(part in name for part in args.names):
+                continue
+            run, ops = setup()
+            results[name] = measure(run, ops, args.min_time, args.repeats)
+            note, regression = compare(name, results[name], baseline, args.threshold)
+            if regression:
+                regressions.append(name)
+            print(f"{name:<30} {results[name]['ops_per_sec']:>12,.1f} ops/s {results[name]['peak_kb']:>10,.1f} KB pico | "
+                  f"{note}{' | REGRESIÓN' if regression else ''}")
+    finally:
+        while _cleanup:
+            _cleanup.pop()()
+
+    if args.update:
+        save_baseline({**baseline, **results})
+        print(f"Línea base guardada en {BASELINE_PATH}")
+        return 0
+    if regressions:
+        print(f"Regresiones de más de {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,27 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
-import pandas as pd
+import hashlib
+import os
+import csv
+import math
+import pickle
 
+from effects import compile_effect, enter_play_program, run_program
+from events import EVENTS, Event
+from keywords import (
+    KEYWORDS, ENTER_PLAY, FRENZY, STEALTH, THEFT, EVASION, EROSION, DESTROY,
+)
 from utils import generate_instance_id
 
 
-@dataclass
-class Card(ABC):
-    """Clase base abstracta para todas las cartas"""
+@dataclass(frozen=True)
+class CardDefinition(ABC):
+    """
+    Clase base abstracta para todas las cartas. Guarda sólo los datos estáticos
+    de la carta y es inmutable, así una misma definición se comparte entre
+    todas las copias, jugadores y partidas (ver CardInstance).
+    """
     name: str
     cost: int
     text: str
@@ -19,7 +32,14 @@ class Card(ABC):
     subtype_1: Optional[str]
     subtype_2: Optional[str]
     clarification: Optional[str]
-    instance_id: str
+    # Máscara de palabras clave del texto, se calcula una vez al crear la carta
+    keywords: int = field(default=0, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, 'keywords', KEYWORDS.parse(self.text))
+    
+    def has_keyword(self, keyword: int) -> bool:
+        return bool(self.keywords & keyword)
     
     @abstractmethod
     def can_be_played(self, available_gold: int) -> bool:
@@ -28,15 +48,15 @@ class Card(ABC):
     
     def has_enter_play_effect(self) -> bool:
         """Verifica si la carta tiene efecto de 'Aparición en juego'"""
-        return "Aparición en juego:" in self.text
+        return bool(self.keywords & ENTER_PLAY)
     
-    def on_enter_play(self):
-        """Ejecuta el efecto de aparición en juego (a implementar en subclases si es necesario)"""
-        pass
+    def on_enter_play(self, zones, resources, rival_zones=None, rival_resources=None):
+        """Ejecuta el efecto de aparición en juego (programa compilado y cacheado por texto)"""
+        run_program(enter_play_program(self.text), zones, resources, rival_zones, rival_resources)
 
 
-@dataclass
-class Unit(Card):
+@dataclass(frozen=True)
+class Unit(CardDefinition):
     """Cartas de tipo UNIDAD - criaturas que van al Reino"""
     strength: int
     toughness: int
@@ -50,23 +70,23 @@ class Unit(Card):
     
     def has_frenzy(self) -> bool:
         """Verifica si tiene la habilidad Frenesí"""
-        return "Frenesí" in self.text
+        return bool(self.keywords & FRENZY)
     
     def has_stealth(self) -> bool:
         """Verifica si tiene la habilidad Sorpresivo"""
-        return "Sorpresivo" in self.text
+        return bool(self.keywords & STEALTH)
     
     def has_theft(self) -> bool:
         """Verifica si tiene la habilidad Hurto"""
-        return "Hurto" in self.text
+        return bool(self.keywords & THEFT)
     
     def has_evasion(self) -> bool:
         """Verifica si tiene la habilidad Evasión"""
-        return "Evasión" in self.text
+        return bool(self.keywords & EVASION)
 
 
-@dataclass
-class Monument(Card):
+@dataclass(frozen=True)
+class Monument(CardDefinition):
     """Cartas de tipo MONUMENTO - estructuras permanentes"""
     
     def can_be_played(self, available_gold: int) -> bool:
@@ -74,11 +94,11 @@ class Monument(Card):
     
     def has_erosion(self) -> bool:
         """Verifica si tiene la habilidad Erosión"""
-        return "Erosión" in self.text
+        return bool(self.keywords & EROSION)
 
 
-@dataclass
-class Action(Card):
+@dataclass(frozen=True)
+class Action(CardDefinition):
     """Cartas de tipo ACCIÓN - efectos instantáneos"""
     
     def can_be_played(self, available_gold: int) -> bool:
@@ -88,14 +108,15 @@ class Action(Card):
         """Verifica si es una acción rápida"""
         return self.supertype == "RAPIDA"
     
-    def resolve_effect(self):
-        """Resuelve el efecto de la acción y la envía al descarte"""
-        print(f"Resolviendo efecto de {self.name}")
-        # Aquí iría la lógica específica del efecto
+    def resolve_effect(self, zones, resources, rival_zones=None, rival_resources=None):
+        """Resuelve el efecto de la acción (el que la juega la envía al descarte)"""
+        if EVENTS.enabled:
+            EVENTS.emit(Event.EFFECT_RESOLVE, (self.name,))
+        run_program(compile_effect(self.text), zones, resources, rival_zones, rival_resources)
 
 
-@dataclass
-class Treasure(Card):
+@dataclass(frozen=True)
+class Treasure(CardDefinition):
     """Cartas de tipo TESORO - van a la Zona de Reserva y generan oro"""
     
     def can_be_played(self, available_gold: int) -> bool:
@@ -108,11 +129,11 @@ class Treasure(Card):
     
     def has_destroy_ability(self) -> bool:
         """Verifica si tiene habilidad de 'Destruir'"""
-        return "Destruir:" in self.text
+        return bool(self.keywords & DESTROY)
 
 
-@dataclass
-class Token(Card):
+@dataclass(frozen=True)
+class Token(CardDefinition):
     """Cartas de tipo TOKEN - representan recursos o efectos temporales"""
 
     def can_be_played(self, available_gold: int) -> bool:
@@ -124,79 +145,238 @@ class Token(Card):
         return 1
     
 
-# No se como puedo usar esta clase
-# class CardInPlay:
-#     _next_id = 1  # Variable de clase
+class CardInstance:
+    """
+    Copia de una carta dentro de una partida: id, dueño y estado (agotada, daño).
+    Los datos estáticos se leen de la definición compartida.
+    """
+    __slots__ = ('instance_id', 'owner', 'is_tapped', 'current_damage', 'card')
+    
+    def __init__(self, card: CardDefinition, owner=None):
+        self.card = card
+        self.owner = owner
+        self.is_tapped = False
+        self.current_damage = 0
+        self.instance_id = next(generate_instance_id)
+    
+    # Métodos de conveniencia para acceder a propiedades de la carta
+    @property
+    def name(self):
+        return self.card.name
+    
+    @property
+    def cost(self):
+        return self.card.cost
     
-#     def __init__(self, card):
-#         self.card = card
-#         self.is_tapped = False
-#         self.current_damage = 0
-#         self.id = CardInPlay._next_id
-#         CardInPlay._next_id += 1
+    @property
+    def type(self):
+        return self.card.type
     
-#     # Métodos de conveniencia para acceder a propiedades de la carta
-#     @property
-#     def name(self):
-#         return self.card.name
+    @property
+    def text(self):
+        return self.card.text
     
-#     @property
-#     def cost(self):
-#         return self.card.cost
+    @property
+    def strength(self):
+        return self.card.strength
+    
+    @property
+    def toughness(self):
+        return self.card.toughness
+    
+    def __getattr__(self, attribute):
+        # Resto de datos y métodos (can_be_played, has_frenzy...)
+        if attribute == 'card':
+            # Instancia a medio construir (pickle/copy): no delegar
+            raise AttributeError(attribute)
+        return getattr(self.card, attribute)
+    
+    def clone(self, owner=None):
+        """Copia del estado de la instancia (mismo id) compartiendo la definición"""
+        clone = CardInstance.__new__(CardInstance)
+        clone.card = self.card
+        clone.owner = owner if owner is not None else self.owner
+        clone.is_tapped = self.is_tapped
+        clone.current_damage = self.current_damage
+        clone.instance_id = self.instance_id
+        return clone
+    
+    def __repr__(self):
+        return f"CardInstance({self.instance_id}, {self.card.name})"
+
+
+# Valores que pandas.read_csv interpreta como NaN por defecto
+_NA_VALUES = frozenset({
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND',
+    '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+})
 
+# Columnas del CSV -> campos de CardDefinition
+_REQUIRED_COLUMNS = {
+    'name': 'Nombre',
+    'text': 'Texto',
+    'expansion': 'Expansión',
+    'rareness': 'Rareza',
+    'type': 'Tipo',
+}
+_OPTIONAL_COLUMNS = {
+    'supertype': 'Supertipo',
+    'subtype_1': 'Subtipo 1',
+    'subtype_2': 'Subtipo 2',
+    'clarification': 'Aclaraciones',
+}
 
 
-def load_cards(path_csv: str):
-    df = pd.read_csv(path_csv)
-    cards: list[Card] = []
-    tresure_cards: list[Card] = []
-    token_cards: list[Card] = []
+def _missing_columns(path, header):
+    """ Error claro si al catálogo le faltan columnas obligatorias (en lugar de cartas con NaN) """
+    missing = [column for column in (*_REQUIRED_COLUMNS.values(), 'Coste') if column not in header]
+    if missing:
+        raise ValueError(f"{path}: faltan las columnas {', '.join(missing)} (encabezado: {', '.join(map(str, header))})")
+
+
+def _read_csv_columns(path_csv: str):
+    """Lee el CSV con el módulo csv y devuelve (columns, costs, strengths, toughnesses)"""
+    # utf-8-sig: Excel guarda los CSV con BOM y sin esto la primera columna sería '\ufeffNombre'
+    with open(path_csv, newline='', encoding='utf-8-sig') as source:
+        rows = list(csv.reader(source))
+    header, rows = rows[0], rows[1:]
+    _missing_columns(path_csv, header)
+    raw = {column: [row[index] for row in rows] for index, column in enumerate(header)}
     
-    for _, row in df.iterrows():
-        card_type = row['Tipo']
-        
-        # Datos comunes para todas las cartas
-        common_data = {
-            'name': row['Nombre'],
-            'cost': int(row['Coste']),
-            'text': row['Texto'],
-            'expansion': row['Expansión'],
-            'rareness': row['Rareza'],
-            'type': row['Tipo'],
-            'supertype': row.get('Supertipo') if pd.notna(row.get('Supertipo')) else None,
-            'subtype_1': row.get('Subtipo 1') if pd.notna(row.get('Subtipo 1')) else None,
-            'subtype_2': row.get('Subtipo 2') if pd.notna(row.get('Subtipo 2')) else None,
-            'clarification': row.get('Aclaraciones') if pd.notna(row.get('Aclaraciones')) else None,
-            'instance_id': next(generate_instance_id),
-        }
+    def optional(column, missing):
+        values = raw.get(column)
+        if values is None:
+            return [missing] * len(rows)
+        return [missing if value in _NA_VALUES else value for value in values]
+    
+    units = [card_type == 'UNIDAD' for card_type in raw['Tipo']]
+    
+    def as_int(column):
+        # Sólo las unidades tienen fuerza y resistencia: el resto puede traer '-' u otro relleno
+        return [int(float(value)) if unit and value not in _NA_VALUES and value.strip() != '' else 0
+                for unit, value in zip(units, optional(column, ''))]
+    
+    # Los campos obligatorios vacíos quedan como NaN, igual que con pandas
+    columns = {field: optional(column, math.nan) for field, column in _REQUIRED_COLUMNS.items()}
+    columns.update({field: optional(column, None) for field, column in _OPTIONAL_COLUMNS.items()})
+    costs = [int(float(value)) for value in raw['Coste']]
+    return columns, costs, as_int('Fuerza'), as_int('Resistencia')
+
+
+def _read_excel_columns(path_xlsx: str):
+    """Lee un .xlsx con pandas (sólo se importa en este caso) y devuelve lo mismo que _read_csv_columns"""
+    import pandas as pd
+    
+    df = pd.read_excel(path_xlsx)
+    _missing_columns(path_xlsx, list(df.columns))
+    units = (df['Tipo'] == 'UNIDAD').tolist()
+    
+    def optional(column):
+        if column not in df:
+            return [None] * len(df)
+        values = df[column]
+        return values.astype(object).where(values.notna(), None).tolist()
+    
+    def as_int(column):
+        if column not in df:
+            return [0] * len(df)
+        values = df[column].where(units)
+        if not pd.api.types.is_numeric_dtype(values):
+            values = pd.to_numeric(values.astype(str).str.strip().mask(lambda column: column.isin(['', 'nan'])))
+        return values.fillna(0).astype(int).tolist()
+    
+    columns = {field: df[column].tolist() for field, column in _REQUIRED_COLUMNS.items()}
+    columns.update({field: optional(column) for field, column in _OPTIONAL_COLUMNS.items()})
+    return columns, df['Coste'].astype(int).tolist(), as_int('Fuerza'), as_int('Resistencia')
+
+
+def _parse_cards(path_csv: str):
+    if path_csv.endswith('.xlsx'):
+        columns, costs, strengths, toughnesses = _read_excel_columns(path_csv)
+    else:
+        columns, costs, strengths, toughnesses = _read_csv_columns(path_csv)
+    
+    cards: list[CardDefinition] = []
+    tresure_cards: list[CardDefinition] = []
+    token_cards: list[CardDefinition] = []
+    
+    targets = {
+        'MONUMENTO': (Monument, cards),
+        'ACCION': (Action, cards),
+        'TESORO': (Treasure, tresure_cards),
+        'TOKEN': (Token, token_cards),
+    }
+    columns['cost'] = costs
+    keys = list(columns)
+    
+    for values, strength, toughness in zip(zip(*columns.values()), strengths, toughnesses):
+        common_data = dict(zip(keys, values))
+        card_type = common_data['type']
         
         # Crear la instancia específica según el tipo
         if card_type == 'UNIDAD':
-            # Manejar strength y toughness para unidades
-            strength = 0
-            toughness = 0
-            
-            if pd.notna(row['Fuerza']) and str(row['Fuerza']).strip() != '':
-                strength = int(row['Fuerza'])
-                
-            if pd.notna(row['Resistencia']) and str(row['Resistencia']).strip() != '':
-                toughness = int(row['Resistencia'])
-            
             cards.append(Unit(strength=strength, toughness=toughness, **common_data))
-            
-        elif card_type == 'MONUMENTO':
-            cards.append(Monument(**common_data))
-            
-        elif card_type == 'ACCION':
-            cards.append(Action(**common_data))
-            
-        elif card_type == 'TESORO':
-            tresure_cards.append(Treasure(**common_data))
-            
-        elif card_type == 'TOKEN':
-            token_cards.append(Token(**common_data))
-        
+        elif card_type in targets:
+            card_class, target = targets[card_type]
+            target.append(card_class(**common_data))
         else:
-            print(f"Tipo de carta desconocido: {card_type}")
+            EVENTS.emit(Event.UNKNOWN_CARD_TYPE, (card_type,))
 
     return (cards, tresure_cards, token_cards)
+
+
+# Versión del formato del snapshot, cambiarla si cambian las clases de cartas
+CATALOG_CACHE_VERSION = 2
+
+
+def _cache_version():
+    # Las máscaras de palabras clave dependen del registro
+    return (CATALOG_CACHE_VERSION, KEYWORDS.signature())
+
+
+def catalog_cache_path(path_csv: str) -> str:
+    return f"{path_csv}.cache"
+
+
+def _read_catalog_cache(cache_path: str, source_hash: str):
+    try:
+        with open(cache_path, 'rb') as cache_file:
+            version, cached_hash, catalog = pickle.load(cache_file)
+    except (OSError, EOFError, ValueError, TypeError, AttributeError, pickle.UnpicklingError):
+        return None
+    
+    if version != _cache_version() or cached_hash != source_hash:
+        return None
+    return catalog
+
+
+def _write_catalog_cache(cache_path: str, source_hash: str, catalog):
+    # Se escribe a un temporal y se reemplaza para no dejar snapshots a medias
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as cache_file:
+            pickle.dump((_cache_version(), source_hash, catalog), cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Sin permisos de escritura el cache simplemente no se usa
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def load_cards(path_csv: str, use_cache: bool = True):
+    """
+    Carga las cartas del CSV. Con use_cache guarda un snapshot compilado junto al CSV
+    y lo reutiliza mientras el hash del contenido del CSV no cambie.
+    """
+    if not use_cache:
+        return _parse_cards(path_csv)
+    
+    with open(path_csv, 'rb') as source:
+        source_hash = hashlib.blake2b(source.read(), digest_size=16).hexdigest()
+    
+    cache_path = catalog_cache_path(path_csv)
+    catalog = _read_catalog_cache(cache_path, source_hash)
+    if catalog is None:
+        catalog = _parse_cards(path_csv)
+        _write_catalog_cache(cache_path, source_hash, catalog)
+    return catalog
@@ -0,0 +1,69 @@
+"""
+Resolución del combate al terminar la fase ATTACK.
+
+Cada atacante declarado que sigue en combate se enfrenta a su defensor, si lo
+tiene: ambos se hacen daño igual a su fuerza y el que acumula daño igual o
+mayor a su resistencia va al descarte (con el daño en 0). Un atacante sin
+defensor le quita su fuerza en vida al jugador que defiende. El daño que no
+destruye queda en la unidad hasta la limpieza del turno (GameState._cleanup_phase).
+
+Se resuelve partida por partida con aritmética de Python: el combate es un 2%
+del tiempo de una partida (benchmarks/bench_combat.py) y más de la mitad de los
+turnos no tiene atacantes, así que juntar los combates de muchas partidas en
+arrays de NumPy costaba más de lo que ahorraba.
+"""
+
+
+def combat_pairs(game_state):
+    """ [(atacante, defensor o None)] de los atacantes declarados que siguen en combate """
+    return list(_pairs(game_state, game_state.current_player.zones, game_state.get_oponent().zones))
+
+
+def _pairs(game_state, attacking, defending):
+    attacker_zone = attacking.combate
+    defender_zone = defending.combate
+    defenders = game_state.declared_defenders
+    for attacker_id in game_state.declared_attackers:
+        attacker = attacker_zone.find(attacker_id)
+        if attacker is None:
+            continue
+        defender_id = defenders.get(attacker_id)
+        yield attacker, defender_zone.find(defender_id) if defender_id is not None else None
+
+
+def combat_outcome(attacker, defender):
+    """ (daño del atacante, daño del defensor, muere atacante, muere defensor, vida perdida) """
+    if defender is None:
+        return attacker.current_damage, 0, False, False, attacker.strength
+    attacker_damage = attacker.current_damage + defender.strength
+    defender_damage = defender.current_damage + attacker.strength
+    return (attacker_damage, defender_damage,
+            attacker_damage >= attacker.toughness, defender_damage >= defender.toughness, 0)
+
+
+def _apply_damage(zones, unit, damage, dies):
+    if dies:
+        zones.set_card_state(unit, 'current_damage', 0)
+        zones.move_card(zones.combate, zones.descarte, unit.instance_id)
+    elif damage != unit.current_damage:
+        zones.set_card_state(unit, 'current_damage', damage)
+
+
+def resolve_combat(game_state):
+    """ Aplica daño, muertes y pérdida de vida del combate declarado """
+    game_state.combat_resolved = True
+    if not game_state.declared_attackers:
+        return
+
+    attacking = game_state.current_player.zones
+    defending = game_state.get_oponent()
+    life_loss = 0
+    for attacker, defender in _pairs(game_state, attacking, defending.zones):
+        if defender is None:
+            life_loss += attacker.strength
+            continue
+        attacker_damage, defender_damage, attacker_dies, defender_dies, _ = combat_outcome(attacker, defender)
+        _apply_damage(attacking, attacker, attacker_damage, attacker_dies)
+        _apply_damage(defending.zones, defender, defender_damage, defender_dies)
+    if life_loss:
+        defending.resources.health.remove_life_points(life_loss)
@@ -1,13 +1,18 @@
 import random
+from collections import deque
 
 class Deck():
-    def __init__(self, cards):
+    def __init__(self, cards, rng=None):
         # if len(cards) < 45 or len(cards) > 60:
         #     raise ValueError("Deck must contain between 45 and 60 cards.")
-        self.cards = cards
+        # deque: robar de arriba es O(k) y poner al fondo O(1)
+        self.cards = deque(cards)
+        self.rng = rng or random.Random()
 
     def shuffle(self):
-        random.shuffle(self.cards)
+        cards = list(self.cards)
+        self.rng.shuffle(cards)
+        self.cards = deque(cards)
 
     def draw(self, count=1):
         if count < 1 and count > 7:
@@ -16,11 +21,13 @@ class Deck():
         if count > len(self.cards):
             raise ValueError("Not enough cards in the deck to draw.")
         
-        drawn_cards = self.cards[:count]
-        self.cards = self.cards[count:]
+        drawn_cards = [self.cards.popleft() for _ in range(count)]
         
         return drawn_cards
 
+    def put_on_bottom(self, cards):
+        self.cards.extend(cards)
+
     def __len__(self):
         return len(self.cards)
 
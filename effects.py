@@ -0,0 +1,200 @@
+"""
+Compilador de efectos: convierte el texto de reglas de una carta en un
+programa, una tupla de (EffectOp, argumentos), y lo ejecuta contra las zonas
+y recursos de los jugadores.
+
+Cada texto se compila una sola vez (cache por texto), así todas las copias
+de una carta comparten el mismo programa. Las frases que no se reconocen se
+compilan como UNSUPPORTED y el intérprete las ignora (emite
+Event.EFFECT_UNSUPPORTED con la frase).
+
+Los objetivos los elige el motor, no una política: el daño, destruir y
+regresar van a las primeras unidades de la formación rival.
+
+No se modela:
+- Crear fichas ("Crea una ficha libro"): el catálogo no trae la definición de
+  esas fichas, así que la frase queda UNSUPPORTED.
+- La elección de Excavar y Predicción: se resuelven mirando las cartas y
+  dejándolas todas en el tope, una de las elecciones que permiten las reglas.
+- Efectos modales ("Elige ..."), condiciones ("Si ...") y habilidades activadas.
+"""
+import re
+from enum import Enum
+from functools import lru_cache
+
+from events import EVENTS, Event
+
+
+class EffectOp(Enum):
+    DAMAGE_UNIT = "damage_unit"               # (daño, objetivos)
+    DESTROY_UNIT = "destroy_unit"             # ()
+    RETURN_UNIT = "return_unit"               # ()
+    DRAW = "draw"                             # (cartas,)
+    DISCARD = "discard"                       # (cartas,)
+    RETURN_TREASURE = "return_treasure"       # (cantidad o None para todas,)
+    EXCAVATE = "excavate"                     # (cartas,)
+    PREDICT = "predict"                       # (cartas, zona)
+    UNSUPPORTED = "unsupported"               # (texto,)
+
+
+ENTER_PLAY_MARK = "Aparición en juego:"
+
+# Donde termina el texto de "Aparición en juego" y empieza otra habilidad
+_ABILITY_STARTS = re.compile(r'Siempre que|Derrotado:|Resguardo:|Agotar:|Al principio|\d+ (?:de )?oro')
+
+_REMINDER_TEXT = re.compile(r'\([^)]*\)')
+
+_NUMBERS = {'un': 1, 'una': 1, 'uno': 1, 'dos': 2, 'tres': 3, 'cuatro': 4, 'cinco': 5}
+
+# (patrón, opcode, función que arma los argumentos desde el match)
+_PATTERNS = [
+    # "la unidad objetivo" sin "rival" también: el motor apunta a unidades rivales
+    (re.compile(r'Hace (\w+) daños? (?:hasta )?a (?:la|(\w+)) unidad(?:es)? (?:rivale?s? )?objetivo'),
+     EffectOp.DAMAGE_UNIT, lambda m: (_number(m.group(1)), _number(m.group(2) or 'una'))),
+    (re.compile(r'Destruye la unidad rival objetivo'),
+     EffectOp.DESTROY_UNIT, lambda m: ()),
+    (re.compile(r'Regresa (?:hasta )?(?:la|una) unidad rival objetivo'),
+     EffectOp.RETURN_UNIT, lambda m: ()),
+    (re.compile(r'Roba (\w+) cartas?'),
+     EffectOp.DRAW, lambda m: (_number(m.group(1)),)),
+    (re.compile(r'(?:El jugador objetivo|El oponente objetivo|Cada oponente) descarta\s+(\w+) cartas?'),
+     EffectOp.DISCARD, lambda m: (_number(m.group(1)),)),
+    (re.compile(r'Regresa (la carta|todas las cartas) de tesoro (?:objetivo )?de tu Descarte al campo'),
+     EffectOp.RETURN_TREASURE, lambda m: (1 if m.group(1) == 'la carta' else None,)),
+    (re.compile(r'Excavar Bóveda (\w+)'),
+     EffectOp.EXCAVATE, lambda m: (_number(m.group(1)),)),
+    (re.compile(r'Predicción (?:(Bóveda) )?(\w+)'),
+     EffectOp.PREDICT, lambda m: (_number(m.group(2)), 'boveda' if m.group(1) else 'mazo')),
+]
+
+
+def _number(word):
+    if word.isdigit():
+        return int(word)
+    return _NUMBERS.get(word.lower(), 1)
+
+
+def _compile_sentence(sentence):
+    for pattern, op, build_args in _PATTERNS:
+        match = pattern.match(sentence)
+        if match:
+            return (op, build_args(match))
+    return (EffectOp.UNSUPPORTED, (sentence,))
+
+
+@lru_cache(maxsize=None)
+def compile_effect(text):
+    """Compila un texto de efecto a una tupla de (EffectOp, argumentos)"""
+    if not isinstance(text, str) or not text.strip():
+        return ()
+    # Los efectos modales no se modelan todavía
+    if text.lstrip().startswith('Elige'):
+        return ((EffectOp.UNSUPPORTED, (text.strip(),)),)
+
+    # El texto recordatorio entre paréntesis no tiene efecto
+    text = _REMINDER_TEXT.sub('', text)
+    sentences = [sentence.strip() for sentence in text.split('.')]
+    return tuple(_compile_sentence(sentence) for sentence in sentences if sentence)
+
+
+@lru_cache(maxsize=None)
+def enter_play_program(text):
+    """Programa del efecto 'Aparición en juego:' de un texto de carta"""
+    if not isinstance(text, str) or ENTER_PLAY_MARK not in text:
+        return ()
+    segment = text.split(ENTER_PLAY_MARK, 1)[1]
+    end = _ABILITY_STARTS.search(segment)
+    if end:
+        segment = segment[:end.start()]
+    return compile_effect(segment)
+
+
+# Intérprete
+
+def _first_unit(zones):
+    for card in zones.formacion:
+        if card.type == 'UNIDAD':
+            return card
+    return None
+
+
+def _damage_unit(args, zones, resources, rival_zones, rival_resources):
+    # "hasta a dos unidades": objetivos distintos, cada uno recibe el daño una vez
+    damage, targets = args
+    units = [card for card in rival_zones.formacion if card.type == 'UNIDAD'][:targets]
+    for unit in units:
+        rival_zones.set_card_state(unit, 'current_damage', unit.current_damage + damage)
+        if unit.current_damage >= unit.toughness:
+            rival_zones.set_card_state(unit, 'current_damage', 0)
+            rival_zones.move_card(rival_zones.formacion, rival_zones.descarte, unit.instance_id)
+
+
+def _destroy_unit(args, zones, resources, rival_zones, rival_resources):
+    unit = _first_unit(rival_zones)
+    if unit is not None:
+        rival_zones.set_card_state(unit, 'current_damage', 0)
+        rival_zones.move_card(rival_zones.formacion, rival_zones.descarte, unit.instance_id)
+
+
+def _return_unit(args, zones, resources, rival_zones, rival_resources):
+    unit = _first_unit(rival_zones)
+    if unit is not None:
+        rival_zones.set_card_state(unit, 'current_damage', 0)
+        rival_zones.move_card(rival_zones.formacion, rival_zones.hand, unit.instance_id)
+
+
+def _draw(args, zones, resources, rival_zones, rival_resources):
+    count = min(args[0], len(zones.mazo), zones.hand.max_size - len(zones.hand))
+    if count > 0:
+        zones.move_card(zones.mazo, zones.hand, amount=count)
+
+
+def _discard(args, zones, resources, rival_zones, rival_resources):
+    for _ in range(args[0]):
+        hand = rival_zones.hand.see_cards()
+        if not hand:
+            return
+        rival_zones.move_card(rival_zones.hand, rival_zones.descarte, hand[0].instance_id)
+
+
+def _return_treasure(args, zones, resources, rival_zones, rival_resources):
+    count = args[0]
+    for card in zones.descarte.see_cards():
+        if count == 0 or not zones.reserva_tesoros.can_add():
+            return
+        if card.type == 'TESORO':
+            zones.move_card(zones.descarte, zones.reserva_tesoros, card.instance_id)
+            if count is not None:
+                count -= 1
+
+
+def _keep_on_top(args, zones, resources, rival_zones, rival_resources):
+    # Excavar / Predicción: mirar y dejar todas las cartas en el tope, sin cambios
+    pass
+
+
+def _unsupported(args, zones, resources, rival_zones, rival_resources):
+    if EVENTS.enabled:
+        EVENTS.emit(Event.EFFECT_UNSUPPORTED, args)
+
+
+_HANDLERS = {
+    EffectOp.DAMAGE_UNIT: _damage_unit,
+    EffectOp.DESTROY_UNIT: _destroy_unit,
+    EffectOp.RETURN_UNIT: _return_unit,
+    EffectOp.DRAW: _draw,
+    EffectOp.DISCARD: _discard,
+    EffectOp.RETURN_TREASURE: _return_treasure,
+    EffectOp.EXCAVATE: _keep_on_top,
+    EffectOp.PREDICT: _keep_on_top,
+    EffectOp.UNSUPPORTED: _unsupported,
+}
+
+
+def run_program(program, zones, resources, rival_zones=None, rival_resources=None):
+    """Ejecuta un programa compilado contra las zonas/recursos del jugador y su rival"""
+    for op, args in program:
+        if rival_zones is None and op in (EffectOp.DAMAGE_UNIT, EffectOp.DESTROY_UNIT,
+                                          EffectOp.RETURN_UNIT, EffectOp.DISCARD):
+            continue
+        _HANDLERS[op](args, zones, resources, rival_zones, rival_resources)
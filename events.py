@@ -0,0 +1,194 @@
+"""
+Eventos estructurados del motor en lugar de print.
+
+Cada evento es un código (Event) con un nivel por defecto y una tupla de
+valores simples (str, int, float, bool, None). Sin destinos registrados el
+emisor global está apagado y los puntos de emisión sólo chequean un atributo:
+
+    if EVENTS.enabled:
+        EVENTS.emit(Event.PHASE_START, (phase.value, turn))
+
+Para ver o guardar los eventos se agregan destinos con su nivel mínimo:
+
+    EVENTS.add_sink(TextSink(), Level.INFO)                # consola (game.py)
+    EVENTS.add_sink(JsonlSink('traza.jsonl'), Level.DEBUG)  # una línea JSON por evento
+    EVENTS.add_sink(BinarySink('traza.bin'), Level.DEBUG)   # compacto, ver read_binary
+    ...
+    EVENTS.close()
+"""
+import json
+import struct
+import sys
+from enum import IntEnum
+
+
+class Level(IntEnum):
+    DEBUG = 10
+    INFO = 20
+    WARNING = 30
+    ERROR = 40
+
+
+class Event(IntEnum):
+    PHASE_START = 1         # (fase, turno)
+    ACTION = 2              # (jugador, acción, éxito, id de carta, id de objetivo)
+    GAME_OVER = 3           # (ganador, turno)
+    EFFECT_RESOLVE = 4      # (carta,)
+    CARD_FOUND = 5          # (zona, instance_id)
+    CARD_NOT_FOUND = 6      # (zona, instance_id)
+    NOT_ENOUGH_CARDS = 7    # (zona, pedidas, disponibles)
+    ZONE_FULL = 8           # (zona,)
+    UNKNOWN_CARD_TYPE = 9   # (tipo,)
+    EFFECT_UNSUPPORTED = 10 # (frase,)
+
+
+# Nivel y texto para la consola de cada evento
+EVENT_INFO = {
+    Event.PHASE_START: (Level.INFO, "Start {0} (turno {1})"),
+    Event.ACTION: (Level.DEBUG, "{0}: {1} {3} {4} -> {2}"),
+    Event.GAME_OVER: (Level.INFO, "Ganador: {0} en el turno {1}"),
+    Event.EFFECT_RESOLVE: (Level.INFO, "Resolviendo efecto de {0}"),
+    Event.CARD_FOUND: (Level.DEBUG, "Card found: {1} en {0}"),
+    Event.CARD_NOT_FOUND: (Level.WARNING, "Error: carta {1} no encontrada en {0}"),
+    Event.NOT_ENOUGH_CARDS: (Level.WARNING, "No hay suficientes cartas en {0}: pedidas {1}, quedan {2}"),
+    Event.ZONE_FULL: (Level.WARNING, "{0} completa"),
+    Event.UNKNOWN_CARD_TYPE: (Level.ERROR, "Tipo de carta desconocido: {0}"),
+    Event.EFFECT_UNSUPPORTED: (Level.INFO, "Efecto no soportado, se ignora: {0}"),
+}
+
+
+class TextSink:
+    """ Texto legible por evento; por defecto a sys.stdout (el vigente al escribir) """
+    def __init__(self, stream=None) -> None:
+        self.stream = stream
+
+    def write(self, code, level, payload):
+        print(EVENT_INFO[code][1].format(*payload), file=self.stream or sys.stdout)
+
+    def close(self):
+        pass
+
+
+class JsonlSink:
+    """ Una línea JSON por evento: {"event": nombre, "level": nivel, "data": [...]} """
+    def __init__(self, path) -> None:
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def write(self, code, level, payload):
+        self.file.write(json.dumps({'event': code.name, 'level': level.name, 'data': payload}, ensure_ascii=False))
+        self.file.write('\n')
+
+    def close(self):
+        self.file.close()
+
+
+# Formato binario: cabecera y por evento (código, nivel, cantidad de valores)
+# seguido de cada valor con una etiqueta de un byte
+BINARY_MAGIC = b'EVT1'
+_RECORD = struct.Struct('<HBB')
+_INT = struct.Struct('<q')
+_FLOAT = struct.Struct('<d')
+_STR_LEN = struct.Struct('<H')
+
+
+class BinarySink:
+    """ Eventos en binario compacto; se leen con read_binary """
+    def __init__(self, path) -> None:
+        self.file = open(path, 'wb')
+        self.file.write(BINARY_MAGIC)
+
+    def write(self, code, level, payload):
+        parts = [_RECORD.pack(code, level, len(payload))]
+        for value in payload:
+            if value is None:
+                parts.append(b'n')
+            elif value is True or value is False:
+                parts.append(b't' if value else b'f')
+            elif isinstance(value, int):
+                parts.append(b'i' + _INT.pack(value))
+            elif isinstance(value, float):
+                parts.append(b'd' + _FLOAT.pack(value))
+            else:
+                data = str(value).encode('utf-8')
+                parts.append(b's' + _STR_LEN.pack(len(data)) + data)
+        self.file.write(b''.join(parts))
+
+    def close(self):
+        self.file.close()
+
+
+def read_binary(path):
+    """ Itera los eventos (Event, Level, payload) de un archivo de BinarySink """
+    with open(path, 'rb') as file:
+        data = file.read()
+    if data[:len(BINARY_MAGIC)] != BINARY_MAGIC:
+        raise ValueError(f"{path} no es una traza binaria de eventos")
+
+    position = len(BINARY_MAGIC)
+    while position < len(data):
+        code, level, count = _RECORD.unpack_from(data, position)
+        position += _RECORD.size
+        payload = []
+        for _ in range(count):
+            tag = data[position:position + 1]
+            position += 1
+            if tag == b'n':
+                payload.append(None)
+            elif tag in (b't', b'f'):
+                payload.append(tag == b't')
+            elif tag == b'i':
+                payload.append(_INT.unpack_from(data, position)[0])
+                position += _INT.size
+            elif tag == b'd':
+                payload.append(_FLOAT.unpack_from(data, position)[0])
+                position += _FLOAT.size
+            else:
+                size = _STR_LEN.unpack_from(data, position)[0]
+                position += _STR_LEN.size
+                payload.append(data[position:position + size].decode('utf-8'))
+                position += size
+        yield Event(code), Level(level), tuple(payload)
+
+
+class EventEmitter:
+    """
+    Reparte eventos a los destinos registrados. `enabled` es False sin destinos,
+    así el costo de un evento apagado es un chequeo de atributo.
+    """
+    def __init__(self) -> None:
+        self.sinks = []         # (nivel mínimo, destino)
+        self.enabled = False
+        self.level = Level.ERROR + 1
+
+    def add_sink(self, sink, level=Level.INFO):
+        self.sinks.append((level, sink))
+        self._update()
+        return sink
+
+    def remove_sink(self, sink):
+        """ Quita y cierra el destino """
+        self.sinks = [(level, other) for level, other in self.sinks if other is not sink]
+        sink.close()
+        self._update()
+
+    def close(self):
+        """ Quita y cierra todos los destinos """
+        for _, sink in self.sinks:
+            sink.close()
+        self.sinks = []
+        self._update()
+
+    def _update(self):
+        self.enabled = bool(self.sinks)
+        self.level = min((level for level, _ in self.sinks), default=Level.ERROR + 1)
+
+    def emit(self, code, payload=()):
+        level = EVENT_INFO[code][0]
+        if level < self.level:
+            return
+        for sink_level, sink in self.sinks:
+            if level >= sink_level:
+                sink.write(code, level, payload)
+
+
+EVENTS = EventEmitter()
@@ -1,9 +1,10 @@
-import pdb
 from cards import load_cards
 from player import Player
 from phases import GameState, GamePhase, ActionType
+from events import EVENTS, TextSink, Level
 
 if __name__ == "__main__":
+    EVENTS.add_sink(TextSink(), Level.INFO)
     path = 'control_de_los_mares.csv'
     cards, tresure_cards, token_cards = load_cards(path)
     print(f"Se cargaron {len(cards)} cartas.")
@@ -71,16 +72,17 @@ if __name__ == "__main__":
             print(f"{key}: {value}")
         print("===================== \n")
             
-        option_num = int(game_state.current_player.get_player_input(f"{game_state.current_player.name} seleccione una opcion"))        
+        acting_player = game_state.get_acting_player()
+        option_num = int(acting_player.get_player_input(f"{acting_player.name} seleccione una opcion"))        
 
         if option_num == 1:
             game_state.advance_phase()
             
         elif option_num == 2:
-            print(game_state.current_player.zones.hand.see_cards())
+            print(acting_player.zones.hand.see_cards())
             
         elif option_num == 3:
-            print(game_state.current_player.zones.reserva_tesoros.see_cards())
+            print(acting_player.zones.reserva_tesoros.see_cards())
             
         elif option_num == 4:
             # pasar turno o current player
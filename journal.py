@@ -0,0 +1,70 @@
+"""
+Bitácora de cambios de estado para deshacer/rehacer sin copiar la partida.
+
+Cada mutación (mover cartas, oro, vida, fase) registra un par de funciones
+(deshacer, rehacer) que cuestan O(tamaño del cambio). Las zonas, recursos y el
+GameState sólo registran cuando tienen una bitácora asignada; sin bitácora el
+costo es un chequeo de None (ver GameState.enable_journal).
+
+    journal = game_state.enable_journal()
+    mark = journal.mark()
+    game_state.execute_action(player, ActionType.PLAY_CARD, card_id=card_id)
+    journal.undo(mark)   # vuelve al estado de mark
+    journal.redo()       # vuelve a aplicar lo deshecho
+"""
+
+
+class Journal:
+    def __init__(self) -> None:
+        self.entries = []       # (deshacer, rehacer) en orden de ejecución
+        self.redo_stack = []
+        self.suspended = False  # True mientras se deshace/rehace, para no registrar
+
+    def record(self, undo, redo):
+        if self.suspended:
+            return
+        self.entries.append((undo, redo))
+        self.redo_stack.clear()
+
+    def set_attr(self, obj, name, value):
+        """Asigna obj.name = value registrando el valor anterior"""
+        previous = getattr(obj, name)
+        setattr(obj, name, value)
+        self.record(lambda: setattr(obj, name, previous), lambda: setattr(obj, name, value))
+
+    def mark(self):
+        """Posición actual de la bitácora, para deshacer hasta ella"""
+        return len(self.entries)
+
+    def undo(self, mark=None):
+        """Deshace hasta mark (por defecto, el último cambio)"""
+        if mark is None:
+            mark = len(self.entries) - 1
+        self.suspended = True
+        try:
+            while len(self.entries) > max(mark, 0):
+                entry = self.entries.pop()
+                entry[0]()
+                self.redo_stack.append(entry)
+        finally:
+            self.suspended = False
+
+    def redo(self, count=None):
+        """Rehace los últimos `count` cambios deshechos (por defecto, todos)"""
+        if count is None:
+            count = len(self.redo_stack)
+        self.suspended = True
+        try:
+            for _ in range(min(count, len(self.redo_stack))):
+                entry = self.redo_stack.pop()
+                entry[1]()
+                self.entries.append(entry)
+        finally:
+            self.suspended = False
+
+    def clear(self):
+        self.entries.clear()
+        self.redo_stack.clear()
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,48 @@
+class KeywordRegistry:
+    """
+    Registro de palabras clave de las cartas. Cada palabra clave ocupa un bit y
+    el texto de cada carta se convierte una sola vez en una máscara de bits.
+    """
+    def __init__(self) -> None:
+        self._keywords = {}  # nombre -> (bit, texto a buscar)
+
+    def register(self, name, text):
+        """Registra una palabra clave y retorna su bit"""
+        if name in self._keywords:
+            return self._keywords[name][0]
+        bit = 1 << len(self._keywords)
+        self._keywords[name] = (bit, text)
+        return bit
+
+    def parse(self, text) -> int:
+        """Máscara con las palabras clave que aparecen en el texto"""
+        if not isinstance(text, str):
+            return 0
+        mask = 0
+        for bit, keyword in self._keywords.values():
+            if keyword in text:
+                mask |= bit
+        return mask
+
+    def names(self, mask):
+        return [name for name, (bit, _) in self._keywords.items() if mask & bit]
+
+    def signature(self):
+        """Identifica el contenido del registro (para invalidar snapshots de cartas)"""
+        return tuple((name, text) for name, (_, text) in self._keywords.items())
+
+    def __getitem__(self, name):
+        return self._keywords[name][0]
+
+
+KEYWORDS = KeywordRegistry()
+
+ENTER_PLAY = KEYWORDS.register('ENTER_PLAY', 'Aparición en juego:')
+FRENZY = KEYWORDS.register('FRENZY', 'Frenesí')
+STEALTH = KEYWORDS.register('STEALTH', 'Sorpresivo')
+THEFT = KEYWORDS.register('THEFT', 'Hurto')
+EVASION = KEYWORDS.register('EVASION', 'Evasión')
+EROSION = KEYWORDS.register('EROSION', 'Erosión')
+DESTROY = KEYWORDS.register('DESTROY', 'Destruir:')
+PREDICTION = KEYWORDS.register('PREDICTION', 'Predicción')
+EXCAVATE = KEYWORDS.register('EXCAVATE', 'Excavar')
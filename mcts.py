@@ -0,0 +1,276 @@
+"""
+Jugador Monte Carlo Tree Search sobre GameState.
+
+MCTSPolicy se usa como cualquier política de simulation.py, en el lugar de
+Player.get_player_input: ``policy(game_state, player) -> (ActionType, kwargs)``.
+Decide el mulligan/retorno de _handle_mulligan_return y las jugadas de cartas.
+
+Cada decisión corre árboles independientes en paralelo (paralelización de raíz)
+sobre clones del estado y suma las visitas de las acciones de la raíz. Los
+workers son procesos: con hilos el GIL deja correr un árbol a la vez y no hay
+aceleración. El presupuesto es por decisión: iteraciones o milisegundos, lo que llegue antes.
+El plazo se fija al entrar a la decisión y los workers lo reciben como instante
+absoluto, así que el reparto a los procesos y la recolección entran en el
+presupuesto (con un margen, COLLECT_MARGIN, para devolver los resultados).
+Una pasada completa del recolector de ciclos sobre un heap grande tarda decenas
+de ms y rompería el plazo: en el proceso que decide se pausa durante la
+búsqueda (la basura cíclica de una decisión es poca y se recolecta después) y
+los procesos workers congelan al arrancar el heap heredado con gc.freeze.
+Las simulaciones se cortan tras `playout_turns` turnos y se evalúan con una
+heurística de vida, mesa, mano y mazo.
+
+El clon de GameState copia el generador y el orden exacto de los mazos, así que
+buscar sobre él vería los robos futuros y la mano del rival. Cada iteración
+parte de una determinización (determinize): lo oculto se vuelve a repartir al
+azar con un generador propio de la iteración.
+"""
+import gc
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+
+from phases import ActionType
+from simulation import play_step, random_policy
+
+# Fracción del presupuesto reservada para recolectar y combinar los árboles
+COLLECT_MARGIN = 0.1
+
+
+def candidate_actions(game_state, player):
+    """ Acciones que el bot considera para el jugador en el estado actual """
+    actions = game_state.get_valid_actions(player)
+    if game_state.waiting_for_action == "mulligan_return":
+        return actions
+
+    # Copias de la misma carta son la misma jugada
+    candidates = []
+    seen = set()
+    for action in actions:
+        if action[0] == ActionType.PLAY_CARD:
+            name = player.zones.hand.find(action[1]['card_id']).name
+            if name in seen:
+                continue
+            seen.add(name)
+        candidates.append(action)
+    return candidates
+
+
+def _action_key(action):
+    action_type, kwargs = action
+    return (action_type, tuple(sorted(kwargs.items())))
+
+
+def evaluate(game_state, seat):
+    """ Valor del estado en [0, 1] desde el punto de vista del asiento `seat` """
+    me, rival = (game_state.player1, game_state.player2) if seat == 0 else (game_state.player2, game_state.player1)
+    if game_state.game_over:
+        if game_state.winner is me:
+            return 1.0
+        if game_state.winner is rival:
+            return 0.0
+        return 0.5
+
+    def board(player):
+        return sum(getattr(card, 'strength', 0) for card in player.zones.formacion)
+
+    score = (
+        0.05 * (me.resources.health.life_points - rival.resources.health.life_points)
+        + 0.02 * (board(me) - board(rival))
+        + 0.01 * (len(me.zones.hand) - len(rival.zones.hand))
+        + 0.02 * (len(me.zones.mazo) - len(rival.zones.mazo))
+    )
+    return 1.0 / (1.0 + math.exp(-score))
+
+
+class _Node:
+    __slots__ = ('visits', 'value', 'children')
+
+    def __init__(self):
+        self.visits = 0
+        self.value = 0.0    # Suma de valores desde el punto de vista del asiento raíz
+        self.children = {}  # action_key -> _Node
+
+
+def _seat(game_state, player):
+    return 0 if player is game_state.player1 else 1
+
+
+def determinize(game_state, seat, rng):
+    """
+    Rehace al azar lo que el asiento `seat` no ve, sobre un clon: el generador
+    de la partida, el orden de su Mazo y su Bóveda, y del rival la mano junto
+    con el Mazo (se juntan, se barajan y se reparte la misma cantidad de cartas)
+    y el orden de su Bóveda. Lo visible (mesa, reserva, descarte) no cambia.
+    """
+    game_state.rng = random.Random(rng.getrandbits(64))
+    game_state.player1.zones.set_rng(game_state.rng)
+    game_state.player2.zones.set_rng(game_state.rng)
+    me, rival = (game_state.player1, game_state.player2) if seat == 0 else (game_state.player2, game_state.player1)
+
+    me.zones.mazo.shuffle()
+    me.zones.boveda.shuffle()
+
+    zones = rival.zones
+    in_hand = len(zones.hand)
+    if in_hand:
+        zones.move_all_cards(zones.hand, zones.mazo)
+    zones.mazo.shuffle()
+    if in_hand:
+        zones.move_card(zones.mazo, zones.hand, amount=in_hand)
+    zones.boveda.shuffle()
+
+
+@contextmanager
+def _paused_gc():
+    """
+    Pausa el recolector de ciclos; anidado, sólo lo reactiva quien lo pausó.
+    Antes de reactivarlo recolecta las generaciones jóvenes (la basura de la
+    búsqueda, barata): si no, la primera asignación dispara la recolección
+    pendiente, que puede escalar a una pasada completa dentro de la decisión.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.collect(1)
+            gc.enable()
+
+
+def _search(root_state, root_seat, iterations, deadline, exploration, playout_turns, seed):
+    """
+    Un árbol MCTS de bucle abierto; retorna {action_key: (visitas, valor)} de la raíz.
+    deadline: instante absoluto de time.time() en que hay que dejar de iterar
+    (None = sin límite de tiempo)
+    """
+    rng = random.Random(seed)
+    playout = random_policy(rng)
+    root = _Node()
+
+    iteration = 0
+    while (iterations is None or iteration < iterations) and (deadline is None or time.time() < deadline):
+        iteration += 1
+        state = root_state.clone()
+        determinize(state, root_seat, rng)
+        node = root
+        path = [root]
+
+        # Selección y expansión
+        while not state.game_over:
+            player = state.get_acting_player()
+            actions = candidate_actions(state, player)
+            maximize = _seat(state, player) == root_seat
+            untried = [action for action in actions if _action_key(action) not in node.children]
+            if untried:
+                action = rng.choice(untried)
+                child = node.children[_action_key(action)] = _Node()
+            else:
+                action, child = _select(node, actions, maximize, exploration)
+            state.execute_action(player, action[0], **action[1])
+            state.check_win_conditions()
+            node = child
+            path.append(node)
+            if child.visits == 0:
+                break
+
+        # Simulación con un límite de turnos
+        last_turn = state.turn_number + playout_turns
+        while not state.game_over and state.turn_number < last_turn:
+            play_step(state, playout)
+
+        # Retropropagación
+        value = evaluate(state, root_seat)
+        for visited in path:
+            visited.visits += 1
+            visited.value += value
+
+    return {key: (child.visits, child.value) for key, child in root.children.items()}
+
+
+def _select(node, actions, maximize, exploration):
+    log_visits = math.log(node.visits or 1)
+    best = None
+    best_score = -math.inf
+    for action in actions:
+        child = node.children[_action_key(action)]
+        mean = child.value / child.visits if child.visits else 0.5
+        if not maximize:
+            mean = 1.0 - mean
+        score = mean + exploration * math.sqrt(log_visits / (child.visits or 1))
+        if score > best_score:
+            best, best_score = (action, child), score
+    return best
+
+
+class MCTSPolicy:
+    """
+    Política MCTS con paralelización de raíz.
+    iterations: iteraciones por árbol (None = sin límite, sólo tiempo)
+    time_limit_ms: tiempo máximo por decisión
+    workers: cantidad de árboles en paralelo
+    executor: 'process' o 'thread' (los hilos no aceleran por el GIL; sirve
+              donde no se pueden crear procesos)
+    """
+    def __init__(self, iterations=None, time_limit_ms=200, workers=1, executor='process',
+                 exploration=1.4, playout_turns=6, seed=None):
+        if iterations is None and not time_limit_ms:
+            raise ValueError("Hace falta un límite de iteraciones o de tiempo")
+        self.iterations = iterations
+        self.time_limit_ms = time_limit_ms
+        self.workers = workers or os.cpu_count()
+        self.executor = executor
+        self.exploration = exploration
+        self.playout_turns = playout_turns
+        self.rng = random.Random(seed)
+        self._pool = None
+        if self.workers > 1:
+            # Los workers arrancan acá y no dentro del plazo de la primera decisión
+            self._get_pool().submit(int).result()
+
+    def _get_pool(self):
+        if self._pool is None:
+            pool_class = ThreadPoolExecutor if self.executor == 'thread' else ProcessPoolExecutor
+            if pool_class is ProcessPoolExecutor:
+                self._pool = pool_class(max_workers=self.workers, initializer=gc.freeze)
+            else:
+                self._pool = pool_class(max_workers=self.workers)
+        return self._pool
+
+    def __call__(self, game_state, player):
+        # El plazo corre desde que se pide la decisión. Se usa time.time() porque
+        # es el único reloj comparable entre procesos.
+        deadline = None
+        if self.time_limit_ms:
+            deadline = time.time() + self.time_limit_ms / 1000 * (1 - COLLECT_MARGIN)
+        actions = candidate_actions(game_state, player)
+        if len(actions) == 1:
+            return actions[0]
+
+        # Cada worker arranca de su propia copia (sin bitácora) del estado
+        root_seat = _seat(game_state, player)
+        args = (root_seat, self.iterations, deadline, self.exploration, self.playout_turns)
+        seeds = [self.rng.getrandbits(32) for _ in range(self.workers)]
+
+        with _paused_gc():
+            if self.workers == 1:
+                results = [_search(game_state.clone(), *args, seeds[0])]
+            else:
+                pool = self._get_pool()
+                futures = [pool.submit(_search, game_state.clone(), *args, seed) for seed in seeds]
+                results = [future.result() for future in futures]
+
+            # Suma de visitas de todos los árboles
+            visits = {}
+            for result in results:
+                for key, (count, _) in result.items():
+                    visits[key] = visits.get(key, 0) + count
+            return max(actions, key=lambda action: visits.get(_action_key(action), 0))
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
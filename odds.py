@@ -0,0 +1,303 @@
+"""
+Probabilidades exactas de apertura y robo por conteo (hipergeométrica), sin muestrear.
+
+    odds = DeckOdds(load_cards('control_de_los_mares.csv'))
+    odds.probability(7, type='UNIDAD', max_cost=2)      # alguna unidad de coste <= 2 en la mano
+    odds.all_of(7, [(dict(subtype='PIRATA'), 2), (dict(type='ACCION'), 1)])
+    odds.playable_by_turn(3, seat=0, keep_max_cost=2)   # con mulligan si no hay coste <= 2
+    odds.hand_cost_distribution()                       # {coste total de las 7: probabilidad}
+    odds.keep_or_mulligan(hand, 3, max_cost=2)          # (quedarse, mulligan)
+
+Las cuentas se hacen con enteros exactos y se dividen al final. El triángulo de
+Pascal se guarda entre consultas y las distribuciones hipergeométricas se
+cachean por (población, éxitos, robos), así que consultar muchas variantes de un
+mazo sólo recalcula lo que cambia. all_of no enumera las composiciones de la
+mano: recorre los grupos con una programación dinámica que sólo distingue
+cuántas cartas faltan para cada mínimo. opening.py estima lo mismo por Monte Carlo.
+
+El modelo de turnos es el de GameState: mano de 7, mulligan a lo sumo una vez
+(todo al mazo, barajar y robar 7), devolver una carta al fondo, y desde el
+primer turno del segundo jugador un robo y un tesoro por turno.
+"""
+from functools import lru_cache
+from itertools import product
+
+HAND_SIZE = 7
+RESERVE_SIZE = 7    # ReserveTreasuresManager.max_size
+
+_PASCAL = [[1]]     # filas del triángulo de Pascal, crece a pedido
+
+
+def draws_by_turn(seat, turn):
+    """
+    Cartas robadas del mazo (y tesoros revelados) hasta el turno propio `turn`,
+    empezando en 1; 0 es la apertura. seat 0 no roba en su primer turno.
+    """
+    return max(turn - 1, 0) if seat == 0 else turn
+
+
+def gold_on_turn(seat, turn):
+    """ Oro en el turno propio `turn`: tesoros en la reserva, más la ficha que recibe seat 1 """
+    gold = min(draws_by_turn(seat, turn), RESERVE_SIZE)
+    if seat == 1:
+        gold += 1
+    return gold
+
+
+def binomial(n, k):
+    """ Coeficiente binomial exacto desde el triángulo de Pascal guardado """
+    if k < 0 or k > n:
+        return 0
+    while len(_PASCAL) <= n:
+        previous = _PASCAL[-1]
+        _PASCAL.append([1] + [a + b for a, b in zip(previous, previous[1:])] + [1])
+    return _PASCAL[n][k]
+
+
+@lru_cache(maxsize=None)
+def hypergeometric(population, successes, draws):
+    """ (P(X = 0), ..., P(X = draws)) al robar `draws` de `population` cartas con `successes` éxitos """
+    total = binomial(population, draws)
+    failures = population - successes
+    return tuple(binomial(successes, hits) * binomial(failures, draws - hits) / total for hits in range(draws + 1))
+
+
+@lru_cache(maxsize=None)
+def at_least(population, successes, draws, hits=1):
+    """ P(X >= hits) de la hipergeométrica """
+    if hits <= 0:
+        return 1.0
+    return sum(hypergeometric(population, successes, draws)[hits:])
+
+
+@lru_cache(maxsize=None)
+def _compositions(counts, draws):
+    """
+    [(x, probabilidad)] de todas las formas de robar `draws` cartas de grupos
+    disjuntos con `counts` cartas cada uno (multivariada hipergeométrica).
+    """
+    total = binomial(sum(counts), draws)
+    result = []
+    for taken in product(*(range(min(count, draws) + 1) for count in counts[:-1])):
+        rest = draws - sum(taken)
+        if rest < 0 or rest > counts[-1]:
+            continue
+        ways = binomial(counts[-1], rest)
+        for count, x in zip(counts, taken):
+            ways *= binomial(count, x)
+        if ways:
+            result.append((taken + (rest,), ways / total))
+    return tuple(result)
+
+
+@lru_cache(maxsize=None)
+def _all_of(counts, signatures, minimums, draws):
+    """
+    P(cada requisito i tenga al menos minimums[i] cartas) al robar `draws`.
+    Programación dinámica sobre los grupos: el estado es (cartas robadas,
+    cuenta de cada requisito tope en su mínimo), con formas exactas enteras.
+    """
+    population = sum(counts)
+    if draws > population:
+        return 0.0
+    reached = list(product(*(range(minimum + 1) for minimum in minimums)))
+    index = {state: position for position, state in enumerate(reached)}
+    # Cartas que faltan como mínimo desde cada estado: si no entran en los robos
+    # que quedan, el estado no llega y no se sigue
+    missing = [max((minimum - have for have, minimum in zip(state, minimums)), default=0) for state in reached]
+    done = len(reached) - 1     # el estado que llega a todos los mínimos
+    # ways[robadas][estado]
+    ways = [[0] * len(reached) for _ in range(draws + 1)]
+    ways[0][0] = 1
+    last = len(counts) - 1
+    total = 0
+    for group, (count, signature) in enumerate(zip(counts, signatures)):
+        # steps[estado][tomadas]: estado después de tomar esas cartas del grupo,
+        # repitiendo el paso de una carta (que no cambia nada al llegar al mínimo)
+        one = [index[tuple(min(have + 1, minimum) if matches else have
+                           for have, matches, minimum in zip(state, signature, minimums))]
+               for state in reached]
+        steps = []
+        for position in range(len(reached)):
+            step = [position]
+            for _ in range(min(count, draws)):
+                step.append(one[step[-1]])
+            steps.append(step)
+        choose = [binomial(count, taken) for taken in range(count + 1)]
+        if group == last:
+            # Del último grupo sólo interesa completar exactamente `draws` cartas
+            for drawn, row in enumerate(ways):
+                taken = draws - drawn
+                if taken > count:
+                    continue
+                for position, current in enumerate(row):
+                    if current and steps[position][taken] == done:
+                        total += current * choose[taken]
+            break
+        updated = [[0] * len(reached) for _ in range(draws + 1)]
+        for drawn, row in enumerate(ways):
+            left = draws - drawn
+            for position, current in enumerate(row):
+                if not current or missing[position] > left:
+                    continue
+                step = steps[position]
+                for taken in range(min(count, left) + 1):
+                    updated[drawn + taken][step[taken]] += current * choose[taken]
+        ways = updated
+    return total / binomial(population, draws)
+
+
+def card_filter(name=None, cost=None, max_cost=None, type=None, subtype=None, predicate=None):
+    """
+    Función carta -> bool con los criterios dados (todos deben cumplirse).
+    subtype busca en subtype_1 y subtype_2; predicate es una condición extra.
+    """
+    def matches(card):
+        if name is not None and card.name != name:
+            return False
+        if cost is not None and card.cost != cost:
+            return False
+        if max_cost is not None and card.cost > max_cost:
+            return False
+        if type is not None and card.type != type:
+            return False
+        if subtype is not None and subtype not in (card.subtype_1, card.subtype_2):
+            return False
+        return predicate is None or predicate(card)
+    return matches
+
+
+class DeckOdds:
+    """
+    Consultas exactas sobre el Mazo de un jugador. deck es la tupla de load_cards
+    o una lista de cartas; sólo se usan las cartas del Mazo (no la Bóveda).
+    Los criterios de carta son los de card_filter (name, cost, max_cost, type,
+    subtype, predicate).
+    """
+    def __init__(self, deck) -> None:
+        cards = deck[0] if isinstance(deck, tuple) else deck
+        self.cards = list(cards)
+        self.size = len(self.cards)
+
+    def count(self, **criteria):
+        """ Cartas del mazo que cumplen los criterios """
+        matches = card_filter(**criteria)
+        return sum(1 for card in self.cards if matches(card))
+
+    def probability(self, draws=HAND_SIZE, hits=1, **criteria):
+        """ P(al menos `hits` cartas que cumplen los criterios entre las primeras `draws`) """
+        return at_least(self.size, self.count(**criteria), draws, hits)
+
+    def distribution(self, draws=HAND_SIZE, **criteria):
+        """ P(exactamente k cartas que cumplen los criterios) para k = 0..draws """
+        return hypergeometric(self.size, self.count(**criteria), draws)
+
+    def all_of(self, draws, requirements):
+        """
+        P(se cumplen todos los requisitos a la vez) entre las primeras `draws`
+        cartas; requirements es [(criterios, mínimo)], p. ej.
+        [({'subtype': 'PIRATA'}, 2), ({'type': 'ACCION'}, 1)]. Los criterios se
+        pueden superponer: las cartas se agrupan por qué requisitos cumplen.
+        """
+        filters = [card_filter(**criteria) for criteria, _ in requirements]
+        groups = {}
+        for card in self.cards:
+            signature = tuple(matches(card) for matches in filters)
+            groups[signature] = groups.get(signature, 0) + 1
+        signatures = tuple(groups)
+        minimums = tuple(minimum for _, minimum in requirements)
+        return _all_of(tuple(groups[signature] for signature in signatures), signatures, minimums, draws)
+
+    def hand_cost_distribution(self, hand_size=HAND_SIZE):
+        """ {coste total de la mano: probabilidad} al robar `hand_size` cartas """
+        costs = {}
+        for card in self.cards:
+            costs[card.cost] = costs.get(card.cost, 0) + 1
+        return dict(_cost_distribution(tuple(sorted(costs.items())), hand_size))
+
+    def success_by_turn(self, turn, seat=0, hits=1, keep=None, **criteria):
+        """
+        P(tener al menos `hits` cartas que cumplen los criterios entre la mano y
+        los robos hasta el turno propio `turn`). keep son criterios de mulligan:
+        se hace mulligan si las 7 no tienen ninguna carta que los cumpla (None:
+        nunca). Al fondo vuelve una carta que no cumple los criterios, si hay.
+        """
+        matches = card_filter(**criteria)
+        keeps = card_filter(**keep) if keep is not None else None
+        successes = 0
+        groups = [0, 0, 0, 0]   # éxito y conserva, sólo éxito, sólo conserva, ninguna
+        for card in self.cards:
+            success = matches(card)
+            kept = keeps is not None and keeps(card)
+            successes += success
+            groups[(not success) * 2 + (not kept)] += 1
+        draws = draws_by_turn(seat, turn)
+
+        if keeps is None:
+            return self._after_mulligan(successes, draws, hits)
+        mulligan = None
+        total = 0.0
+        for (both, only_success, only_keep, _), probability in _compositions(tuple(groups), HAND_SIZE):
+            if both + only_keep:
+                total += probability * _after_hand(self.size, successes, both + only_success, draws, hits)
+            else:
+                if mulligan is None:
+                    mulligan = self._after_mulligan(successes, draws, hits)
+                total += probability * mulligan
+        return total
+
+    def playable_by_turn(self, turn, seat=0, keep_max_cost=None):
+        """
+        P(tener alguna carta pagable con el oro del turno propio `turn`), con
+        mulligan si las 7 no tienen ninguna de coste <= keep_max_cost.
+        Es la cuenta exacta de opening.Openings.playable_on_turn con
+        mulligan_without_play y bottom_most_expensive.
+        """
+        keep = None if keep_max_cost is None else {'max_cost': keep_max_cost}
+        return self.success_by_turn(turn, seat, keep=keep, max_cost=gold_on_turn(seat, turn))
+
+    def keep_or_mulligan(self, hand, turn, seat=0, hits=1, **criteria):
+        """
+        (P quedándose con `hand`, P haciendo mulligan) de tener al menos `hits`
+        cartas que cumplen los criterios hasta el turno propio `turn`. hand son
+        las 7 cartas robadas (cartas o instancias).
+        """
+        matches = card_filter(**criteria)
+        successes = self.count(**criteria)
+        in_hand = sum(1 for card in hand if matches(card))
+        draws = draws_by_turn(seat, turn)
+        return (_after_hand(self.size, successes, in_hand, draws, hits),
+                self._after_mulligan(successes, draws, hits))
+
+    def _after_mulligan(self, successes, draws, hits):
+        """ P de éxito con 7 cartas nuevas, sin otro mulligan """
+        return sum(probability * _after_hand(self.size, successes, in_hand, draws, hits)
+                   for in_hand, probability in enumerate(hypergeometric(self.size, successes, HAND_SIZE)))
+
+
+@lru_cache(maxsize=None)
+def _after_hand(population, successes, in_hand, draws, hits):
+    """
+    P de éxito dada una mano de 7 con `in_hand` éxitos: se devuelve una que no
+    es éxito si hay, y se roban `draws` de las cartas restantes del mazo.
+    """
+    kept = min(in_hand, HAND_SIZE - 1)
+    return at_least(population - HAND_SIZE, successes - in_hand, draws, hits - kept)
+
+
+@lru_cache(maxsize=None)
+def _cost_distribution(cost_counts, hand_size):
+    # ways[cartas][coste total] = formas de elegir esas cartas con ese coste
+    ways = [{} for _ in range(hand_size + 1)]
+    ways[0][0] = 1
+    for cost, count in cost_counts:
+        updated = [dict(row) for row in ways]
+        for taken in range(hand_size):
+            for total, combinations in ways[taken].items():
+                for extra in range(1, min(count, hand_size - taken) + 1):
+                    row = updated[taken + extra]
+                    key = total + extra * cost
+                    row[key] = row.get(key, 0) + combinations * binomial(count, extra)
+        ways = updated
+    denominator = binomial(sum(count for _, count in cost_counts), hand_size)
+    return tuple(sorted((total, combinations / denominator) for total, combinations in ways[hand_size].items()))
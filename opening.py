@@ -0,0 +1,238 @@
+"""
+Motor de aperturas para Monte Carlo: muchas partidas como arrays de NumPy.
+
+Para preguntas como "¿qué probabilidad hay de tener jugada en el turno 3?" no
+hace falta crear Player ni zonas por intento. Cada partida es una fila de
+índices de carta (posiciones en la lista de cartas de load_cards):
+
+    mazo      (n, 7 + k)  primeras cartas del Mazo: [mano de 6 | carta devuelta | robos por turno]
+    boveda    (n, k)      primeros tesoros de la Bóveda: el revelado en cada turno
+    mulligans (n,)        si la partida hizo mulligan
+
+(k son los robos hasta el último turno pedido). El resto del mazo no se mira
+y no se genera.
+
+Se reproducen los pasos de la partida de objetos para un asiento: barajar,
+robar 7, mulligan opcional (todo al mazo, barajar y robar 7 otra vez) y
+devolver una carta al fondo (GameState._handle_mulligan_return), y después un
+robo y un tesoro por turno (GameState._setup_turn). Barajar y tomar las
+primeras cartas es muestrear sin reposición (_sample): misma distribución que
+barajar todo el mazo, sin generar lo que no se usa.
+
+    engine = OpeningEngine(load_cards('control_de_los_mares.csv'), seat=0, seed=1)
+    openings = engine.deal(100_000, turns=3, mulligan=mulligan_without_play(2))
+    (openings.playable_on_turn(3)).mean()
+    engine.estimate(lambda o: o.playable_on_turn(3), 10_000_000, turns=3)
+
+odds.py calcula las mismas probabilidades en forma exacta cuando la pregunta
+se puede contar.
+"""
+import numpy as np
+
+from odds import HAND_SIZE, draws_by_turn, gold_on_turn
+
+
+class OpeningEngine:
+    """
+    Mazo y bóveda de un jugador como arrays. seat 0 es el jugador que empieza
+    (player1): no roba ni revela en su primer turno; seat 1 roba y revela desde
+    su primer turno y además recibe una ficha de tesoro.
+    """
+    def __init__(self, deck, seat=0, seed=None) -> None:
+        cards, treasures, _ = deck
+        self.cards = list(cards)
+        self.treasures = list(treasures)
+        self.seat = seat
+        self.rng = np.random.default_rng(seed)
+        if len(self.cards) > 255 or len(self.treasures) > 255:
+            raise ValueError("El motor de aperturas usa índices uint8 (hasta 255 cartas)")
+
+        # Datos por índice de carta, para indexar con los arrays de partidas
+        self.cost = np.array([card.cost for card in self.cards], dtype=np.int8)
+        self.names = sorted({card.name for card in self.cards})
+        self.name_id = np.array([self.names.index(card.name) for card in self.cards], dtype=np.uint8)
+
+    def draws_by_turn(self, turn):
+        """ Cartas robadas del mazo hasta el turno propio `turn` (ver odds.draws_by_turn) """
+        return draws_by_turn(self.seat, turn)
+
+    def gold_on_turn(self, turn):
+        """ Oro disponible en el turno propio `turn` (ver odds.gold_on_turn) """
+        return gold_on_turn(self.seat, turn)
+
+    def _ranks(self, size, bound):
+        """ Enteros uniformes exactos en [0, bound) a partir de bytes, rechazando los que sesgan """
+        limit = 256 - 256 % bound
+        values = np.frombuffer(self.rng.bytes(size), dtype=np.uint8).copy()
+        redo = np.flatnonzero(values >= limit)
+        while len(redo):
+            fresh = np.frombuffer(self.rng.bytes(len(redo)), dtype=np.uint8)
+            values[redo] = fresh
+            redo = redo[fresh >= limit]
+        values %= bound
+        return values
+
+    def _sample(self, size, width, count):
+        """
+        (size, count) índices distintos de [0, width) por fila, en orden de robo:
+        las primeras `count` cartas de un mazo de `width` barajado uniformemente.
+        Cada columna toma un rango uniforme entre las que quedan y lo pasa a índice
+        saltando las ya robadas, que se mantienen ordenadas por fila.
+        """
+        result = np.empty((size, count), dtype=np.uint8)
+        drawn = []     # columnas con las ya robadas, ordenadas de menor a mayor en cada fila
+        for column in range(count):
+            value = self._ranks(size, width - column)
+            for previous in drawn:
+                value += value >= previous
+            result[:, column] = value
+
+            # Insertar value en drawn: nuevo[k] = max(drawn[k-1], min(value, drawn[k]))
+            merged = []
+            for position in range(column + 1):
+                upper = np.minimum(value, drawn[position]) if position < column else value
+                merged.append(np.maximum(drawn[position - 1], upper) if position else upper)
+            drawn = merged
+        return result
+
+    def deal(self, n, turns=0, mulligan=None, bottom=None):
+        """
+        Juega la apertura de n partidas y retorna un Openings.
+        mulligan(engine, hands) -> máscara bool de las partidas que hacen mulligan
+        (None: nunca). bottom(engine, hands) -> columna de la carta que vuelve al
+        fondo (None: al azar, como random_policy). hands es (n, 7) de índices.
+        """
+        width = len(self.cards)
+        seen = HAND_SIZE + self.draws_by_turn(turns)
+        if seen > width:
+            raise ValueError(f"Mazo de {width} cartas: no alcanza para {turns} turnos")
+
+        mazo = self._sample(n, width, seen)
+
+        if mulligan is None:
+            mulligans = np.zeros(n, dtype=bool)
+        else:
+            mulligans = np.asarray(mulligan(self, mazo[:, :HAND_SIZE]), dtype=bool)
+            if mulligans.any():
+                # La mano vuelve al mazo y se baraja todo: otra muestra del mazo completo
+                mazo[mulligans] = self._sample(int(mulligans.sum()), width, seen)
+
+        if bottom is None:
+            returned = self._ranks(n, HAND_SIZE)
+        else:
+            returned = np.asarray(bottom(self, mazo[:, :HAND_SIZE]))
+        # La devuelta pasa a la columna 6: la mano queda en las columnas 0..5
+        flat = mazo.reshape(-1)
+        picks = np.arange(0, n * seen, seen) + returned
+        kept = mazo[:, HAND_SIZE - 1].copy()
+        mazo[:, HAND_SIZE - 1] = flat.take(picks)
+        flat[picks] = kept
+
+        boveda = self._sample(n, len(self.treasures), min(self.draws_by_turn(turns), len(self.treasures)))
+        return Openings(self, mazo, boveda, mulligans, turns)
+
+    def estimate(self, statistic, n, chunk=1 << 16, **deal_args):
+        """
+        Media de statistic(openings) sobre n partidas, en bloques de `chunk` para
+        no tener todas en memoria. statistic retorna un array de n valores.
+        """
+        total = 0.0
+        done = 0
+        while done < n:
+            size = min(chunk, n - done)
+            total += float(np.sum(statistic(self.deal(size, **deal_args))))
+            done += size
+        return total / n
+
+
+class Openings:
+    """ Resultado de OpeningEngine.deal; las vistas comparten memoria con mazo """
+    def __init__(self, engine, mazo, boveda, mulligans, turns) -> None:
+        self.engine = engine
+        self.mazo = mazo
+        self.boveda = boveda
+        self.mulligans = mulligans
+        self.turns = turns
+
+    @property
+    def hands(self):
+        """ (n, 6) índices de la mano después de devolver una carta """
+        return self.mazo[:, :HAND_SIZE - 1]
+
+    @property
+    def returned(self):
+        """ (n,) índice de la carta devuelta al fondo """
+        return self.mazo[:, HAND_SIZE - 1]
+
+    def drawn(self, turn):
+        """ (n, k) cartas robadas hasta el turno propio `turn` """
+        return self.mazo[:, HAND_SIZE:HAND_SIZE + self.engine.draws_by_turn(turn)]
+
+    def revealed(self, turn):
+        """ (n, k) tesoros revelados de la Bóveda hasta el turno propio `turn` """
+        return self.boveda[:, :self.engine.draws_by_turn(turn)]
+
+    def seen_columns(self, turn):
+        """
+        Columnas de mazo con la mano y los robos hasta el turno. Supone que se juega
+        lo suficiente para no llenar la mano (con 7 cartas _setup_turn no roba) y no
+        descuenta lo jugado.
+        """
+        return list(range(HAND_SIZE - 1)) + list(range(HAND_SIZE, HAND_SIZE + self.engine.draws_by_turn(turn)))
+
+    def seen(self, turn):
+        """ (n, 6 + k) mano más robos hasta el turno (ver seen_columns) """
+        return self.mazo[:, self.seen_columns(turn)]
+
+    def playable_on_turn(self, turn):
+        """ bool (n,): alguna carta vista hasta el turno cuesta a lo sumo el oro de ese turno """
+        if turn > self.turns:
+            raise ValueError(f"Se repartieron {self.turns} turnos")
+        return any_card(self.engine.cost <= self.engine.gold_on_turn(turn), self.mazo, self.seen_columns(turn))
+
+    def curve_out(self, turns):
+        """ bool (n,): hay jugada en cada turno propio de 1 a `turns` """
+        result = np.ones(len(self.mazo), dtype=bool)
+        for turn in range(1, turns + 1):
+            if self.engine.gold_on_turn(turn):
+                result &= self.playable_on_turn(turn)
+        return result
+
+    def count_name(self, name, turn=None):
+        """ (n,) copias de la carta `name` en la mano (o vistas hasta `turn`) """
+        columns = range(HAND_SIZE - 1) if turn is None else self.seen_columns(turn)
+        copies = (self.engine.name_id == self.engine.names.index(name)).astype(np.uint8)
+        count = np.zeros(len(self.mazo), dtype=np.uint8)
+        for column in columns:
+            count += copies.take(self.mazo[:, column])
+        return count
+
+
+def any_card(table, cards, columns=None):
+    """
+    bool (n,): table[carta] es True para alguna carta de las columnas de cards.
+    Va columna a columna: .any(axis=1) sobre filas tan cortas es varias veces más lento.
+    """
+    found = np.zeros(len(cards), dtype=bool)
+    for column in range(cards.shape[1]) if columns is None else columns:
+        found |= table.take(cards[:, column])
+    return found
+
+
+def mulligan_without_play(max_cost):
+    """ Política de mulligan: hacerlo si ninguna carta de las 7 cuesta max_cost o menos """
+    def mulligan(engine, hands):
+        return ~any_card(engine.cost <= max_cost, hands)
+    return mulligan
+
+
+def bottom_most_expensive(engine, hands):
+    """ Política de devolución: la carta de mayor coste (la primera si empatan) """
+    best = engine.cost.take(hands[:, 0])
+    column = np.zeros(len(hands), dtype=np.uint8)
+    for position in range(1, hands.shape[1]):
+        cost = engine.cost.take(hands[:, position])
+        higher = cost > best
+        column[higher] = position
+        np.maximum(best, cost, out=best)
+    return column
@@ -1,4 +1,9 @@
+import random
 from enum import Enum
+from time import perf_counter_ns
+
+from combat import resolve_combat
+from events import EVENTS, Event
 
 
 class GamePhase(Enum):
@@ -28,12 +33,54 @@ class ActionType(Enum):
     MULLIGAN_RETURN = 'mulligan_return'
 
 
+# Acciones permitidas en cada fase (se arma una sola vez)
+PHASE_ACTIONS = {
+    GamePhase.SETUP: frozenset((ActionType.PASS_PHASE, ActionType.MULLIGAN_RETURN)),
+    GamePhase.MAIN_1: frozenset((ActionType.PLAY_CARD, ActionType.ACTIVATE_ABILITY, ActionType.PASS_PHASE)),
+    GamePhase.ATTACK: frozenset((ActionType.ATTACK, ActionType.DEFEND, ActionType.PASS_PHASE)),
+    GamePhase.MAIN_2: frozenset((ActionType.PLAY_CARD, ActionType.ACTIVATE_ABILITY, ActionType.PASS_PHASE)),
+    GamePhase.END: frozenset((ActionType.PASS_PHASE,)),
+}
+
+MAIN_PHASES = (GamePhase.MAIN_1, GamePhase.MAIN_2)
+
+# Fase siguiente de cada fase; pasar de END a SETUP empieza un turno nuevo
+PHASE_TRANSITIONS = {
+    GamePhase.SETUP: GamePhase.MAIN_1,
+    GamePhase.MAIN_1: GamePhase.ATTACK,
+    GamePhase.ATTACK: GamePhase.MAIN_2,
+    GamePhase.MAIN_2: GamePhase.END,
+    GamePhase.END: GamePhase.SETUP,
+}
+
+# Fases que no esperan decisiones: al empezar se avanza a la siguiente
+AUTO_ADVANCE_PHASES = frozenset((GamePhase.END,))
+
 
 class GameState:
-    def __init__(self, player1, player2):
+    journal = None
+    hasher = None
+    recorder = None     # ReplayRecorder (ver replay.py)
+    profiler = None     # Profiler (ver profiler.py)
+    _journal_depth = 0
+    _hooks = None   # {(fase, 'start'|'end'): [hook]}, se crea al registrar el primero
+    
+    # Campos escalares y listas cortas que cambian con las fases/acciones
+    _JOURNAL_FIELDS = (
+        'current_player', 'current_phase', 'turn_number', 'game_over', 'winner',
+        'waiting_for_action', 'combat_resolved', 'players_pending',
+        'declared_attackers', 'declared_defenders', 'phase_actions_taken',
+    )
+    
+    def __init__(self, player1, player2, rng=None):
         # Estado del juego
         self.player1 = player1
         self.player2 = player2
+        
+        # Generador propio de la partida: todo lo aleatorio de las zonas sale de acá
+        self.rng = rng or random.Random()
+        player1.zones.set_rng(self.rng)
+        player2.zones.set_rng(self.rng)
         self.current_player = player1
         # self.priority_player = player1
         self.current_phase = GamePhase.SETUP
@@ -51,117 +98,420 @@ class GameState:
         self.players_pending = []       # Qué jugadores deben actuar
         self.phase_actions_taken = []  # Track de acciones en la fase actual
         
+        # Cartas pagables por jugador: {jugador: (clave, pagables, rápidas)}
+        # La clave es (oro disponible, version de la mano)
+        self._affordable_cache = {}
+        
+        
+    def clone(self):
+        """
+        Copia rápida del estado para búsquedas: copia jugadores, zonas, recursos
+        e instancias de carta, y comparte las definiciones inmutables.
+        El estado de combate guarda ids de carta, así que se copia superficialmente.
+        El generador se copia con su estado: la copia baraja igual que el original.
+        """
+        clone = GameState.__new__(GameState)
+        clone.__dict__.update(self.__dict__)
+        clone.journal = None
+        clone.recorder = None
+        clone.profiler = None
+        players = {self.player1: self.player1.clone(), self.player2: self.player2.clone()}
+        clone.player1 = players[self.player1]
+        clone.player2 = players[self.player2]
+        # Sin pasar por Random.__init__, que lee os.urandom para sembrar
+        clone.rng = random.Random.__new__(random.Random)
+        clone.rng.setstate(self.rng.getstate())
+        clone.player1.zones.set_rng(clone.rng)
+        clone.player2.zones.set_rng(clone.rng)
+        clone.current_player = players[self.current_player]
+        clone.winner = players.get(self.winner)
+        clone.players_pending = [players[player] for player in self.players_pending]
+        clone.declared_attackers = list(self.declared_attackers)
+        clone.declared_defenders = dict(self.declared_defenders)
+        clone.phase_actions_taken = list(self.phase_actions_taken)
+        clone._affordable_cache = {}
+        # Los hooks son observadores de la partida original, no de las copias
+        clone._hooks = None
+        if self.hasher is not None:
+            clone.hasher = self.hasher.copy()
+            clone.player1.zones.hasher = clone.player2.zones.hasher = clone.hasher
+            clone.player1.zones.seat, clone.player2.zones.seat = 0, 1
+        return clone
+    
+    
+    def enable_journal(self, journal=None):
+        """
+        Activa la bitácora de deshacer/rehacer en el estado, las zonas y los recursos
+        de ambos jugadores. Retorna la bitácora.
+        """
+        from journal import Journal
         
+        self.journal = journal or Journal()
+        if self.hasher is not None:
+            self.hasher.journal = self.journal
+        for player in (self.player1, self.player2):
+            player.zones.set_journal(self.journal)
+            player.resources.journal = self.journal
+            player.resources.health.journal = self.journal
+        return self.journal
+    
+    
+    def enable_hashing(self):
+        """
+        Activa el hash incremental del estado (ver zobrist.py). La ubicación de
+        las cartas se actualiza en cada movimiento; retorna el hash actual.
+        """
+        from zobrist import StateHasher
+        
+        self.hasher = StateHasher()
+        self.hasher.journal = self.journal
+        self.player1.zones.set_hasher(self.hasher, 0)
+        self.player2.zones.set_hasher(self.hasher, 1)
+        return self.zobrist_hash()
+    
+    
+    def enable_profiling(self, profiler=None):
+        """
+        Activa los tiempos por handler de fase y por ActionType (ver profiler.py).
+        Retorna el Profiler; se puede compartir entre partidas.
+        """
+        from profiler import Profiler
+        
+        self.profiler = profiler or Profiler()
+        return self.profiler
+    
+    
+    def zobrist_hash(self):
+        """ Hash de 64 bits del estado: cartas por zona, oro, vida, fase y turno """
+        from zobrist import zobrist_key, MASK
+        
+        value = self.hasher.card_hash
+        for seat, player in enumerate((self.player1, self.player2)):
+            value += zobrist_key(seat, 'gold', player.resources.available_gold)
+            value += zobrist_key(seat, 'life', player.resources.health.life_points)
+        value += zobrist_key('phase', self.current_phase.value)
+        value += zobrist_key('turn', self.turn_number)
+        value += zobrist_key('active', self.current_player is self.player2)
+        return value & MASK
+    
+    
+    def _snapshot_fields(self):
+        values = []
+        for name in self._JOURNAL_FIELDS:
+            value = getattr(self, name)
+            values.append(value.copy() if isinstance(value, (list, dict)) else value)
+        return values
+    
+    
+    def _restore_fields(self, values):
+        for name, value in zip(self._JOURNAL_FIELDS, values):
+            setattr(self, name, value.copy() if isinstance(value, (list, dict)) else value)
+    
+    
+    def _record_fields(self, before):
+        after = self._snapshot_fields()
+        self.journal.record(lambda: self._restore_fields(before), lambda: self._restore_fields(after))
+    
+    
+    def _journaled(self, method, *args, **kwargs):
+        # Sólo la llamada más externa registra los campos: si una llamada anidada
+        # (advance_phase dentro de execute_action) registrara su estado intermedio,
+        # al deshacer se restauraría ese estado después del inicial
+        if self.journal is None or self._journal_depth:
+            return method(*args, **kwargs)
+        before = self._snapshot_fields()
+        self._journal_depth = 1
+        try:
+            result = method(*args, **kwargs)
+        finally:
+            self._journal_depth = 0
+        self._record_fields(before)
+        return result
+    
+    
     def advance_phase(self):
         """Avanza a la siguiente fase"""
-        self._end_current_phase()
-        
-        if self.current_phase == GamePhase.SETUP:
-            self.current_phase = GamePhase.MAIN_1
-        elif self.current_phase == GamePhase.MAIN_1:
-            self.current_phase = GamePhase.ATTACK
-        elif self.current_phase == GamePhase.ATTACK:
-            self.current_phase = GamePhase.MAIN_2
-        elif self.current_phase == GamePhase.MAIN_2:
-            self.current_phase = GamePhase.END
-        elif self.current_phase == GamePhase.END:
-            self.current_phase = GamePhase.SETUP
-            self.turn_number += 1
+        return self._journaled(self._advance_phase)
+    
+    
+    def _advance_phase(self):
+        # Iterativo: END avanza solo a SETUP sin anidar llamadas
+        while True:
+            self._end_current_phase()
+            
+            phase = PHASE_TRANSITIONS[self.current_phase]
+            if phase is GamePhase.SETUP:
+                self.turn_number += 1
+            self.current_phase = phase
             
-        self._start_current_phase()
+            self._start_current_phase()
+            if phase not in AUTO_ADVANCE_PHASES:
+                return
             
     
     def _start_current_phase(self):
         """ Acciones automáticas al empezar una fase """
-        if self.current_phase == GamePhase.SETUP:
-            print("Start SETUP")
-            self._setup_turn()
-        elif self.current_phase == GamePhase.MAIN_1:
-            print("Start MAIN 1")
-            self._main_turn()
-        elif self.current_phase == GamePhase.ATTACK:
-            print("Start ATTACK")
-            self._attack_turn()
-        elif self.current_phase == GamePhase.MAIN_2:
-            print("Start MAIN 2")
-            self._main_turn()
-        elif self.current_phase == GamePhase.END:
-            print("Start END")
-            self._end_turn()
-            self.advance_phase()
+        phase = self.current_phase
+        if EVENTS.enabled:
+            EVENTS.emit(Event.PHASE_START, (phase.value, self.turn_number))
+        if self.profiler is None:
+            _PHASE_START[phase](self)
+        else:
+            self.profiler.call('phase', _PHASE_START[phase], self)
+        if self._hooks:
+            self._run_hooks(phase, 'start')
+        
+        
+    def _end_current_phase(self):
+        """ Acciones automáticas al terminar una fase """
+        phase = self.current_phase
+        handler = _PHASE_END.get(phase)
+        if handler is not None:
+            if self.profiler is None:
+                handler(self)
+            else:
+                self.profiler.call('phase', handler, self)
+        if self._hooks:
+            self._run_hooks(phase, 'end')
+    
+    
+    def add_phase_hook(self, phase, hook, when='start'):
+        """
+        Registra hook(game_state, phase), que se llama después de las acciones
+        automáticas al empezar (when='start') o al terminar (when='end') la fase.
+        """
+        if when not in ('start', 'end'):
+            raise ValueError(f"when debe ser 'start' o 'end', no {when!r}")
+        if self._hooks is None:
+            self._hooks = {}
+        self._hooks.setdefault((phase, when), []).append(hook)
+        
+        
+    def remove_phase_hook(self, phase, hook, when='start'):
+        self._hooks[(phase, when)].remove(hook)
         
-        # # Limpiar acciones de fase anterior
-        # self.phase_actions_taken.clear()
-        # self.players_pending.clear()
         
+    def _run_hooks(self, phase, when):
+        for hook in self._hooks.get((phase, when), ()):
+            hook(self, phase)
         
+        
+    def _affordable_cards(self, player):
+        """
+        Ids de las cartas de la mano que el jugador puede pagar (con oro y tesoros
+        de la reserva) y de las que además son acciones rápidas. Se recalcula sólo
+        cuando cambia el oro o la mano: la fase decide cuál de las dos se usa
+        (playable_cards), no qué se puede pagar.
+        """
+        hand = player.zones.hand
+        gold = player.resources.available_gold + len(player.zones.reserva_tesoros)
+        key = (gold, hand.version)
+        cached = self._affordable_cache.get(player)
+        if cached is not None and cached[0] == key:
+            return cached[1], cached[2]
+        
+        affordable = []
+        fast = []
+        for card in hand:
+            if card.can_be_played(gold):
+                affordable.append(card.instance_id)
+                if card.type == 'ACCION' and card.is_fast():
+                    fast.append(card.instance_id)
+        affordable, fast = tuple(affordable), tuple(fast)
+        self._affordable_cache[player] = (key, affordable, fast)
+        return affordable, fast
+    
+    
+    def playable_cards(self, player):
+        """
+        Ids de las cartas que el jugador puede jugar ahora: el jugador activo lo
+        que pueda pagar, el rival sólo acciones rápidas. Es la parte PLAY_CARD de
+        get_valid_actions sin armar las acciones.
+        """
+        if self.current_phase not in MAIN_PHASES or player not in self.players_pending:
+            return ()
+        affordable, fast = self._affordable_cards(player)
+        return affordable if player is self.current_player else fast
+    
+    
     def can_play_card(self, player, card_id):
         """Valida si se puede jugar una carta en la fase actual"""
+        return card_id in self.playable_cards(player)
         
     def can_attack(self, player, card_id):
         """Valida si se puede atacar con una carta"""
+        if self.current_phase != GamePhase.ATTACK or player is not self.current_player \
+                or player not in self.players_pending:
+            return False
+        card = player.zones.formacion.find(card_id)
+        return card is not None and self._can_attack_with(card)
+    
+    def _can_attack_with(self, card):
+        return card.type == 'UNIDAD' and not card.is_tapped and card.can_attack()
         
     def can_defend(self, player, attacker_id, defender_id):
         """Valida si se puede defender un ataque"""
+        # El rival defiende cuando el atacante ya terminó de declarar
+        if self.current_phase != GamePhase.ATTACK or player is self.current_player \
+                or self.players_pending[:1] != [player]:
+            return False
+        if attacker_id not in self.declared_attackers or attacker_id in self.declared_defenders:
+            return False
+        card = player.zones.formacion.find(defender_id)
+        return card is not None and self._can_defend_with(card)
+    
+    def _can_defend_with(self, card):
+        return card.type == 'UNIDAD' and not card.is_tapped
         
-    def _execute_play_card(self):
-        pass
+    def _execute_play_card(self, player, card_id=None):
+        card = player.zones.hand.get_card_info_by_id(card_id)
+        if not card:
+            return ActionResult(False, "Carta no encontrada")
+        if not self.can_play_card(player, card_id):
+            return ActionResult(False, f"No puedes jugar {card.name} ahora")
+        
+        # Agotar tesoros de la reserva hasta cubrir el coste
+        for treasure in list(player.zones.reserva_tesoros.see_cards()):
+            if player.resources.available_gold >= card.cost:
+                break
+            player.actions.agotar_tesoro(treasure.instance_id)
+        
+        if player.actions.play_card_from_hand(card_id):
+            self._resolve_card_effects(player, card)
+            return ActionResult(True, f"{card.name} jugada")
+        return ActionResult(False, "No se puede jugar la carta")
     
     
-    def _execute_attack(self):
-        pass
+    def _resolve_card_effects(self, player, card):
+        """ Efectos al entrar en juego; las acciones se resuelven y van al descarte """
+        rival = self.get_rival(player)
+        if card.type == 'ACCION':
+            card.resolve_effect(player.zones, player.resources, rival.zones, rival.resources)
+            player.zones.move_card(player.zones.formacion, player.zones.descarte, card.instance_id)
+        elif card.has_enter_play_effect():
+            card.on_enter_play(player.zones, player.resources, rival.zones, rival.resources)
+    
+    
+    def _execute_attack(self, player, attacker_id=None):
+        """ Declara un atacante: pasa de la formación al combate """
+        if not self.can_attack(player, attacker_id):
+            return ActionResult(False, "No se puede atacar con esa carta")
+        
+        card = player.zones.formacion.get_card_info_by_id(attacker_id)
+        player.zones.move_card(player.zones.formacion, player.zones.combate, attacker_id)
+        self.declared_attackers.append(attacker_id)
+        return ActionResult(True, f"{card.name} ataca")
+    
+    
+    def _execute_defend(self, player, attacker_id=None, defender_id=None):
+        """ Declara un defensor para un atacante: pasa de la formación al combate """
+        if not self.can_defend(player, attacker_id, defender_id):
+            return ActionResult(False, "No se puede defender con esa carta")
+        
+        card = player.zones.formacion.get_card_info_by_id(defender_id)
+        player.zones.move_card(player.zones.formacion, player.zones.combate, defender_id)
+        self.declared_defenders[attacker_id] = defender_id
+        return ActionResult(True, f"{card.name} defiende")
     
     
         
     def execute_action(self, player, action_type, **kwargs):
         """Ejecuta una acción si es válida en la fase actual"""
-        valid_actions = {
-            GamePhase.SETUP: [ActionType.PASS_PHASE, ActionType.MULLIGAN_RETURN],
-            GamePhase.MAIN_1: [ActionType.PLAY_CARD, ActionType.ACTIVATE_ABILITY, ActionType.PASS_PHASE],
-            GamePhase.ATTACK: [ActionType.ATTACK, ActionType.DEFEND, ActionType.PASS_PHASE],
-            GamePhase.MAIN_2: [ActionType.PLAY_CARD, ActionType.ACTIVATE_ABILITY, ActionType.PASS_PHASE],
-            GamePhase.END: [ActionType.PASS_PHASE]
-        }
-        
+        if self.recorder is not None:
+            self.recorder.record(self, player, action_type, kwargs)
+        if self.profiler is None:
+            result = self._journaled(self._execute_action, player, action_type, **kwargs)
+        else:
+            start = perf_counter_ns()
+            result = self._journaled(self._execute_action, player, action_type, **kwargs)
+            self.profiler.record('action', action_type.value, perf_counter_ns() - start)
+        if EVENTS.enabled:
+            card_id = kwargs.get('card_id', kwargs.get('attacker_id'))
+            EVENTS.emit(Event.ACTION, (player.name, action_type.value, result.success, card_id, kwargs.get('defender_id')))
+        return result
+    
+    
+    def _execute_action(self, player, action_type, **kwargs):
         # Verificar si la acción es válida en la fase actual
-        if action_type not in valid_actions[self.current_phase]:
+        if action_type not in PHASE_ACTIONS[self.current_phase]:
             return ActionResult(False, f"No puedes {action_type.value} en la fase {self.current_phase.value}")
         
-        # Ejecutar la acción específica
-        if action_type == ActionType.MULLIGAN_RETURN:
-            return self._handle_mulligan_return(player, kwargs.get('card_id'))
-        elif action_type == ActionType.PLAY_CARD:
-            return self._execute_play_card(player, kwargs.get('card_id'))
-        elif action_type == ActionType.ATTACK:
-            return self._execute_attack(player, kwargs.get('attacker_id'))
-        elif action_type == ActionType.PASS_PHASE:
-            self.players_pending.remove(player)
-            # aca puedo poner un condicional si los 2 jugadores pasan que avance la fase
-            if not self.players_pending:
-                self.advance_phase()
-                return ActionResult(True, f"Avanzando a {self.current_phase.value}")
-            self.current_player = self.players_pending[0]
-            
-        return ActionResult(False, "Acción no implementada")
+        handler = _ACTION_HANDLERS.get(action_type)
+        if handler is None:
+            return ActionResult(False, "Acción no implementada")
+        return handler(self, player, **kwargs)
+    
+    
+    def _execute_pass(self, player):
+        if player not in self.players_pending:
+            return ActionResult(False, "No es tu turno")
+        self.players_pending.remove(player)
+        # Cuando pasan todos los pendientes avanza la fase
+        if not self.players_pending:
+            self.advance_phase()
+            return ActionResult(True, f"Avanzando a {self.current_phase.value}")
+        return ActionResult(True, f"Esperando a {self.players_pending[0].name}")
     
     
     def check_win_conditions(self):
         """Verifica condiciones de victoria"""
+        for player in (self.player1, self.player2):
+            if not player.resources.health.life_status() and not self.game_over:
+                self._journaled(self._set_winner, self.get_rival(player))
+        return self.game_over
+
+        
+    def _set_winner(self, winner):
+        self.game_over = True
+        self.winner = winner
+        if EVENTS.enabled:
+            EVENTS.emit(Event.GAME_OVER, (winner.name, self.turn_number))
         
         
     def get_valid_actions(self, player):
-        """Retorna las acciones válidas para el jugador en la fase actual"""
+        """
+        Retorna las acciones válidas para el jugador en la fase actual como
+        tuplas (ActionType, kwargs) listas para execute_action.
+        """
+        if self.game_over or player not in self.players_pending:
+            return []
+        
+        if self.waiting_for_action == "mulligan_return":
+            actions = [(ActionType.MULLIGAN_RETURN, {'card_id': card.instance_id}) for card in player.zones.hand]
+            if not player.zones.hand.mulligan_used:
+                actions.append((ActionType.MULLIGAN_RETURN, {}))
+            return actions
+        
+        actions = [(ActionType.PASS_PHASE, {})]
+        if self.current_phase in MAIN_PHASES:
+            actions.extend((ActionType.PLAY_CARD, {'card_id': card_id}) for card_id in self.playable_cards(player))
+        elif self.current_phase == GamePhase.ATTACK:
+            if player is self.current_player:
+                actions.extend((ActionType.ATTACK, {'attacker_id': card.instance_id})
+                               for card in player.zones.formacion if self._can_attack_with(card))
+            elif self.players_pending[0] is player:
+                free = [attacker_id for attacker_id in self.declared_attackers
+                        if attacker_id not in self.declared_defenders]
+                defenders = [card.instance_id for card in player.zones.formacion if self._can_defend_with(card)]
+                actions.extend((ActionType.DEFEND, {'attacker_id': attacker_id, 'defender_id': defender_id})
+                               for attacker_id in free for defender_id in defenders)
+        return actions
         
         
     def _resolve_combat(self):
-        pass
+        """ Combate al terminar ATTACK (ver combat.py) """
+        resolve_combat(self)
     
     
     def _cleanup_phase(self):
-        self.player1.zones.retornar_tesoros_agotados()
-        self.player1.zones.retornar_unidades_a_formacion()
-        self.player2.zones.retornar_tesoros_agotados()
-        self.player2.zones.retornar_unidades_a_formacion()
+        for player in (self.player1, self.player2):
+            zones = player.zones
+            zones.retornar_tesoros_agotados()
+            zones.retornar_unidades_a_formacion()
+            # El daño que no destruyó a una unidad dura sólo hasta el final del turno
+            for card in zones.formacion:
+                if card.current_damage:
+                    zones.set_card_state(card, 'current_damage', 0)
         self.current_player = self.get_oponent()
     
     
@@ -173,37 +523,57 @@ class GameState:
             self.player2.actions.draw_card_from_mazo(7)
             self.waiting_for_action = "mulligan_return"
             self.players_pending = [self.player1, self.player2]
+            return
+        
+        if self.turn_number > 1:
+            player = self.current_player
+            # Sin cartas en el mazo el jugador pierde la partida
+            if not len(player.zones.mazo):
+                self._set_winner(self.get_oponent())
+                return
+            
+            if len(player.zones.hand) < player.zones.hand.max_size:
+                player.actions.draw_card_from_mazo()
+            if len(player.zones.boveda):
+                player.actions.draw_treasure()
+            self.players_pending = [player]
             
     
     def _main_turn(self):
         """ Acciones automáticas al comenzar fase MAIN """
-        self.players_pending = [self.player1, self.player2]
+        self.players_pending = [self.current_player, self.get_oponent()]
     
     
     def _attack_turn(self):
         """ Acciones automáticas al comenzar fase ATTACK """
-        self.players_pending = [self.player1, self.player2]
+        self.declared_attackers = []
+        self.declared_defenders = {}
+        self.combat_resolved = False
+        self.players_pending = [self.current_player, self.get_oponent()]
         
         
-    def _end_current_phase(self):
-        """ Acciones automáticas al terminar una fase """
-        if self.current_phase == GamePhase.ATTACK:
-            self._resolve_combat()
-        elif self.current_phase == GamePhase.END:
-            self._cleanup_phase()
-    
-    
     def _end_turn(self):
         """ Acciones automáticas al terminar una fase """
         pass
         
     def get_oponent(self):
-        if self.current_player == self.player1:
+        return self.get_rival(self.current_player)
+    
+    
+    def get_rival(self, player):
+        if player == self.player1:
             return self.player2 
         return self.player1
     
+    
+    def get_acting_player(self):
+        """ Jugador del que se espera la próxima decisión """
+        if self.players_pending:
+            return self.players_pending[0]
+        return self.current_player
+    
 
-    def _handle_mulligan_return(self, player, card_id):
+    def _handle_mulligan_return(self, player, card_id=None):
         if player not in self.players_pending:
             return ActionResult(False, "No es tu turno")
         
@@ -234,7 +604,31 @@ class GameState:
 
 
     def pass_phase(self):
-        return self.execute_action(self.current_player, ActionType.PASS_PHASE)
+        return self.execute_action(self.get_acting_player(), ActionType.PASS_PHASE)
+
+
+
+# Tablas de despacho (funciones sin enlazar: las copias de GameState las comparten)
+_PHASE_START = {
+    GamePhase.SETUP: GameState._setup_turn,
+    GamePhase.MAIN_1: GameState._main_turn,
+    GamePhase.ATTACK: GameState._attack_turn,
+    GamePhase.MAIN_2: GameState._main_turn,
+    GamePhase.END: GameState._end_turn,
+}
+
+_PHASE_END = {
+    GamePhase.ATTACK: GameState._resolve_combat,
+    GamePhase.END: GameState._cleanup_phase,
+}
+
+_ACTION_HANDLERS = {
+    ActionType.MULLIGAN_RETURN: GameState._handle_mulligan_return,
+    ActionType.PLAY_CARD: GameState._execute_play_card,
+    ActionType.ATTACK: GameState._execute_attack,
+    ActionType.DEFEND: GameState._execute_defend,
+    ActionType.PASS_PHASE: GameState._execute_pass,
+}
 
 
 
@@ -265,4 +659,4 @@ class GameState:
 #         return self._get_response_actions(player)  # Solo acciones rápidas
     
 #     base_actions = PHASE_ACTIONS[self.current_phase]['priority_player']
-#     return [action for action in base_actions if self._can_execute(player, action)]
\ No newline at end of file
+#     return [action for action in base_actions if self._can_execute(player, action)]
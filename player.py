@@ -1,80 +1,196 @@
 import random
+from collections import deque
+
+from cards import CardInstance
+from events import EVENTS, Event
+
+def _set(journal, obj, name, value):
+    """ Asigna un atributo registrándolo en la bitácora si hay una """
+    if journal is None:
+        setattr(obj, name, value)
+    else:
+        journal.set_attr(obj, name, value)
+
 
 class Zone:
+    """
+    Zona de cartas ordenada de arriba (primera) hacia abajo (última).
+    
+    Las cartas se guardan en una lista, más un índice instance_id -> carta para
+    buscar por id sin recorrerla. Las zonas tienen de 7 a 45 cartas: quitar o
+    insertar en la lista es barato y recorrerla no crea nada intermedio.
+    
+    Con una bitácora asignada (journal) cada cambio registra su inverso.
+    version cambia con cada modificación del contenido (para caches).
+    rng es el generador de la partida (PlayerZones.set_rng); el módulo random
+    global queda sólo para zonas sueltas.
+    """
+    journal = None
+    version = 0
+    rng = random
+    
     def __init__(self, name, max_size=None, is_visible=True, allowed_types=None, maintains_order=True):
         self.name = name
-        self.cards = []
+        self._cards = []
+        self._index = {}
         self.max_size = max_size
         self.is_visible = is_visible
         self.allowed_types = allowed_types or []  # Lista de tipos permitidos
         self.maintains_order = maintains_order
         
+    @property
+    def cards(self):
+        return list(self._cards)
+    
+    @cards.setter
+    def cards(self, card_list):
+        self._set_storage(list(card_list), {card.instance_id: card for card in card_list})
+                
+    def _set_storage(self, cards, index):
+        self.version += 1
+        self._cards = cards
+        self._index = index
+        
+    def _record_storage(self, old_cards, old_index, new_cards, new_index):
+        # Los cambios que reemplazan el almacenamiento se deshacen intercambiándolo
+        self.journal.record(
+            lambda: self._set_storage(old_cards, old_index),
+            lambda: self._set_storage(new_cards, new_index),
+        )
+        
+    def _record_shuffle(self, old_cards, new_cards, state):
+        # Además del orden se vuelve el generador al estado de antes (o después) de
+        # barajar: deshacer un mulligan y repetirlo reparte la misma mano
+        index = self._index
+        after = self.rng.getstate()
+        
+        def undo():
+            self._set_storage(old_cards, index)
+            self.rng.setstate(state)
+            
+        def redo():
+            self._set_storage(new_cards, index)
+            self.rng.setstate(after)
+            
+        self.journal.record(undo, redo)
+        
+    def _insert(self, position, card_list):
+        self.version += 1
+        self._cards[position:position] = card_list
+        for card in card_list:
+            self._index[card.instance_id] = card
+            
+    def _delete(self, position, count):
+        self.version += 1
+        index = self._index
+        for card in self._cards[position:position + count]:
+            del index[card.instance_id]
+        del self._cards[position:position + count]
+        
     def can_add(self):
         if self.max_size:
-            return len(self.cards) < int(self.max_size)    
+            return len(self._cards) < int(self.max_size)    
         else:
             return True
         
         
     def add_cards(self, card_list):
-        self.cards = card_list + self.cards
+        self._insert(0, card_list)
+        if self.journal is not None and card_list:
+            count = len(card_list)
+            self.journal.record(lambda: self._delete(0, count), lambda: self._insert(0, card_list))
         
     
     def add_cards_to_bottom(self, card_list):
-        self.cards = self.cards + card_list
+        position = len(self._cards)
+        self._insert(position, card_list)
+        if self.journal is not None and card_list:
+            count = len(card_list)
+            self.journal.record(lambda: self._delete(position, count), lambda: self._insert(position, card_list))
         return
         
         
     def remove_by_id(self, id):
-        for card in self.cards:
-            if card.instance_id == id:
-                print(f"Card found: {card}")
-                recover_card = card
-                self.cards.remove(card)
-                return [recover_card]
+        card = self._index.get(id)
+        if card is not None:
+            position = self._cards.index(card)
+            self._delete(position, 1)
+            if EVENTS.enabled:
+                EVENTS.emit(Event.CARD_FOUND, (self.name, id))
+            if self.journal is not None:
+                self.journal.record(lambda: self._insert(position, [card]), lambda: self._delete(position, 1))
+            return [card]
             
-        # crear un error personalizado
-        print(f"Error: carta {id} no encontrada")
+        if EVENTS.enabled:
+            EVENTS.emit(Event.CARD_NOT_FOUND, (self.name, id))
         return False
-    
             
     def remove_all(self):
-        recover_cards = self.cards
-        self.cards = []
-        return recover_cards
+        old_cards, old_index = self._cards, self._index
+        self._set_storage([], {})
+        if self.journal is not None:
+            self._record_storage(old_cards, old_index, self._cards, self._index)
+        return list(old_cards)
     
     
     def remove_amount(self, count=1):
-        if count > len(self.cards):
-            # crear un error personalizado
-            print("Not enough cards in the deck to draw.")
+        if count > len(self._cards):
+            if EVENTS.enabled:
+                EVENTS.emit(Event.NOT_ENOUGH_CARDS, (self.name, count, len(self._cards)))
             return False
         
-        drawn_cards = self.cards[:count]
-        self.cards = self.cards[count:]
-        
-        return drawn_cards
+        drawn = self._cards[:count]
+        self._delete(0, count)
+        if self.journal is not None:
+            self.journal.record(lambda: self._insert(0, drawn), lambda: self._delete(0, count))
+        return drawn
     
     
     def get_card_info_by_id(self, card_id):
-        for card in self.cards:
-            if card.instance_id == card_id:
-                return card
+        card = self._index.get(card_id)
+        if card is not None:
+            return card
             
-        print("Carta no encontrada")
+        if EVENTS.enabled:
+            EVENTS.emit(Event.CARD_NOT_FOUND, (self.name, card_id))
         return False
     
+    
+    def find(self, card_id):
+        """ Carta con ese id o None, sin avisar si no está """
+        return self._index.get(card_id)
+    
 
     def shuffle(self):
-        random.shuffle(self.cards)
+        old_cards = self._cards
+        state = self.rng.getstate() if self.journal is not None else None
+        cards = list(old_cards)
+        self.rng.shuffle(cards)
+        self._set_storage(cards, self._index)
+        if self.journal is not None:
+            self._record_shuffle(old_cards, cards, state)
         
         
     def see_cards(self):
-        return self.cards
+        return list(self._cards)
+    
+    
+    def clone(self, owner=None):
+        """ Copia de la zona con copias de las instancias de carta """
+        clone = object.__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        clone.journal = None
+        clone._cards = [card.clone(owner) for card in self._cards]
+        clone._index = {card.instance_id: card for card in clone._cards}
+        return clone
+    
+    
+    def __iter__(self):
+        return iter(self._cards)
         
         
     def __len__(self):
-        return len(self.cards)
+        return len(self._cards)
     
     
     def __str__(self) -> str:
@@ -82,7 +198,124 @@ class Zone:
       
         
 
-class Deck(Zone):
+class DrawPile(Zone):
+    """
+    Pila de robo (Mazo, Bóveda): un deque simple de cartas, arriba a la izquierda.
+    Robar k cartas es O(k) y poner al fondo O(1). Buscar por id es lineal porque
+    en estas zonas casi no se usa. No lleva version: nada se cachea sobre ellas.
+    """
+    @property
+    def cards(self):
+        return list(self._cards)
+    
+    @cards.setter
+    def cards(self, card_list):
+        self._cards = deque(card_list)
+        
+    def _pop_left(self, count):
+        popleft = self._cards.popleft
+        return [popleft() for _ in range(count)]
+    
+    def _pop_right(self, count):
+        for _ in range(count):
+            self._cards.pop()
+        
+    def add_cards(self, card_list):
+        self._cards.extendleft(reversed(card_list))
+        if self.journal is not None and card_list:
+            self.journal.record(
+                lambda: self._pop_left(len(card_list)),
+                lambda: self._cards.extendleft(reversed(card_list)),
+            )
+        
+    def add_cards_to_bottom(self, card_list):
+        self._cards.extend(card_list)
+        if self.journal is not None and card_list:
+            self.journal.record(
+                lambda: self._pop_right(len(card_list)),
+                lambda: self._cards.extend(card_list),
+            )
+        
+    def remove_by_id(self, id):
+        for position, card in enumerate(self._cards):
+            if card.instance_id == id:
+                if EVENTS.enabled:
+                    EVENTS.emit(Event.CARD_FOUND, (self.name, id))
+                del self._cards[position]
+                if self.journal is not None:
+                    self.journal.record(
+                        lambda: self._cards.insert(position, card),
+                        lambda: self._cards.__delitem__(position),
+                    )
+                return [card]
+            
+        if EVENTS.enabled:
+            EVENTS.emit(Event.CARD_NOT_FOUND, (self.name, id))
+        return False
+    
+    def remove_all(self):
+        old_cards = self._cards
+        recover_cards = list(old_cards)
+        self._cards = deque()
+        if self.journal is not None:
+            self._record_storage(old_cards, self._index, self._cards, self._index)
+        return recover_cards
+    
+    def remove_amount(self, count=1):
+        if count > len(self._cards):
+            if EVENTS.enabled:
+                EVENTS.emit(Event.NOT_ENOUGH_CARDS, (self.name, count, len(self._cards)))
+            return False
+        
+        drawn_cards = self._pop_left(count)
+        if self.journal is not None:
+            self.journal.record(
+                lambda: self._cards.extendleft(reversed(drawn_cards)),
+                lambda: self._pop_left(count),
+            )
+        return drawn_cards
+    
+    def get_card_info_by_id(self, card_id):
+        for card in self._cards:
+            if card.instance_id == card_id:
+                return card
+            
+        if EVENTS.enabled:
+            EVENTS.emit(Event.CARD_NOT_FOUND, (self.name, card_id))
+        return False
+    
+    def find(self, card_id):
+        """ Carta con ese id o None, sin avisar si no está (recorre la pila: no hay índice) """
+        for card in self._cards:
+            if card.instance_id == card_id:
+                return card
+        return None
+    
+    def shuffle(self):
+        # Mismo orden que rng.shuffle sobre una lista con la misma semilla
+        old_cards = self._cards
+        state = self.rng.getstate() if self.journal is not None else None
+        cards = list(old_cards)
+        self.rng.shuffle(cards)
+        self._cards = deque(cards)
+        if self.journal is not None:
+            self._record_shuffle(old_cards, self._cards, state)
+        
+    def clone(self, owner=None):
+        clone = object.__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        clone.journal = None
+        clone._cards = deque(card.clone(owner) for card in self._cards)
+        return clone
+        
+    def __iter__(self):
+        return iter(self._cards)
+        
+    def __len__(self):
+        return len(self._cards)
+
+
+class Deck(DrawPile):
     """ 
     Conjunto de cartas que el jugador utiliza para juga: 
     """
@@ -114,7 +347,7 @@ class TokenDeck(Zone):
         self.cards = cards
         
 
-class TreasuresDeck(Zone):
+class TreasuresDeck(DrawPile):
     """ 
     Conjunto de cartas de tesoro 
     """
@@ -203,7 +436,7 @@ class CombatManager(Zone):
 class HandManager(Zone):
     def __init__(self):
         super().__init__(
-            name = "Mazo",
+            name = "Mano",
             max_size = 7,
             is_visible = True,
             allowed_types = ["UNIDAD", "MONUMENTO", "ACCION"],
@@ -213,33 +446,40 @@ class HandManager(Zone):
         self.cards = []
         
     def add_cards(self, card_list):
-        if len(self.cards) < self.max_size:
-            space = self.max_size - len(self.cards)
+        if len(self) < self.max_size:
+            space = self.max_size - len(self)
             to_add = card_list[:space]
-            self.cards.extend(to_add)
+            self.add_cards_to_bottom(to_add)
             
             # Las que no entraron
             leftovers = card_list[space:]
             return leftovers
         else:
-            # crear un error personalizado
-            print("Cannot add card: hand is full.")
+            if EVENTS.enabled:
+                EVENTS.emit(Event.ZONE_FULL, (self.name,))
             return False
     
 
 class HealthManager:
+    journal = None
+    
     def __init__(self, initial_life=20):
         self.life_points = initial_life
         
     def remove_life_points(self, points):    
-        self.life_points -= points
+        _set(self.journal, self, 'life_points', self.life_points - points)
         
     def add_life_points(self, points):    
-        self.life_points += points
+        _set(self.journal, self, 'life_points', self.life_points + points)
         
     def life_status(self):
         return self.life_points > 0
     
+    def clone(self):
+        clone = HealthManager.__new__(HealthManager)
+        clone.life_points = self.life_points
+        return clone
+    
     def __str__(self):
         return f"{self.life_points})"
 
@@ -247,28 +487,41 @@ class HealthManager:
 
 class PlayerResources:
     """ Maneja oro, vida """
+    journal = None
+    
     def __init__(self) -> None:
         self.health = HealthManager()
         self.available_gold = 0
         
     def spend_gold(self, count):
         if self.available_gold >= count:
-            self.available_gold -= count
+            _set(self.journal, self, 'available_gold', self.available_gold - count)
             return True
         return False
 
     def add_gold(self, count=1):
-        self.available_gold += count
+        _set(self.journal, self, 'available_gold', self.available_gold + count)
         return True
+    
+    def clone(self):
+        clone = PlayerResources.__new__(PlayerResources)
+        clone.health = self.health.clone()
+        clone.available_gold = self.available_gold
+        return clone
         
         
 class PlayerZones:
     """ maneja las zonas del jugador """
-    def __init__(self, cards, treasures, token_cards) -> None:
+    journal = None
+    hasher = None   # zobrist.StateHasher, ver GameState.enable_hashing
+    seat = None
+    
+    def __init__(self, cards, treasures, token_cards, owner=None, rng=None) -> None:
+        # Cada jugador recibe sus propias instancias sobre las definiciones compartidas
         # Mazo de reino y bóveda de tesoros
-        self.mazo = Deck(cards)
-        self.boveda = TreasuresDeck(treasures)
-        self.tokens = TokenDeck(token_cards)
+        self.mazo = Deck([CardInstance(card, owner) for card in cards])
+        self.boveda = TreasuresDeck([CardInstance(card, owner) for card in treasures])
+        self.tokens = TokenDeck([CardInstance(card, owner) for card in token_cards])
         
         # Mano del jugador
         self.hand = HandManager()
@@ -279,6 +532,45 @@ class PlayerZones:
         self.reserva_tesoros = ReserveTreasuresManager()
         self.tesoros_agotados = OutTreasuresManager()
         self.descarte = DiscardManager()
+        
+        # Barajar depende sólo de este generador (GameState le pasa el suyo)
+        self.set_rng(rng or random.Random())
+
+    ZONE_NAMES = (
+        'mazo', 'boveda', 'tokens', 'hand', 'formacion', 'combate',
+        'reserva_tesoros', 'tesoros_agotados', 'descarte',
+    )
+    
+    def set_journal(self, journal):
+        self.journal = journal
+        for zone_name in self.ZONE_NAMES:
+            getattr(self, zone_name).journal = journal
+    
+    def set_rng(self, rng):
+        self.rng = rng
+        for zone_name in self.ZONE_NAMES:
+            getattr(self, zone_name).rng = rng
+    
+    def set_hasher(self, hasher, seat):
+        self.hasher = hasher
+        self.seat = seat
+        for zone_name in self.ZONE_NAMES:
+            hasher.add_zone(seat, getattr(self, zone_name))
+    
+    def set_card_state(self, card, name, value):
+        """ Cambia el estado de una instancia (current_damage, is_tapped) """
+        _set(self.journal, card, name, value)
+    
+    def clone(self, owner=None):
+        """
+        Copia de todas las zonas; las definiciones de carta se comparten.
+        El generador también se comparte (GameState.clone asigna una copia).
+        """
+        clone = PlayerZones.__new__(PlayerZones)
+        clone.rng = self.rng
+        for zone_name in self.ZONE_NAMES:
+            setattr(clone, zone_name, getattr(self, zone_name).clone(owner))
+        return clone
 
     def move_card(self, from_zone, to_zone, card_id=None, amount=1):
         if to_zone.can_add():
@@ -293,17 +585,24 @@ class PlayerZones:
                     # agregar lestovers al mazo to zone
                     from_zone.add_cards(leftovers)
                     
+                if self.hasher is not None:
+                    moved = card[:len(card) - len(leftovers)] if isinstance(leftovers, list) else card
+                    self.hasher.move(self.seat, from_zone, to_zone, moved)
                 return True
         
-        print(f"{to_zone} completa")
+        if EVENTS.enabled:
+            EVENTS.emit(Event.ZONE_FULL, (to_zone.name,))
         return False
             
             
     def move_card_to_bottom(self, from_zone, to_zone, card_id):
         if to_zone.can_add():
-            card = from_zone.remove_by_id(card_id)
-            to_zone.add_cards_to_bottom([card])
-            return True
+            cards = from_zone.remove_by_id(card_id)
+            if cards:
+                to_zone.add_cards_to_bottom(cards)
+                if self.hasher is not None:
+                    self.hasher.move(self.seat, from_zone, to_zone, cards)
+                return True
         return False
             
             
@@ -311,6 +610,8 @@ class PlayerZones:
         if to_zone.can_add():
             cards = from_zone.remove_all()
             to_zone.add_cards(cards)
+            if self.hasher is not None:
+                self.hasher.move(self.seat, from_zone, to_zone, cards)
             return True
         return False
             
@@ -354,7 +655,8 @@ class PlayerActions:
     
     def draw_treasure(self):
         if not self.zones.reserva_tesoros.can_add():
-            print("Reserva completa")
+            if EVENTS.enabled:
+                EVENTS.emit(Event.ZONE_FULL, (self.zones.reserva_tesoros.name,))
             return False
         
         card = self.zones.move_card(self.zones.boveda, self.zones.reserva_tesoros)
@@ -383,7 +685,7 @@ class PlayerActions:
         move_cards = self.zones.move_all_cards(self.zones.hand, self.zones.mazo)
         if move_cards:
             self.zones.mazo.shuffle()
-            self.zones.hand.mulligan_used = True
+            _set(self.zones.journal, self.zones.hand, 'mulligan_used', True)
             return True
         return move_cards
     
@@ -406,13 +708,23 @@ class PlayerActions:
 
 
 class Player:
-    def __init__(self, name, cards, treasures, tokens):
+    def __init__(self, name, cards, treasures, tokens, rng=None):
         self.name = name
         self.resources = PlayerResources()
-        self.zones = PlayerZones(cards, treasures, tokens)
+        self.zones = PlayerZones(cards, treasures, tokens, owner=self, rng=rng)
         self.actions = PlayerActions(self.zones, self.resources)
         
         
+    def clone(self):
+        """ Copia independiente del jugador para búsquedas (ver GameState.clone) """
+        clone = Player.__new__(Player)
+        clone.__dict__.update(self.__dict__)
+        clone.resources = self.resources.clone()
+        clone.zones = self.zones.clone(owner=clone)
+        clone.actions = PlayerActions(clone.zones, clone.resources)
+        return clone
+        
+        
     def get_player_input(self, message):
         return input(f'{message}: ')
     
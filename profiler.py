@@ -0,0 +1,81 @@
+"""
+Tiempos por fase y por acción de GameState.
+
+    profiler = game_state.enable_profiling()   # o run_game(..., profiler=profiler)
+    ...
+    print(profiler.report())
+    profiler.save('tiempos.json')
+
+Por cada handler de fase (_setup_turn, _main_turn, _attack_turn, _resolve_combat,
+_cleanup_phase...) y cada ActionType que pasa por execute_action se acumulan
+llamadas, tiempo total e histograma de latencias en potencias de 2 de
+nanosegundos. El tiempo de una acción incluye los handlers de fase que dispare
+(pasar puede avanzar de fase). Sin profiler el costo en GameState es un
+chequeo de None.
+"""
+import json
+import time
+
+perf_counter_ns = time.perf_counter_ns
+
+
+class Profiler:
+    def __init__(self) -> None:
+        # (tipo, nombre) -> [llamadas, ns totales, {bucket: llamadas}]
+        self.stats = {}
+
+    def record(self, kind, name, elapsed_ns):
+        stat = self.stats.get((kind, name))
+        if stat is None:
+            stat = self.stats[(kind, name)] = [0, 0, {}]
+        stat[0] += 1
+        stat[1] += elapsed_ns
+        # Bucket b: latencias en [2**(b-1), 2**b) ns
+        bucket = elapsed_ns.bit_length()
+        stat[2][bucket] = stat[2].get(bucket, 0) + 1
+
+    def call(self, kind, function, *args):
+        """ Llama function(*args) registrando su tiempo bajo su nombre """
+        start = perf_counter_ns()
+        result = function(*args)
+        self.record(kind, function.__name__, perf_counter_ns() - start)
+        return result
+
+    def merge(self, other):
+        """ Suma los tiempos de otro Profiler (p. ej. de otro worker) """
+        for key, (count, total, histogram) in other.stats.items():
+            stat = self.stats.setdefault(key, [0, 0, {}])
+            stat[0] += count
+            stat[1] += total
+            for bucket, calls in histogram.items():
+                stat[2][bucket] = stat[2].get(bucket, 0) + calls
+        return self
+
+    def clear(self):
+        self.stats.clear()
+
+    def to_dict(self):
+        """
+        {'phase': {handler: datos}, 'action': {acción: datos}} con datos =
+        {'count', 'total_ms', 'mean_us', 'histogram_us': {límite superior en µs: llamadas}}
+        """
+        result = {}
+        for (kind, name), (count, total, histogram) in sorted(self.stats.items()):
+            result.setdefault(kind, {})[name] = {
+                'count': count,
+                'total_ms': total / 1e6,
+                'mean_us': total / count / 1e3,
+                'histogram_us': {(1 << bucket) / 1e3: histogram[bucket] for bucket in sorted(histogram)},
+            }
+        return result
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+    def report(self):
+        """ Tabla ordenada por tiempo total, para ver de un vistazo qué pesa más """
+        lines = [f"{'':<8}{'nombre':<22}{'llamadas':>10}{'total ms':>12}{'media µs':>11}"]
+        for (kind, name), (count, total, _) in sorted(self.stats.items(), key=lambda item: -item[1][1]):
+            lines.append(f"{kind:<8}{name:<22}{count:>10}{total / 1e6:>12.1f}{total / count / 1e3:>11.1f}")
+        return '\n'.join(lines)
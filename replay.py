@@ -0,0 +1,220 @@
+"""
+Repeticiones binarias compactas de partidas.
+
+Una partida queda determinada por su semilla, los mazos y la secuencia de
+llamadas a execute_action, así que sólo se guarda eso. Cada acción ocupa de
+1 a 3 bytes: (asiento << 7 | código de acción) y las cartas como posición en
+la zona donde se buscan (mano, formación o atacantes declarados), lo que no
+depende de los instance_id que haya generado cada proceso.
+
+    recorder = ReplayRecorder(seed, decks=(path_a, path_b))
+    run_game(deck_a, deck_b, policy_a, policy_b, seed, recorder=recorder)
+    recorder.save('partida.rpl')
+
+    player = ReplayPlayer(Replay.load('partida.rpl'))
+    state = player.seek(12)    # estado al empezar el turno 12
+    player.play_to_end()
+
+Formato (little endian):
+    b'RPL1' | semilla: u8 presente + i64 | 2 x (u16 largo + utf-8) mazos
+    u32 acciones | acciones | u32 turnos | u32 índice de la primera acción de cada turno
+
+ReplayPlayer guarda keyframes en memoria (GameState.clone, que copia también
+el generador de la partida) cada `keyframe_interval` turnos, así buscar un
+turno sólo re-ejecuta desde el keyframe anterior.
+"""
+import bisect
+import struct
+
+from phases import ActionType
+
+MAGIC = b'RPL1'
+NO_CARD = 0xFF
+
+_ACTION_TYPES = list(ActionType)
+_ACTION_CODES = {action_type: code for code, action_type in enumerate(_ACTION_TYPES)}
+
+# Argumentos de cada acción, en orden: (nombre del kwarg, zona donde se busca)
+_OPERANDS = {
+    ActionType.PLAY_CARD: (('card_id', 'hand'),),
+    ActionType.MULLIGAN_RETURN: (('card_id', 'hand'),),
+    ActionType.ATTACK: (('attacker_id', 'formacion'),),
+    ActionType.DEFEND: (('attacker_id', 'declared_attackers'), ('defender_id', 'formacion')),
+}
+
+_SEED = struct.Struct('<Bq')
+_U16 = struct.Struct('<H')
+_U32 = struct.Struct('<I')
+
+
+def _zone_ids(game_state, player, zone):
+    if zone == 'declared_attackers':
+        return list(game_state.declared_attackers)
+    return [card.instance_id for card in getattr(player.zones, zone)]
+
+
+def _seat(game_state, player):
+    return 0 if player is game_state.player1 else 1
+
+
+class Replay:
+    """ Contenido de una repetición: semilla, mazos, acciones e índice de turnos """
+    def __init__(self, seed, decks, actions, turn_starts) -> None:
+        self.seed = seed
+        self.decks = decks              # (etiqueta A, etiqueta B), p. ej. la ruta del CSV
+        self.actions = actions          # [(asiento, ActionType, (posición, ...))]
+        self.turn_starts = turn_starts  # turn_starts[t - 1] = primera acción del turno t
+
+    def to_bytes(self):
+        parts = [MAGIC, _SEED.pack(self.seed is not None, self.seed or 0)]
+        for label in self.decks:
+            data = label.encode('utf-8')
+            parts.append(_U16.pack(len(data)) + data)
+
+        parts.append(_U32.pack(len(self.actions)))
+        for seat, action_type, operands in self.actions:
+            parts.append(bytes((seat << 7 | _ACTION_CODES[action_type], *operands)))
+
+        parts.append(_U32.pack(len(self.turn_starts)))
+        parts.append(struct.pack(f'<{len(self.turn_starts)}I', *self.turn_starts))
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError("No es una repetición")
+        position = len(MAGIC)
+        has_seed, seed = _SEED.unpack_from(data, position)
+        position += _SEED.size
+
+        decks = []
+        for _ in range(2):
+            size = _U16.unpack_from(data, position)[0]
+            position += _U16.size
+            decks.append(data[position:position + size].decode('utf-8'))
+            position += size
+
+        count = _U32.unpack_from(data, position)[0]
+        position += _U32.size
+        actions = []
+        for _ in range(count):
+            header = data[position]
+            action_type = _ACTION_TYPES[header & 0x7F]
+            size = len(_OPERANDS.get(action_type, ()))
+            actions.append((header >> 7, action_type, tuple(data[position + 1:position + 1 + size])))
+            position += 1 + size
+
+        turns = _U32.unpack_from(data, position)[0]
+        position += _U32.size
+        turn_starts = list(struct.unpack_from(f'<{turns}I', data, position))
+        return cls(seed if has_seed else None, tuple(decks), actions, turn_starts)
+
+    def save(self, path):
+        with open(path, 'wb') as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as file:
+            return cls.from_bytes(file.read())
+
+
+class ReplayRecorder:
+    """
+    Graba las llamadas a execute_action de una partida. Se asigna como
+    game_state.recorder (run_game lo hace con su argumento recorder).
+    """
+    def __init__(self, seed, decks=('', '')) -> None:
+        self.replay = Replay(seed, tuple(decks), [], [])
+
+    def attach(self, game_state):
+        game_state.recorder = self
+        return self
+
+    def record(self, game_state, player, action_type, kwargs):
+        """ Se llama antes de ejecutar la acción: las posiciones son las de ese momento """
+        actions = self.replay.actions
+        turn_starts = self.replay.turn_starts
+        while len(turn_starts) < game_state.turn_number:
+            turn_starts.append(len(actions))
+
+        operands = []
+        for name, zone in _OPERANDS.get(action_type, ()):
+            card_id = kwargs.get(name)
+            ids = _zone_ids(game_state, player, zone)
+            operands.append(ids.index(card_id) if card_id in ids else NO_CARD)
+        actions.append((_seat(game_state, player), action_type, tuple(operands)))
+
+    def save(self, path):
+        self.replay.save(path)
+
+
+class ReplayPlayer:
+    """
+    Re-ejecuta una repetición sobre un GameState nuevo. deck_a y deck_b son
+    tuplas de load_cards; si faltan se cargan con las etiquetas de la repetición.
+    """
+    def __init__(self, replay, deck_a=None, deck_b=None, keyframe_interval=10) -> None:
+        from cards import load_cards
+        from simulation import new_game
+
+        self.replay = replay
+        self.keyframe_interval = keyframe_interval
+        self.state = new_game(deck_a or load_cards(replay.decks[0]), deck_b or load_cards(replay.decks[1]), replay.seed)
+        self.position = 0       # próxima acción a ejecutar
+        self._keyframes = []    # (posición, GameState), ordenados por posición
+        self._keyframe_positions = []
+        self._add_keyframe()
+
+    def _add_keyframe(self):
+        index = bisect.bisect_left(self._keyframe_positions, self.position)
+        if index < len(self._keyframe_positions) and self._keyframe_positions[index] == self.position:
+            return
+        self._keyframe_positions.insert(index, self.position)
+        self._keyframes.insert(index, (self.position, self.state.clone()))
+
+    def step(self):
+        """ Ejecuta la próxima acción y retorna su ActionResult (None al final) """
+        if self.position >= len(self.replay.actions):
+            return None
+        state = self.state
+        seat, action_type, operands = self.replay.actions[self.position]
+        player = state.player1 if seat == 0 else state.player2
+
+        kwargs = {}
+        for (name, zone), operand in zip(_OPERANDS.get(action_type, ()), operands):
+            ids = _zone_ids(state, player, zone)
+            kwargs[name] = ids[operand] if operand < len(ids) else None
+
+        result = state.execute_action(player, action_type, **kwargs)
+        state.check_win_conditions()
+        self.position += 1
+
+        # Keyframe al empezar cada turno múltiplo del intervalo
+        turn_starts = self.replay.turn_starts
+        turn = bisect.bisect_right(turn_starts, self.position)
+        if turn % self.keyframe_interval == 0 and turn_starts[turn - 1] == self.position:
+            self._add_keyframe()
+        return result
+
+    def play_to_end(self):
+        while self.step() is not None:
+            pass
+        return self.state
+
+    def seek(self, turn):
+        """ Estado al empezar el turno `turn` (antes de su primera decisión) """
+        if not 1 <= turn <= len(self.replay.turn_starts):
+            raise ValueError(f"La repetición no tiene el turno {turn}")
+        target = self.replay.turn_starts[turn - 1]
+
+        # Volver al keyframe más cercano si el objetivo está atrás o lejos
+        index = bisect.bisect_right(self._keyframe_positions, target) - 1
+        position, state = self._keyframes[index]
+        if not position <= self.position <= target:
+            self.state = state.clone()
+            self.position = position
+
+        while self.position < target:
+            self.step()
+        return self.state
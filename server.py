@@ -0,0 +1,225 @@
+"""
+Servidor asyncio de partidas: muchas partidas concurrentes en un proceso.
+
+En lugar de Player.get_player_input/input(), cada asiento tiene un proveedor
+de decisiones con ``await provider.decide(game_state, player, actions)``: un
+cliente remoto (RemoteDecisions) o una política local (PolicyDecisions).
+Mientras una partida espera a un cliente, el loop atiende a las demás.
+
+Protocolo: una línea JSON por mensaje, por TCP o socket Unix.
+
+    cliente -> {"op": "join", "vs": "bot" | "human", "max_turns": 50}
+    servidor -> {"op": "start", "match": 7, "seat": 0}
+    servidor -> {"op": "decide", "turn": 3, "phase": "main_1", "life": [20, 18], "gold": 2,
+                 "hand": ["Nombre", ...], "actions": [["pass_phase", {}], ["play_card", {"card_id": "card_0012"}], ...]}
+    cliente -> {"op": "act", "index": 1}
+    servidor -> {"op": "end", "winner": 0 | 1 | null, "turns": 41}
+
+"vs": "human" empareja con el siguiente cliente que pida lo mismo. Un mensaje
+que no es un objeto JSON cierra la conexión.
+
+Las políticas de los bots son síncronas y corren en el executor del loop: un
+bot lento (MCTSPolicy) no frena las otras partidas.
+
+    python server.py [puerto | ruta.sock]
+    python -m benchmarks.bench_server [clientes]   # prueba de carga con p50/p99
+"""
+import asyncio
+import itertools
+import json
+
+from phases import ActionType
+from simulation import apply_decision, derive_seed, new_game, random_policy, substream
+
+
+class PolicyDecisions:
+    """
+    Decisiones de una política síncrona (bot), en el executor por defecto del
+    loop para no bloquear las demás partidas mientras piensa. El estado no
+    cambia mientras tanto: la partida espera la decisión.
+    """
+    def __init__(self, policy) -> None:
+        self.policy = policy
+
+    async def decide(self, game_state, player, actions):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.policy, game_state, player)
+
+    async def start(self, match_id, seat):
+        pass
+
+    async def finish(self, winner, turns):
+        pass
+
+
+class RemoteDecisions:
+    """ Decisiones de un cliente conectado; elige por índice entre las acciones válidas """
+    def __init__(self, reader, writer) -> None:
+        self.reader = reader
+        self.writer = writer
+
+    @property
+    def connected(self):
+        """ False si el cliente cerró la conexión (o se cortó) """
+        return not (self.writer.is_closing() or self.reader.at_eof())
+
+    async def send(self, message):
+        self.writer.write(json.dumps(message).encode('utf-8') + b'\n')
+        await self.writer.drain()
+
+    async def receive(self):
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("cliente desconectado")
+        return json.loads(line)
+
+    async def decide(self, game_state, player, actions):
+        await self.send({
+            'op': 'decide',
+            'turn': game_state.turn_number,
+            'phase': game_state.current_phase.value,
+            'life': [game_state.player1.resources.health.life_points, game_state.player2.resources.health.life_points],
+            'gold': player.resources.available_gold + len(player.zones.reserva_tesoros),
+            'hand': [card.name for card in player.zones.hand],
+            'actions': [[action_type.value, kwargs] for action_type, kwargs in actions],
+        })
+        message = await self.receive()
+        index = message.get('index') if isinstance(message, dict) else None
+        if isinstance(index, int) and 0 <= index < len(actions):
+            return actions[index]
+        return ActionType.PASS_PHASE, {}
+
+    async def start(self, match_id, seat):
+        await self.send({'op': 'start', 'match': match_id, 'seat': seat})
+
+    async def finish(self, winner, turns):
+        await self.send({'op': 'end', 'winner': winner, 'turns': turns})
+
+
+async def play_match(game_state, provider_a, provider_b, max_turns=200):
+    """ Como simulation.play_until_end, pero esperando a los proveedores de decisiones """
+    providers = {game_state.player1: provider_a, game_state.player2: provider_b}
+    while not game_state.game_over and game_state.turn_number <= max_turns:
+        player = game_state.get_acting_player()
+        actions = game_state.get_valid_actions(player) or [(ActionType.PASS_PHASE, {})]
+        action_type, kwargs = await providers[player].decide(game_state, player, actions)
+        apply_decision(game_state, player, action_type, kwargs)
+    return game_state
+
+
+class MatchServer:
+    """
+    Aloja partidas entre clientes y bots. deck es una tupla de load_cards
+    (partidas espejo); bot_factory recibe un random.Random y retorna una política.
+    """
+    def __init__(self, deck, bot_factory=random_policy, max_turns=200, master_seed=0) -> None:
+        self.deck = deck
+        self.bot_factory = bot_factory
+        self.max_turns = max_turns
+        self.master_seed = master_seed
+        self.results = []           # (match, winner, turns)
+        self.active = 0
+        self._match_ids = itertools.count(1)
+        self._waiting = None        # (RemoteDecisions, max_turns, future) esperando rival humano
+        self._server = None
+
+    async def start(self, port=None, host='127.0.0.1', path=None, backlog=4096):
+        """
+        Escucha en host:port (TCP) o en path (socket Unix); port=0 elige uno libre.
+        backlog alto para aceptar miles de conexiones simultáneas (el sistema lo limita
+        a net.core.somaxconn).
+        """
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle_client, path=path, backlog=backlog)
+        else:
+            self._server = await asyncio.start_server(self._handle_client, host, port or 0, backlog=backlog)
+        return self._server
+
+    async def close(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle_client(self, reader, writer):
+        remote = RemoteDecisions(reader, writer)
+        try:
+            join = await remote.receive()
+            if not isinstance(join, dict):
+                raise ValueError("join debe ser un objeto JSON")
+            max_turns = min(int(join.get('max_turns', self.max_turns)), self.max_turns)
+            if join.get('vs') == 'human':
+                await self._pair(remote, max_turns)
+            else:
+                match_id = next(self._match_ids)
+                bot = PolicyDecisions(self.bot_factory(substream(self.master_seed, 'bot', match_id)))
+                await self.run_match(match_id, remote, bot, max_turns)
+        except (ConnectionError, json.JSONDecodeError, ValueError, TypeError):
+            pass
+        finally:
+            writer.close()
+
+    async def _pair(self, remote, max_turns):
+        waiting = self._waiting
+        if waiting is not None and not waiting[0].connected:
+            # El que esperaba se fue: se libera su tarea y este cliente pasa a esperar
+            waiting[2].set_result(None)
+            waiting = self._waiting = None
+        if waiting is None:
+            done = asyncio.get_running_loop().create_future()
+            entry = self._waiting = (remote, max_turns, done)
+            # La partida la juega la tarea del segundo cliente; ésta espera a que termine
+            try:
+                await done
+            finally:
+                if self._waiting is entry:
+                    self._waiting = None
+            return
+        rival, rival_turns, done = waiting
+        self._waiting = None
+        try:
+            await self.run_match(next(self._match_ids), rival, remote, min(max_turns, rival_turns))
+        finally:
+            done.set_result(None)
+
+    async def run_match(self, match_id, provider_a, provider_b, max_turns):
+        game_state = new_game(self.deck, self.deck, derive_seed(self.master_seed, 'match', match_id))
+        self.active += 1
+        try:
+            await provider_a.start(match_id, 0)
+            await provider_b.start(match_id, 1)
+            await play_match(game_state, provider_a, provider_b, max_turns)
+        except ConnectionError:
+            # Un cliente se fue: la partida termina sin ganador
+            pass
+        finally:
+            self.active -= 1
+
+        winner = None
+        if game_state.winner is game_state.player1:
+            winner = 0
+        elif game_state.winner is game_state.player2:
+            winner = 1
+        self.results.append((match_id, winner, game_state.turn_number))
+        for provider in (provider_a, provider_b):
+            try:
+                await provider.finish(winner, game_state.turn_number)
+            except ConnectionError:
+                pass
+
+
+async def _serve(address):
+    from cards import load_cards
+
+    server = MatchServer(load_cards('control_de_los_mares.csv'))
+    if address.isdigit():
+        listener = await server.start(port=int(address))
+    else:
+        listener = await server.start(path=address)
+    print(f"Escuchando en {address}")
+    async with listener:
+        await listener.serve_forever()
+
+
+if __name__ == "__main__":
+    import sys
+
+    asyncio.run(_serve(sys.argv[1] if len(sys.argv) > 1 else '8765'))
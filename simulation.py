@@ -0,0 +1,177 @@
+"""
+Motor de simulación sin interfaz: juega partidas completas sin input().
+
+Cada decisión que en game.py pasa por Player.get_player_input se delega en
+una política: un callable ``policy(game_state, player)`` que devuelve una
+tupla ``(ActionType, kwargs)`` para GameState.execute_action.
+
+El ritmo (partidas por segundo) se mide con ``python simulation.py [partidas]``;
+las cifras dependen de la máquina: unas 220 partidas/s en un núcleo en la de
+benchmarks/baseline.json (caso headless_game). Con ``[traza.jsonl|traza.bin]``
+además se guardan todos los eventos de las partidas (ver events.py) y con
+``--profile`` se muestran los tiempos por fase y acción (ver profiler.py).
+"""
+import hashlib
+import random
+import time
+
+from player import Player
+from phases import GameState, ActionType, GamePhase
+
+
+class GameResult:
+    def __init__(self, winner, turns, seed) -> None:
+        self.winner = winner    # 0 jugador A, 1 jugador B, None empate
+        self.turns = turns
+        self.seed = seed
+
+    def __str__(self) -> str:
+        return f"winner={self.winner} | turns={self.turns} | seed={self.seed}"
+
+
+def pass_policy(game_state, player):
+    """ Conserva la mano inicial y pasa en todas las fases """
+    if game_state.waiting_for_action == "mulligan_return":
+        return ActionType.MULLIGAN_RETURN, {'card_id': player.zones.hand.see_cards()[-1].instance_id}
+    return ActionType.PASS_PHASE, {}
+
+
+def random_policy(rng=None, aggression=0.5):
+    """
+    Política aleatoria: juega cartas que puede pagar y pasa cuando no hay más.
+    En la fase de ataque declara un atacante (o un bloqueo) al azar con
+    probabilidad `aggression` en cada paso, y si no pasa.
+    """
+    rng = rng or random.Random()
+
+    def policy(game_state, player):
+        if game_state.waiting_for_action == "mulligan_return":
+            hand = player.zones.hand.see_cards()
+            if not player.zones.hand.mulligan_used and rng.random() < 0.2:
+                return ActionType.MULLIGAN_RETURN, {}
+            return ActionType.MULLIGAN_RETURN, {'card_id': rng.choice(hand).instance_id}
+
+        if game_state.current_phase == GamePhase.ATTACK:
+            options = [action for action in game_state.get_valid_actions(player) if action[0] != ActionType.PASS_PHASE]
+            if options and rng.random() < aggression:
+                return rng.choice(options)
+            return ActionType.PASS_PHASE, {}
+
+        # Sólo los ids jugables: armar todas las acciones válidas en cada paso para
+        # quedarse con las PLAY_CARD cuesta más que el resto de la decisión
+        card_ids = game_state.playable_cards(player)
+        if card_ids:
+            return ActionType.PLAY_CARD, {'card_id': rng.choice(card_ids)}
+        return ActionType.PASS_PHASE, {}
+
+    return policy
+
+
+def derive_seed(*parts):
+    """ Semilla de 63 bits determinística e independiente para cada combinación de valores """
+    digest = hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') >> 1
+
+
+def substream(seed, *path):
+    """
+    Generador independiente derivado de una semilla: substream(seed, 'game') para
+    la partida, substream(seed, 'policy', 0) para la política del jugador A...
+    Sin semilla no es reproducible.
+    """
+    if seed is None:
+        return random.Random()
+    return random.Random(derive_seed(seed, *path))
+
+
+def new_game(deck_a, deck_b, seed=None):
+    """
+    Crea y arranca una partida entre dos mazos (tuplas de load_cards) con los mazos
+    barajados. Barajar y el mulligan dependen sólo de seed, no del random global.
+    """
+    player_a = Player("A", *[list(cards) for cards in deck_a])
+    player_b = Player("B", *[list(cards) for cards in deck_b])
+    game_state = GameState(player_a, player_b, rng=substream(seed, 'game'))
+
+    player_a.zones.mazo.shuffle()
+    player_a.zones.boveda.shuffle()
+    player_b.zones.mazo.shuffle()
+    player_b.zones.boveda.shuffle()
+
+    game_state._start_current_phase()
+    return game_state
+
+
+def apply_decision(game_state, player, action_type, kwargs):
+    """ Ejecuta la decisión de un jugador; si es inválida pasa para no bloquear la partida """
+    result = game_state.execute_action(player, action_type, **kwargs)
+    if not result.success and action_type != ActionType.PASS_PHASE:
+        game_state.execute_action(player, ActionType.PASS_PHASE)
+    game_state.check_win_conditions()
+    return result
+
+
+def play_step(game_state, policy):
+    """ Pide una decisión a la política del jugador que debe actuar y la ejecuta """
+    player = game_state.get_acting_player()
+    action_type, kwargs = policy(game_state, player)
+    apply_decision(game_state, player, action_type, kwargs)
+
+
+def play_until_end(game_state, policy_a, policy_b, max_turns=200):
+    """ Juega la partida hasta terminar o llegar a max_turns """
+    policies = {game_state.player1: policy_a, game_state.player2: policy_b}
+    while not game_state.game_over and game_state.turn_number <= max_turns:
+        play_step(game_state, policies[game_state.get_acting_player()])
+    return game_state
+
+
+def game_result(game_state, seed=None):
+    winner = None
+    if game_state.winner is game_state.player1:
+        winner = 0
+    elif game_state.winner is game_state.player2:
+        winner = 1
+    return GameResult(winner, game_state.turn_number, seed)
+
+
+def run_game(deck_a, deck_b, policy_a, policy_b, seed=None, max_turns=200, recorder=None, profiler=None):
+    """
+    Juega una partida completa entre dos mazos (tuplas de load_cards).
+    Con un ReplayRecorder (replay.py) se graban sus acciones y con un
+    Profiler (profiler.py) se acumulan sus tiempos por fase y acción.
+    Retorna un GameResult.
+    """
+    game_state = new_game(deck_a, deck_b, seed)
+    if recorder is not None:
+        recorder.attach(game_state)
+    if profiler is not None:
+        game_state.enable_profiling(profiler)
+    play_until_end(game_state, policy_a, policy_b, max_turns)
+    return game_result(game_state, seed)
+
+
+if __name__ == "__main__":
+    import sys
+    from cards import load_cards
+    from events import EVENTS, BinarySink, JsonlSink, Level
+    from profiler import Profiler
+
+    args = [arg for arg in sys.argv[1:] if arg != '--profile']
+    profiler = Profiler() if '--profile' in sys.argv else None
+    games = int(args[0]) if args else 1000
+    deck = load_cards('control_de_los_mares.csv')
+    if len(args) > 1:
+        # Traza completa: python simulation.py 10 traza.jsonl (o traza.bin)
+        sink_class = JsonlSink if args[1].endswith('.jsonl') else BinarySink
+        EVENTS.add_sink(sink_class(args[1]), Level.DEBUG)
+
+    start = time.perf_counter()
+    for seed in range(games):
+        run_game(deck, deck, random_policy(substream(seed, 'policy', 0)), random_policy(substream(seed, 'policy', 1)), seed,
+                 profiler=profiler)
+    elapsed = time.perf_counter() - start
+    EVENTS.close()
+    print(f"{games} partidas en {elapsed:.2f}s ({games / elapsed:.0f} partidas/s)")
+    if profiler is not None:
+        print(profiler.report())
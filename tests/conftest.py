@@ -0,0 +1,76 @@
+"""
+Configuración común de las pruebas: los módulos están sueltos en la raíz del
+repositorio, así que se agrega al path para correr ``pytest`` desde cualquier lado.
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope='session')
+def catalog():
+    """ Ruta del catálogo de ejemplo """
+    return os.path.join(ROOT, 'control_de_los_mares.csv')
+
+
+@pytest.fixture(scope='session')
+def deck(catalog):
+    """ Tupla (cartas, tesoros, tokens) de load_cards del catálogo de ejemplo """
+    from cards import load_cards
+    return load_cards(catalog)
+
+
+def state_snapshot(game_state, by_name=False):
+    """
+    Estado observable completo de una partida para comparar: fases, turno,
+    generador, combate, recursos y cada zona con daño y si está agotada.
+    by_name identifica las cartas por nombre, para comparar con una partida
+    re-ejecutada (que crea instance_id nuevos).
+    """
+    state = [
+        game_state.current_phase, game_state.turn_number, game_state.game_over,
+        game_state.winner and game_state.winner.name, game_state.current_player.name,
+        [player.name for player in game_state.players_pending], game_state.waiting_for_action,
+        game_state.combat_resolved, game_state.rng.getstate(),
+    ]
+    for player in (game_state.player1, game_state.player2):
+        state.append((player.resources.available_gold, player.resources.health.life_points,
+                      player.zones.hand.mulligan_used))
+        for zone_name in player.zones.ZONE_NAMES:
+            state.append([(card.name if by_name else card.instance_id, card.current_damage, card.is_tapped)
+                          for card in getattr(player.zones, zone_name)])
+    return state
+
+
+@pytest.fixture
+def snapshot():
+    """ state_snapshot como fixture """
+    return state_snapshot
+
+
+class _ListSink:
+    def __init__(self) -> None:
+        self.events = []
+
+    def write(self, code, level, payload):
+        self.events.append((code, payload))
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def captured_events():
+    """ Lista de (Event, payload) emitidos durante la prueba, todos los niveles """
+    from events import EVENTS, Level
+
+    sink = EVENTS.add_sink(_ListSink(), Level.DEBUG)
+    try:
+        yield sink.events
+    finally:
+        EVENTS.remove_sink(sink)
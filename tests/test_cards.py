@@ -0,0 +1,106 @@
+"""
+load_cards por columnas contra el cargador original fila por fila
+(benchmarks.bench_loader.load_cards_iterrows) y el snapshot compilado junto al CSV.
+"""
+import os
+import shutil
+
+import pytest
+
+import cards
+
+from benchmarks.bench_loader import load_cards_iterrows, same_cards, synthetic_catalog
+from cards import load_cards
+
+
+def test_catalog_matches_iterrows_loader(catalog):
+    assert same_cards(load_cards(catalog, use_cache=False), load_cards_iterrows(catalog))
+
+
+def test_synthetic_catalog_matches_iterrows_loader(catalog):
+    path = synthetic_catalog(500, catalog)
+    try:
+        assert same_cards(load_cards(path, use_cache=False), load_cards_iterrows(path))
+    finally:
+        os.remove(path)
+
+
+def test_cached_load_matches_csv(catalog):
+    assert same_cards(load_cards(catalog), load_cards(catalog, use_cache=False))
+
+
+@pytest.fixture
+def catalog_copy(catalog, tmp_path):
+    """ Copia del catálogo en un directorio temporal, para escribir su cache sin tocar el repositorio """
+    path = str(tmp_path / 'catalogo.csv')
+    shutil.copyfile(catalog, path)
+    return path
+
+
+def test_unchanged_csv_is_read_from_cache(catalog_copy, monkeypatch):
+    first = load_cards(catalog_copy)
+    assert os.path.exists(cards.catalog_cache_path(catalog_copy))
+
+    def parse(path):
+        raise AssertionError("no debía volver a leer el CSV")
+    monkeypatch.setattr(cards, '_parse_cards', parse)
+    assert same_cards(load_cards(catalog_copy), first)
+
+
+def test_changed_csv_invalidates_cache(catalog_copy):
+    names = {card.name for card in load_cards(catalog_copy)[0]}
+    assert 'TORRE DE BORNIS' in names
+    with open(catalog_copy, encoding='utf-8') as source:
+        text = source.read()
+    with open(catalog_copy, 'w', encoding='utf-8') as target:
+        target.write(text.replace('TORRE DE BORNIS', 'TORRE DE PRUEBA'))
+
+    names = {card.name for card in load_cards(catalog_copy)[0]}
+    assert 'TORRE DE PRUEBA' in names and 'TORRE DE BORNIS' not in names
+    assert same_cards(load_cards(catalog_copy), load_cards(catalog_copy, use_cache=False))
+
+
+def test_corrupt_or_old_cache_is_rebuilt(catalog_copy, monkeypatch):
+    expected = load_cards(catalog_copy, use_cache=False)
+    with open(cards.catalog_cache_path(catalog_copy), 'wb') as cache_file:
+        cache_file.write(b'no es un pickle')
+    assert same_cards(load_cards(catalog_copy), expected)
+
+    # Otra versión del formato: el snapshot guardado deja de valer
+    monkeypatch.setattr(cards, 'CATALOG_CACHE_VERSION', cards.CATALOG_CACHE_VERSION + 1)
+    monkeypatch.setattr(cards, '_parse_cards', lambda path: ([], [], []))
+    assert load_cards(catalog_copy) == ([], [], [])
+
+
+def test_csv_with_bom_loads_names(catalog, tmp_path):
+    path = str(tmp_path / 'excel.csv')
+    with open(catalog, encoding='utf-8') as source, open(path, 'w', encoding='utf-8-sig') as target:
+        target.write(source.read())
+    loaded = load_cards(path, use_cache=False)
+    assert same_cards(loaded, load_cards(catalog, use_cache=False))
+    assert all(isinstance(card.name, str) for card in loaded[0])
+
+
+def test_placeholder_strength_outside_units(catalog, tmp_path):
+    # Monumentos, acciones y tesoros con '-' en Fuerza/Resistencia, como los cargadores anteriores aceptaban
+    import csv
+    path = str(tmp_path / 'guiones.csv')
+    with open(catalog, newline='', encoding='utf-8') as source:
+        rows = list(csv.reader(source))
+    header = rows[0]
+    for row in rows[1:]:
+        if row[header.index('Tipo')] != 'UNIDAD':
+            row[header.index('Fuerza')] = row[header.index('Resistencia')] = '-'
+    with open(path, 'w', newline='', encoding='utf-8') as target:
+        csv.writer(target, quoting=csv.QUOTE_ALL).writerows(rows)
+    assert same_cards(load_cards(path, use_cache=False), load_cards_iterrows(path))
+
+
+def test_missing_required_column_is_an_error(catalog, tmp_path):
+    path = str(tmp_path / 'sin_tipo.csv')
+    with open(catalog, encoding='utf-8') as source:
+        text = source.read()
+    with open(path, 'w', encoding='utf-8') as target:
+        target.write(text.replace('"Tipo"', '"Clase"', 1))
+    with pytest.raises(ValueError, match='Tipo'):
+        load_cards(path, use_cache=False)
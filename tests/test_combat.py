@@ -0,0 +1,95 @@
+"""
+Combate: cada par declarado recibe el resultado de combat_outcome (daño,
+muertes al descarte y vida perdida) y el daño dura sólo hasta la limpieza.
+"""
+import pytest
+
+from cards import CardInstance
+from combat import combat_outcome, combat_pairs, resolve_combat
+from phases import GamePhase
+from simulation import new_game, play_step, play_until_end, random_policy, substream
+
+
+def policies(seed):
+    return random_policy(substream(seed, 'policy', 0)), random_policy(substream(seed, 'policy', 1))
+
+
+def test_combat_outcome(deck):
+    units = sorted((card for card in deck[0] if card.type == 'UNIDAD'), key=lambda card: card.strength)
+    weak, strong = CardInstance(units[0]), CardInstance(units[-1])
+    assert combat_outcome(strong, None) == (0, 0, False, False, strong.strength)
+    attacker_damage, defender_damage, attacker_dies, defender_dies, life_loss = combat_outcome(strong, weak)
+    assert (attacker_damage, defender_damage, life_loss) == (weak.strength, strong.strength, 0)
+    assert attacker_dies == (weak.strength >= strong.toughness)
+    assert defender_dies == (strong.strength >= weak.toughness)
+
+
+def combat_states(deck, seed, max_turns=60):
+    """ Copias de la partida justo antes de resolver cada combate """
+    game_state = new_game(deck, deck, seed)
+    seats = dict(zip((game_state.player1, game_state.player2), policies(seed)))
+    while not game_state.game_over and game_state.turn_number <= max_turns:
+        before = game_state.clone() if game_state.current_phase is GamePhase.ATTACK else None
+        play_step(game_state, seats[game_state.get_acting_player()])
+        if before is not None and game_state.current_phase is not GamePhase.ATTACK:
+            yield before
+
+
+def test_resolve_combat_applies_each_outcome(deck):
+    blocked = 0
+    for game_state in (state for seed in range(10) for state in combat_states(deck, seed)):
+        attacking, defending = game_state.current_player, game_state.get_oponent()
+        expected_life = defending.resources.health.life_points
+        survivors, dead = {}, set()
+        for attacker, defender in combat_pairs(game_state):
+            attacker_damage, defender_damage, attacker_dies, defender_dies, loss = combat_outcome(attacker, defender)
+            expected_life -= loss
+            if defender is None:
+                continue
+            blocked += 1
+            for unit, damage, dies in ((attacker, attacker_damage, attacker_dies), (defender, defender_damage, defender_dies)):
+                if dies:
+                    dead.add(unit.instance_id)
+                else:
+                    survivors[unit.instance_id] = damage
+
+        resolve_combat(game_state)
+        assert game_state.combat_resolved
+        assert defending.resources.health.life_points == expected_life
+        for player in (attacking, defending):
+            for card in player.zones.combate:
+                assert card.instance_id not in dead
+                assert card.current_damage == survivors.get(card.instance_id, card.current_damage)
+            for card in player.zones.descarte:
+                if card.instance_id in dead:
+                    assert card.current_damage == 0
+        in_discard = {card.instance_id for player in (attacking, defending) for card in player.zones.descarte}
+        assert dead <= in_discard
+    assert blocked
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_no_attackers_only_marks_combat_resolved(deck, snapshot, seed):
+    for game_state in combat_states(deck, seed):
+        if game_state.declared_attackers:
+            continue
+        before = snapshot(game_state)
+        resolve_combat(game_state)
+        after = snapshot(game_state)
+        assert game_state.combat_resolved
+        game_state.combat_resolved = False
+        assert snapshot(game_state) == before != after
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_damage_is_cleared_at_cleanup(deck, seed):
+    game_state = new_game(deck, deck, seed)
+    damaged = []
+
+    def check(game_state, phase):
+        for player in (game_state.player1, game_state.player2):
+            damaged.extend(card for card in player.zones.formacion if card.current_damage)
+
+    game_state.add_phase_hook(GamePhase.END, check, when='end')
+    play_until_end(game_state, *policies(seed), 60)
+    assert not damaged
@@ -0,0 +1,77 @@
+"""
+Efectos compilados ejecutados sobre zonas reales.
+"""
+from effects import EffectOp, compile_effect, enter_play_program, run_program
+from events import Event
+from player import Player
+
+
+def card(deck, name):
+    return next(card for card in deck[0] if card.name == name)
+
+
+def to_formation(player, name):
+    """ Pasa una copia de `name` del mazo a la formación y la retorna """
+    unit = next(instance for instance in player.zones.mazo if instance.name == name)
+    player.zones.move_card(player.zones.mazo, player.zones.formacion, unit.instance_id)
+    return unit
+
+
+def zone_names(player):
+    return {zone_name: [card.name for card in getattr(player.zones, zone_name)] for zone_name in player.zones.ZONE_NAMES}
+
+
+def test_damage_hits_distinct_units(deck):
+    # TORRE DE BORNIS: "Hace 4 daños hasta a dos unidades rivales objetivo"
+    program = enter_play_program(card(deck, "TORRE DE BORNIS").text)
+    assert (EffectOp.DAMAGE_UNIT, (4, 2)) in program
+
+    me, rival = Player("A", *deck), Player("B", *deck)
+    for name in ("MAZU, LA REINA PIRATA", "LUCANDRA, MAESTRA DE LO ARCANO"):
+        to_formation(rival, name)
+    run_program(program, me.zones, me.resources, rival.zones, rival.resources)
+
+    # Cada una recibe 4 una sola vez (antes MAZU recibía 8 y LUCANDRA nada)
+    assert {unit.name: unit.current_damage for unit in rival.zones.formacion} == {
+        "MAZU, LA REINA PIRATA": 4, "LUCANDRA, MAESTRA DE LO ARCANO": 4}
+
+
+def test_damage_to_any_target_unit(deck):
+    # ESTOCADA DEMONIACA: "Hace 2 daños a la unidad objetivo" (sin "rival")
+    program = compile_effect(card(deck, "ESTOCADA DEMONIACA").text)
+    assert program[0] == (EffectOp.DAMAGE_UNIT, (2, 1))
+
+    me, rival = Player("A", *deck), Player("B", *deck)
+    unit = to_formation(rival, "MAZU, LA REINA PIRATA")
+    run_program(program, me.zones, me.resources, rival.zones, rival.resources)
+    assert unit.current_damage == 2
+
+
+def test_destroyed_unit_loses_its_damage(deck):
+    me, rival = Player("A", *deck), Player("B", *deck)
+    unit = to_formation(rival, "MAZU, LA REINA PIRATA")
+    rival.zones.set_card_state(unit, 'current_damage', 3)
+    run_program(compile_effect("Destruye la unidad rival objetivo"), me.zones, me.resources, rival.zones, rival.resources)
+    assert list(rival.zones.descarte) == [unit] and unit.current_damage == 0
+
+
+def test_token_creation_is_reported_unsupported(deck, captured_events):
+    program = enter_play_program(card(deck, "APRENDIZ DE CONJUROS").text)
+    assert (EffectOp.UNSUPPORTED, ("Crea una ficha libro",)) in program
+
+    me = Player("A", *deck)
+    before = zone_names(me)
+    run_program(program, me.zones, me.resources)
+    assert zone_names(me) == before
+    assert (Event.EFFECT_UNSUPPORTED, ("Crea una ficha libro",)) in captured_events
+
+
+def test_excavate_and_predict_keep_cards_on_top(deck):
+    me, rival = Player("A", *deck), Player("B", *deck)
+    before = zone_names(me)
+    for name in ("BUSCADOR EXHAUSTIVO", "OBJETO MISTERIOSO", "PROFECIA PRELIMINAR"):
+        definition = next(card for group in deck for card in group if card.name == name)
+        program = enter_play_program(definition.text)
+        assert program[0][0] in (EffectOp.EXCAVATE, EffectOp.PREDICT)
+        run_program(program, me.zones, me.resources, rival.zones, rival.resources)
+    assert zone_names(me) == before
@@ -0,0 +1,78 @@
+"""
+Eventos: lo que escribe BinarySink vuelve igual con read_binary, coincide con
+JsonlSink y cada destino recibe sólo los eventos de su nivel.
+"""
+import json
+import random
+
+import pytest
+
+from events import EVENT_INFO, EVENTS, BinarySink, Event, JsonlSink, Level, read_binary
+from simulation import new_game, play_step, random_policy
+
+
+def play_traced(deck, seed, *sinks):
+    """ Juega una partida al azar con los destinos (sink, nivel) registrados """
+    for sink, level in sinks:
+        EVENTS.add_sink(sink, level)
+    try:
+        game_state = new_game(deck, deck, seed)
+        policy = random_policy(random.Random(seed))
+        while not game_state.game_over and game_state.turn_number < 30:
+            play_step(game_state, policy)
+    finally:
+        for sink, _ in sinks:
+            EVENTS.remove_sink(sink)
+
+
+def test_binary_round_trip_keeps_payload_types(tmp_path):
+    path = tmp_path / 'traza.bin'
+    records = [
+        (Event.ACTION, Level.DEBUG, ('Jugador 1', 'play_card', True, 'card_0001', None)),
+        (Event.ACTION, Level.DEBUG, ('Jugador 2', 'defend', False, 'card_0002', 'card_0003')),
+        (Event.NOT_ENOUGH_CARDS, Level.WARNING, ('mazo', 3, 0)),
+        (Event.PHASE_START, Level.INFO, ('ataque', -(2 ** 63))),
+        (Event.EFFECT_UNSUPPORTED, Level.INFO, ('Crea una ficha «Añadida» 1/1',)),
+        (Event.CARD_FOUND, Level.DEBUG, (0.1, 2 ** 63 - 1)),
+        (Event.GAME_OVER, Level.INFO, ()),
+    ]
+    sink = BinarySink(path)
+    for code, level, payload in records:
+        sink.write(code, level, payload)
+    sink.close()
+
+    read = list(read_binary(path))
+    assert read == records
+    for (_, _, written), (_, _, payload) in zip(records, read):
+        assert [type(value) for value in payload] == [type(value) for value in written]
+
+
+def test_binary_rejects_other_files(tmp_path):
+    path = tmp_path / 'traza.bin'
+    path.write_bytes(b'{"event": "ACTION"}\n')
+    with pytest.raises(ValueError):
+        list(read_binary(path))
+
+
+def test_game_trace_matches_across_sinks(deck, tmp_path, captured_events):
+    binary = tmp_path / 'traza.bin'
+    jsonl = tmp_path / 'traza.jsonl'
+    play_traced(deck, 3, (BinarySink(binary), Level.DEBUG), (JsonlSink(jsonl), Level.DEBUG))
+
+    assert captured_events
+    from_binary = [(code, payload) for code, _, payload in read_binary(binary)]
+    assert from_binary == [(code, tuple(payload)) for code, payload in captured_events]
+
+    with open(jsonl, encoding='utf-8') as file:
+        lines = [json.loads(line) for line in file]
+    assert [(Event[line['event']], tuple(line['data'])) for line in lines] == from_binary
+
+
+def test_sink_receives_only_its_level(deck, tmp_path, captured_events):
+    path = tmp_path / 'traza.bin'
+    play_traced(deck, 3, (BinarySink(path), Level.INFO))
+
+    read = list(read_binary(path))
+    assert read and all(level >= Level.INFO for _, level, _ in read)
+    assert [(code, payload) for code, _, payload in read] == \
+        [(code, tuple(payload)) for code, payload in captured_events if EVENT_INFO[code][0] >= Level.INFO]
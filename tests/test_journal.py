@@ -0,0 +1,45 @@
+"""
+Bitácora de deshacer/rehacer: volver a una marca deja exactamente el estado de
+esa marca y rehacer deja el de antes de deshacer.
+"""
+import random
+
+import pytest
+
+from phases import ActionType
+from simulation import new_game, play_step, random_policy
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_undo_redo_round_trip(deck, snapshot, seed):
+    game_state = new_game(deck, deck, seed)
+    journal = game_state.enable_journal()
+    policy = random_policy(random.Random(seed))
+    steps = random.Random(~seed)
+    while not game_state.game_over and game_state.turn_number < 60:
+        before = snapshot(game_state)
+        mark = journal.mark()
+        for _ in range(steps.randint(1, 40)):
+            if game_state.game_over:
+                break
+            play_step(game_state, policy)
+        after = snapshot(game_state)
+
+        journal.undo(mark)
+        assert snapshot(game_state) == before
+        journal.redo()
+        assert snapshot(game_state) == after
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_undone_mulligan_deals_the_same_hand(deck, snapshot, seed):
+    game_state = new_game(deck, deck, seed)
+    journal = game_state.enable_journal()
+    player = game_state.get_acting_player()
+    mark = journal.mark()
+
+    assert game_state.execute_action(player, ActionType.MULLIGAN_RETURN).success
+    dealt = snapshot(game_state)
+    journal.undo(mark)
+    assert game_state.execute_action(player, ActionType.MULLIGAN_RETURN).success
+    assert snapshot(game_state) == dealt
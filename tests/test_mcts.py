@@ -0,0 +1,44 @@
+"""
+MCTSPolicy: el presupuesto de tiempo cubre toda la decisión (incluido el reparto
+a los workers) y con límite de iteraciones la decisión depende sólo de la semilla.
+"""
+import random
+import time
+
+import pytest
+
+from mcts import MCTSPolicy, candidate_actions
+from simulation import new_game, play_step, random_policy
+
+
+def decision_states(deck, count):
+    """ Estados de partidas al azar en los que player1 tiene más de una jugada """
+    states = []
+    game_state = new_game(deck, deck, 0)
+    policy = random_policy(random.Random(0))
+    while len(states) < count and not game_state.game_over:
+        player = game_state.get_acting_player()
+        if player is game_state.player1 and len(candidate_actions(game_state, player)) > 1:
+            states.append(game_state.clone())
+        play_step(game_state, policy)
+    return states
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_decision_stays_within_time_limit(deck, workers):
+    mcts = MCTSPolicy(time_limit_ms=200, workers=workers, seed=0)
+    try:
+        for game_state in decision_states(deck, 3):
+            start = time.perf_counter()
+            mcts(game_state, game_state.player1)
+            elapsed = time.perf_counter() - start
+            assert elapsed < 0.2, elapsed
+    finally:
+        mcts.close()
+
+
+def test_iterations_only_is_reproducible(deck):
+    game_state = decision_states(deck, 1)[0]
+    decisions = [MCTSPolicy(iterations=30, time_limit_ms=None, seed=7)(game_state, game_state.player1)
+                 for _ in range(2)]
+    assert decisions[0] == decisions[1]
@@ -0,0 +1,98 @@
+"""
+Probabilidades exactas: cuentas internas consistentes y acuerdo con el motor de
+aperturas por Monte Carlo (opening.py) dentro del error de muestreo.
+"""
+import math
+
+import numpy as np
+import pytest
+
+from odds import DeckOdds, _compositions, binomial, card_filter, hypergeometric
+from opening import OpeningEngine, bottom_most_expensive, mulligan_without_play
+
+SAMPLES = 400_000
+
+
+def assert_close(exact, estimate, samples=SAMPLES, sigmas=4):
+    # exact puede pasarse de 1 por redondeo de la suma de flotantes
+    error = math.sqrt(max(exact * (1 - exact), 0.0) / samples)
+    assert abs(estimate - exact) < sigmas * error + 1e-9
+
+
+def test_binomial_and_hypergeometric():
+    assert all(binomial(n, k) == math.comb(n, k) for n in range(60) for k in range(n + 2))
+    assert binomial(5, -1) == 0
+    assert math.isclose(sum(hypergeometric(45, 12, 7)), 1.0)
+
+
+def test_hand_cost_distribution_mean(deck):
+    odds = DeckOdds(deck)
+    distribution = odds.hand_cost_distribution()
+    assert math.isclose(sum(distribution.values()), 1.0)
+    # Media del coste total: 7 veces el coste medio del mazo
+    mean_cost = sum(card.cost for card in odds.cards) / odds.size
+    assert math.isclose(sum(total * probability for total, probability in distribution.items()), 7 * mean_cost)
+
+
+@pytest.mark.parametrize('seat', (0, 1))
+@pytest.mark.parametrize('turn', (1, 2, 3))
+@pytest.mark.parametrize('keep_max_cost', (None, 1, 2))
+def test_playable_by_turn_matches_opening_engine(deck, seat, turn, keep_max_cost):
+    exact = DeckOdds(deck).playable_by_turn(turn, seat, keep_max_cost)
+    engine = OpeningEngine(deck, seat=seat, seed=turn * 10 + seat)
+    mulligan = None if keep_max_cost is None else mulligan_without_play(keep_max_cost)
+    estimate = engine.estimate(lambda openings: openings.playable_on_turn(turn), SAMPLES,
+                               turns=turn, mulligan=mulligan, bottom=bottom_most_expensive)
+    assert_close(exact, estimate)
+
+
+def test_all_of_and_probability_match_opening_engine(deck):
+    odds = DeckOdds(deck)
+    engine = OpeningEngine(deck, seed=5)
+    hands = engine.deal(SAMPLES).mazo[:, :7]
+    pirate = np.array([card.subtype_1 == 'PIRATA' or card.subtype_2 == 'PIRATA' for card in engine.cards], np.uint8)
+    action = np.array([card.type == 'ACCION' for card in engine.cards], np.uint8)
+    cheap_unit = np.array([card.type == 'UNIDAD' and card.cost <= 2 for card in engine.cards], np.uint8)
+
+    exact = odds.all_of(7, [({'subtype': 'PIRATA'}, 2), ({'type': 'ACCION'}, 1)])
+    assert_close(exact, ((pirate[hands].sum(axis=1) >= 2) & (action[hands].sum(axis=1) >= 1)).mean())
+    assert_close(odds.probability(7, type='UNIDAD', max_cost=2), (cheap_unit[hands].sum(axis=1) >= 1).mean())
+
+
+def all_of_by_enumeration(odds, draws, requirements):
+    """ all_of sumando sobre todas las composiciones de la mano por grupo de cartas """
+    filters = [card_filter(**criteria) for criteria, _ in requirements]
+    groups = {}
+    for card in odds.cards:
+        signature = tuple(matches(card) for matches in filters)
+        groups[signature] = groups.get(signature, 0) + 1
+    signatures = tuple(groups)
+    return sum(probability for taken, probability in _compositions(tuple(groups.values()), draws)
+               if all(sum(x for x, signature in zip(taken, signatures) if signature[index]) >= minimum
+                      for index, (_, minimum) in enumerate(requirements)))
+
+
+@pytest.mark.parametrize('draws', (0, 1, 7, 12, 100))
+@pytest.mark.parametrize('requirements', [
+    [({'subtype': 'PIRATA'}, 2), ({'type': 'ACCION'}, 1), ({'max_cost': 2}, 1)],
+    [({'type': 'UNIDAD'}, 3), ({'type': 'UNIDAD', 'max_cost': 2}, 2)],
+    [({'type': 'ACCION'}, 0), ({'max_cost': 1}, 1)],
+    [({'type': 'ACCION'}, 8)],
+    [],
+])
+def test_all_of_matches_enumeration(deck, draws, requirements):
+    odds = DeckOdds(deck)
+    assert math.isclose(odds.all_of(draws, requirements), all_of_by_enumeration(odds, draws, requirements),
+                        rel_tol=1e-12, abs_tol=1e-15)
+
+
+def test_keep_or_mulligan_bounds(deck):
+    odds = DeckOdds(deck)
+    cheap = [card for card in deck[0] if card.cost <= 1]
+    expensive = [card for card in deck[0] if card.cost > 1]
+    # Con una carta que cumple en la mano quedarse nunca es peor que sin ninguna
+    with_hit = odds.keep_or_mulligan(cheap[:1] + expensive[:6], 3, max_cost=1)
+    without = odds.keep_or_mulligan(expensive[:7], 3, max_cost=1)
+    assert with_hit[0] == 1.0
+    assert without[0] < with_hit[0]
+    assert with_hit[1] == without[1]
@@ -0,0 +1,74 @@
+"""
+Motor de aperturas: muestreo sin reposición correcto y mismas frecuencias que
+las aperturas de la partida de objetos con las mismas políticas.
+"""
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from opening import OpeningEngine, bottom_most_expensive, mulligan_without_play
+from phases import ActionType
+from simulation import new_game
+
+TURNS = 2
+GAMES = 3000
+
+
+def object_policy(hand, mulligan_used):
+    """ mulligan_without_play(1) y bottom_most_expensive sobre una mano de objetos """
+    if not mulligan_used and not any(card.cost <= 1 for card in hand):
+        return {}
+    best = max(range(len(hand)), key=lambda position: (hand[position].cost, -position))
+    return {'card_id': hand[best].instance_id}
+
+
+def test_sample_draws_distinct_uniform_cards(deck):
+    engine = OpeningEngine(deck, seed=0)
+    width = len(engine.cards)
+    sample = engine._sample(200_000, width, 10)
+    ordered = np.sort(sample, axis=1)
+    assert (ordered[:, 1:] != ordered[:, :-1]).all()
+    assert sample.max() < width
+    # Cada carta aparece en cada posición con probabilidad 1 / width
+    expected = len(sample) / width
+    for column in (0, 9):
+        counts = np.bincount(sample[:, column], minlength=width)
+        assert np.abs(counts - expected).max() < 5 * np.sqrt(expected)
+
+
+def test_deal_keeps_returned_card_out_of_hand(deck):
+    openings = OpeningEngine(deck, seed=1).deal(10_000, turns=3, mulligan=mulligan_without_play(1))
+    assert openings.hands.shape == (10_000, 6)
+    assert openings.drawn(3).shape == (10_000, 2)
+    everything = np.sort(np.concatenate([openings.hands, openings.returned[:, None], openings.drawn(3)], axis=1), axis=1)
+    assert (everything[:, 1:] != everything[:, :-1]).all()
+
+
+@pytest.mark.parametrize('seat', (0, 1))
+def test_matches_object_engine_openings(deck, seat):
+    engine = OpeningEngine(deck, seat=seat, seed=seat)
+    mulligans = 0
+    playable = 0
+    names = Counter()
+    for seed in range(GAMES):
+        game_state = new_game(deck, deck, seed)
+        while game_state.waiting_for_action == "mulligan_return":
+            player = game_state.get_acting_player()
+            kwargs = object_policy(player.zones.hand.see_cards(), player.zones.hand.mulligan_used)
+            assert game_state.execute_action(player, ActionType.MULLIGAN_RETURN, **kwargs).success
+        player = (game_state.player1, game_state.player2)[seat]
+        hand = player.zones.hand.see_cards()
+        draws = player.zones.mazo.see_cards()[:engine.draws_by_turn(TURNS)]
+        mulligans += player.zones.hand.mulligan_used
+        playable += any(card.cost <= engine.gold_on_turn(TURNS) for card in hand + draws)
+        names.update(card.name for card in hand)
+
+    openings = engine.deal(1_000_000, turns=TURNS, mulligan=mulligan_without_play(1), bottom=bottom_most_expensive)
+    for count, expected in ((mulligans, openings.mulligans.mean()), (playable, openings.playable_on_turn(TURNS).mean())):
+        error = np.sqrt(expected * (1 - expected) / GAMES)
+        assert abs(count / GAMES - expected) < 4 * error + 1e-9
+    # Copias por nombre en la mano: la varianza de una hipergeométrica no supera su media
+    for name in engine.names:
+        expected = openings.count_name(name).mean()
+        assert abs(names[name] / GAMES - expected) < 5 * np.sqrt(expected / GAMES) + 1e-9
@@ -0,0 +1,99 @@
+"""
+Generador de acciones legales: toda acción de get_valid_actions se puede
+ejecutar, playable_cards coincide con el cálculo directo sobre la mano y la
+cache de lo pagable se invalida al cambiar el oro o la mano.
+"""
+import random
+
+import pytest
+
+from phases import MAIN_PHASES, ActionType
+from simulation import new_game, play_step, random_policy
+
+
+def decision_points(deck, seed, limit=300):
+    """ Estados de una partida al azar antes de cada decisión """
+    game_state = new_game(deck, deck, seed)
+    policy = random_policy(random.Random(seed))
+    while not game_state.game_over and limit:
+        yield game_state
+        play_step(game_state, policy)
+        limit -= 1
+
+
+def brute_force_playable(game_state, player):
+    gold = player.resources.available_gold + len(player.zones.reserva_tesoros)
+    affordable = [card for card in player.zones.hand if card.can_be_played(gold)]
+    if player is not game_state.current_player:
+        affordable = [card for card in affordable if card.type == 'ACCION' and card.is_fast()]
+    return [card.instance_id for card in affordable]
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_every_valid_action_executes(deck, seed):
+    for game_state in decision_points(deck, seed):
+        player = game_state.get_acting_player()
+        actions = game_state.get_valid_actions(player)
+        assert actions
+        for action_type, kwargs in actions:
+            # El clon tiene sus propios jugadores
+            clone = game_state.clone()
+            result = clone.execute_action(clone.get_acting_player(), action_type, **kwargs)
+            assert result.success, (action_type, kwargs, result.message)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_validators_agree_with_valid_actions(deck, seed):
+    for game_state in decision_points(deck, seed):
+        player = game_state.get_acting_player()
+        for action_type, kwargs in game_state.get_valid_actions(player):
+            if action_type == ActionType.PLAY_CARD:
+                assert game_state.can_play_card(player, kwargs['card_id'])
+            elif action_type == ActionType.ATTACK:
+                assert game_state.can_attack(player, kwargs['attacker_id'])
+            elif action_type == ActionType.DEFEND:
+                assert game_state.can_defend(player, **kwargs)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_playable_cards_matches_brute_force(deck, seed):
+    checked = 0
+    for game_state in decision_points(deck, seed):
+        if game_state.current_phase not in MAIN_PHASES:
+            continue
+        for player in game_state.players_pending:
+            assert list(game_state.playable_cards(player)) == brute_force_playable(game_state, player)
+            checked += 1
+    assert checked
+
+
+def main_phase_state(deck):
+    for game_state in decision_points(deck, 0):
+        player = game_state.current_player
+        if game_state.current_phase in MAIN_PHASES and player in game_state.players_pending \
+                and len(player.zones.hand):
+            return game_state, player
+    pytest.fail("La partida no llegó a una fase principal con mano")
+
+
+def test_affordable_cache_is_reused_until_gold_or_hand_change(deck):
+    game_state, player = main_phase_state(deck)
+    first = game_state.playable_cards(player)
+    assert game_state.playable_cards(player) is first
+
+    player.resources.add_gold(20)
+    richer = game_state.playable_cards(player)
+    assert list(richer) == brute_force_playable(game_state, player)
+    assert game_state.playable_cards(player) is richer
+
+    card = player.zones.hand.see_cards()[0]
+    player.zones.hand.remove_by_id(card.instance_id)
+    assert card.instance_id not in game_state.playable_cards(player)
+    assert list(game_state.playable_cards(player)) == brute_force_playable(game_state, player)
+
+
+def test_playable_cards_empty_outside_main_phases(deck):
+    for game_state in decision_points(deck, 1):
+        if game_state.current_phase not in MAIN_PHASES:
+            for player in (game_state.player1, game_state.player2):
+                assert game_state.playable_cards(player) == ()
@@ -0,0 +1,54 @@
+"""
+Repeticiones: ida y vuelta por bytes y archivo, re-ejecución hasta el final y
+seek adelante y atrás contra una re-ejecución lineal.
+"""
+import random
+
+import pytest
+
+from replay import Replay, ReplayPlayer, ReplayRecorder
+from simulation import new_game, play_until_end, random_policy
+
+
+def record_game(deck, catalog, seed, max_turns=40):
+    game_state = new_game(deck, deck, seed)
+    recorder = ReplayRecorder(seed, (catalog, catalog)).attach(game_state)
+    play_until_end(game_state, random_policy(random.Random(seed)), random_policy(random.Random(~seed)), max_turns)
+    return game_state, recorder.replay
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_bytes_round_trip_replays_the_game(deck, snapshot, catalog, seed):
+    game_state, replay = record_game(deck, catalog, seed)
+    loaded = Replay.from_bytes(replay.to_bytes())
+    assert (loaded.seed, loaded.decks, loaded.actions, loaded.turn_starts) == \
+        (replay.seed, replay.decks, replay.actions, replay.turn_starts)
+    assert snapshot(ReplayPlayer(loaded, deck, deck).play_to_end(), by_name=True) == snapshot(game_state, by_name=True)
+
+
+def test_file_round_trip_loads_decks_from_labels(deck, snapshot, catalog, tmp_path):
+    game_state, replay = record_game(deck, catalog, 11)
+    path = tmp_path / 'partida.rpl'
+    replay.save(path)
+    assert snapshot(ReplayPlayer(Replay.load(path)).play_to_end(), by_name=True) == snapshot(game_state, by_name=True)
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_seek_matches_linear_replay(deck, snapshot, catalog, seed):
+    game_state, replay = record_game(deck, catalog, seed)
+    player = ReplayPlayer(replay, deck, deck, keyframe_interval=4)
+    turns = len(replay.turn_starts)
+    for turn in (7, 3, turns, 12, 1, 9):
+        if turn > turns:
+            continue
+        linear = ReplayPlayer(replay, deck, deck, keyframe_interval=10 ** 6)
+        while linear.position < replay.turn_starts[turn - 1]:
+            linear.step()
+        assert snapshot(player.seek(turn), by_name=True) == snapshot(linear.state, by_name=True)
+    assert snapshot(player.play_to_end(), by_name=True) == snapshot(game_state, by_name=True)
+
+
+def test_seek_rejects_missing_turn(deck, catalog):
+    _, replay = record_game(deck, catalog, 0)
+    with pytest.raises(ValueError):
+        ReplayPlayer(replay, deck, deck).seek(len(replay.turn_starts) + 1)
@@ -0,0 +1,176 @@
+"""
+Servidor de partidas: protocolo de líneas JSON contra un bot, partidas
+concurrentes que no se bloquean entre sí, emparejamiento de humanos (también
+cuando el que esperaba se fue) y joins inválidos.
+"""
+import asyncio
+import json
+import random
+import tempfile
+import threading
+import time
+
+import pytest
+
+from phases import ActionType
+from server import MatchServer
+from simulation import random_policy
+
+MAX_TURNS = 10
+
+
+@pytest.fixture
+def socket_path():
+    # tmp_path puede pasar el largo máximo de la ruta de un socket Unix
+    with tempfile.TemporaryDirectory() as directory:
+        yield f'{directory}/s.sock'
+
+
+def serve(deck, socket_path, scenario, **options):
+    """ Corre scenario(server, connect) con un MatchServer escuchando en socket_path """
+    async def main():
+        server = MatchServer(deck, max_turns=MAX_TURNS, **options)
+        await server.start(path=socket_path)
+        try:
+            return await asyncio.wait_for(scenario(server, lambda: Client.connect(socket_path)), 30)
+        finally:
+            await server.close()
+    return asyncio.run(main())
+
+
+class Client:
+    def __init__(self, reader, writer) -> None:
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, path):
+        return cls(*await asyncio.open_unix_connection(path))
+
+    async def send(self, message):
+        data = message if isinstance(message, bytes) else json.dumps(message).encode('utf-8') + b'\n'
+        self.writer.write(data)
+        await self.writer.drain()
+
+    async def receive(self):
+        line = await self.reader.readline()
+        return json.loads(line) if line else None
+
+    async def play(self, choose):
+        """ Responde cada decide con choose(mensaje); retorna (mensajes, end) """
+        messages = []
+        while True:
+            message = await self.receive()
+            if message is None or message['op'] == 'end':
+                self.writer.close()
+                return messages, message
+            messages.append(message)
+            if message['op'] == 'decide':
+                await self.send({'op': 'act', 'index': choose(message)})
+
+
+def random_choice(seed):
+    rng = random.Random(seed)
+    return lambda message: rng.randrange(len(message['actions']))
+
+
+def test_protocol_against_bot(deck, socket_path):
+    async def scenario(server, connect):
+        client = await connect()
+        await client.send({'op': 'join', 'vs': 'bot', 'max_turns': 5})
+        return server, await client.play(random_choice(0))
+
+    server, (messages, end) = serve(deck, socket_path, scenario)
+    start, decisions = messages[0], messages[1:]
+    assert start == {'op': 'start', 'match': 1, 'seat': 0}
+    assert decisions and all(message['op'] == 'decide' for message in decisions)
+    for message in decisions:
+        assert set(message) == {'op', 'turn', 'phase', 'life', 'gold', 'hand', 'actions'}
+        assert message['actions']
+        for action_type, kwargs in message['actions']:
+            assert ActionType(action_type) and isinstance(kwargs, dict)
+        assert message['turn'] <= 5
+    assert server.results == [(1, end['winner'], end['turns'])]
+    assert server.active == 0
+
+
+def test_invalid_index_passes(deck, socket_path):
+    async def scenario(server, connect):
+        client = await connect()
+        await client.send({'op': 'join', 'vs': 'bot'})
+        return await client.play(lambda message: len(message['actions']))
+
+    messages, end = serve(deck, socket_path, scenario)
+    assert end is not None and end['turns'] > MAX_TURNS
+    assert {message['phase'] for message in messages[1:]} >= {'main_1'}
+
+
+def test_concurrent_bot_matches_overlap(deck, socket_path):
+    lock = threading.Lock()
+    thinking = [0, 0]      # (pensando ahora, máximo simultáneo)
+
+    def slow_bot(rng):
+        policy = random_policy(rng)
+
+        def think(game_state, player):
+            with lock:
+                thinking[0] += 1
+                thinking[1] = max(thinking[1], thinking[0])
+            time.sleep(0.002)
+            with lock:
+                thinking[0] -= 1
+            return policy(game_state, player)
+        return think
+
+    async def scenario(server, connect):
+        async def one(seed):
+            client = await connect()
+            await client.send({'op': 'join', 'vs': 'bot'})
+            return await client.play(random_choice(seed))
+        return server, await asyncio.gather(*(one(seed) for seed in range(4)))
+
+    server, games = serve(deck, socket_path, scenario, bot_factory=slow_bot)
+    assert sorted(match for match, _, _ in server.results) == [1, 2, 3, 4]
+    assert sorted(messages[0]['match'] for messages, _ in games) == [1, 2, 3, 4]
+    assert all(end is not None for _, end in games)
+    assert thinking[1] > 1
+
+
+def test_humans_pair_after_waiting_client_leaves(deck, socket_path):
+    async def scenario(server, connect):
+        gone = await connect()
+        await gone.send({'op': 'join', 'vs': 'human'})
+        await asyncio.sleep(0.05)
+        gone.writer.close()
+        await asyncio.sleep(0.05)
+
+        first, second = await connect(), await connect()
+        await first.send({'op': 'join', 'vs': 'human'})
+        await asyncio.sleep(0.05)
+        await second.send({'op': 'join', 'vs': 'human'})
+        games = await asyncio.gather(first.play(random_choice(1)), second.play(random_choice(2)))
+        return server, games
+
+    server, ((messages_a, end_a), (messages_b, end_b)) = serve(deck, socket_path, scenario)
+    assert messages_a[0] == {'op': 'start', 'match': 1, 'seat': 0}
+    assert messages_b[0] == {'op': 'start', 'match': 1, 'seat': 1}
+    assert end_a == end_b
+    assert server.results == [(1, end_a['winner'], end_a['turns'])]
+    assert server._waiting is None
+
+
+@pytest.mark.parametrize('join', [b'[1, 2]\n', b'{"op": "join", "max_turns": [1]}\n', b'no es json\n'])
+def test_bad_join_closes_connection(deck, socket_path, join):
+    async def scenario(server, connect):
+        client = await connect()
+        await client.send(join)
+        closed = await client.reader.read() == b''
+        # El servidor sigue atendiendo
+        other = await connect()
+        await other.send({'op': 'join', 'vs': 'bot', 'max_turns': 2})
+        _, end = await other.play(random_choice(0))
+        return closed, end
+
+    closed, end = serve(deck, socket_path, scenario)
+    assert closed
+    assert end is not None
@@ -0,0 +1,49 @@
+"""
+Hash Zobrist incremental contra el recalculado desde cero, en clones y al
+deshacer con la bitácora.
+"""
+import random
+
+import pytest
+
+from simulation import new_game, play_step, random_policy
+from zobrist import StateHasher
+
+
+def card_hash_from_scratch(game_state):
+    """ Parte de cartas del hash sumando todas las zonas, sin tocar el hasher de la partida """
+    hasher = StateHasher()
+    for seat, player in enumerate((game_state.player1, game_state.player2)):
+        for zone_name in player.zones.ZONE_NAMES:
+            hasher.add_zone(seat, getattr(player.zones, zone_name))
+    return hasher.card_hash
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_incremental_hash_matches_from_scratch(deck, seed):
+    game_state = new_game(deck, deck, seed)
+    journal = game_state.enable_journal()
+    game_state.enable_hashing()
+    policy = random_policy(random.Random(seed))
+    while not game_state.game_over and game_state.turn_number < 60:
+        mark = journal.mark()
+        before = game_state.zobrist_hash()
+        for _ in range(5):
+            if not game_state.game_over:
+                play_step(game_state, policy)
+        assert game_state.hasher.card_hash == card_hash_from_scratch(game_state)
+        assert game_state.clone().zobrist_hash() == game_state.zobrist_hash()
+
+        after = game_state.zobrist_hash()
+        journal.undo(mark)
+        assert game_state.zobrist_hash() == before
+        journal.redo()
+        assert game_state.zobrist_hash() == after
+
+
+def test_same_position_hashes_equal_across_games(deck):
+    # Misma semilla en dos partidas: otros instance_id, misma posición
+    first = new_game(deck, deck, 3)
+    second = new_game(deck, deck, 3)
+    assert first.player1.zones.mazo.see_cards()[0].instance_id != second.player1.zones.mazo.see_cards()[0].instance_id
+    assert first.enable_hashing() == second.enable_hashing()
@@ -0,0 +1,56 @@
+"""
+Hash incremental de 64 bits del estado de la partida (estilo Zobrist).
+
+Cada (asiento, zona, nombre de carta) tiene una clave aleatoria de 64 bits.
+Las claves se suman módulo 2**64 en lugar de combinarse con XOR para que dos
+copias de la misma carta en la misma zona no se cancelen. Las claves salen de
+un hash del contenido, así son iguales en todos los procesos y dos partidas en
+la misma posición tienen el mismo hash aunque sus instance_id sean distintos.
+
+Las zonas de cartas se actualizan en O(1) por carta movida desde PlayerZones;
+oro, vida, fase y turno se suman al leer (GameState.zobrist_hash).
+"""
+import hashlib
+
+MASK = (1 << 64) - 1
+
+_keys = {}
+
+
+def zobrist_key(*parts):
+    """Clave de 64 bits determinística para una combinación de valores"""
+    key = _keys.get(parts)
+    if key is None:
+        digest = hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=8).digest()
+        key = _keys[parts] = int.from_bytes(digest, 'little')
+    return key
+
+
+class StateHasher:
+    """Acumula la parte del hash que corresponde a la ubicación de las cartas"""
+    journal = None
+
+    def __init__(self) -> None:
+        self.card_hash = 0
+
+    def move(self, seat, from_zone, to_zone, cards):
+        """Actualiza el hash por cartas que pasan de from_zone a to_zone"""
+        delta = 0
+        for card in cards:
+            delta += zobrist_key(seat, to_zone.name, card.name) - zobrist_key(seat, from_zone.name, card.name)
+        if not delta:
+            return
+        value = (self.card_hash + delta) & MASK
+        if self.journal is None:
+            self.card_hash = value
+        else:
+            self.journal.set_attr(self, 'card_hash', value)
+
+    def add_zone(self, seat, zone):
+        for card in zone:
+            self.card_hash = (self.card_hash + zobrist_key(seat, zone.name, card.name)) & MASK
+
+    def copy(self):
+        clone = StateHasher()
+        clone.card_hash = self.card_hash
+        return clone